@@ -1,33 +1,22 @@
 import os
-from PIL import Image
-from pathlib import Path
+import sys
 
+# The converter lives at the repository root (tifftopng.py)
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(os.path.dirname(script_dir)))
 
-def convert_tiffs_to_png():
-    # Use an absolute path based on your error log
-    figures_path = Path("/Users/dr.ajayshukla/PycharmProjects/pythonProjectwriter/HRPQCT_BMD_TBS_FRAX/results/figures")
+import tifftopng
 
-    if not figures_path.exists():
-        print(f"❌ Path not found: {figures_path}")
-        return
 
-    print(f"🔍 Scanning: {figures_path}")
+def convert_tiffs_to_png(pages="first", montage=False):
+    # Dynamic Path Anchoring (no machine-specific absolute paths)
+    figures_path = os.path.join(os.path.dirname(script_dir), "results", "figures")
 
-    for tiff_file in figures_path.glob("*.tiff"):
-        png_file = tiff_file.with_suffix(".png")
-
-        try:
-            with Image.open(tiff_file) as img:
-                # Handle multipage TIFFs (often found in medical imaging)
-                img.seek(0)
-                rgb_img = img.convert('RGB')
-                rgb_img.save(png_file, "PNG", optimize=True)
-                print(f"✅ Converted: {tiff_file.name}")
-        except Exception as e:
-            print(f"⚠️ Could not convert {tiff_file.name}: {e}")
-            print(
-                "💡 Tip: If this is an HR-pQCT stack, try exporting a single slice as PNG from your reconstruction software.")
+    # figure_export writes each TIFF before its PNG, so those PNGs are at least as new as the TIFF
+    # and are skipped as up-to-date (their 300-dpi metadata is kept). Only TIFFs without a newer PNG
+    # are converted. HR-pQCT stacks can be exported slice-by-slice via pages="0:200" or as a montage.
+    return tifftopng.convert_directory(figures_path, pages=pages, montage=montage)
 
 
 if __name__ == "__main__":
-    convert_tiffs_to_png()
\ No newline at end of file
+    convert_tiffs_to_png()
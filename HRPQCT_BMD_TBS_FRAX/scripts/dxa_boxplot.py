@@ -3,21 +3,12 @@ import seaborn as sns
 import matplotlib.pyplot as plt
 import os
 from scipy import stats
+from figure_export import save_figure, DEFAULT_FORMATS
 
 
-def generate_dxa_boxplot():
-    # Dynamic Path Anchoring
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(script_dir)
-    data_path = os.path.join(project_root, 'data', '03_final', 'cohort_total_n215.csv')
-    output_dir = os.path.join(project_root, 'results', 'figures')
-    os.makedirs(output_dir, exist_ok=True)
-
-    if not os.path.exists(data_path):
-        print(f"File not found: {data_path}")
-        return
-
-    df = pd.read_csv(data_path)
+def draw_dxa_boxplot(df):
+    """Draws the DXA T-score boxplots (Co/Fx/DM/DMFx) and returns the Figure."""
+    df = df.copy()
 
     # 1. Define Subgroups (Co, Fx, DM, DMFx)
     # Logic:
@@ -61,8 +52,9 @@ def generate_dxa_boxplot():
                     width=0.6, linewidth=1.5, fliersize=3)
 
         # Add Swarmplot for individual points
+        # (rasterized: hundreds of markers stay one small bitmap in PDF/SVG output)
         sns.stripplot(x='Study_Group', y=col, data=df, order=order, ax=ax,
-                      color='black', alpha=0.4, size=3, jitter=True)
+                      color='black', alpha=0.4, size=3, jitter=True, rasterized=True)
 
         # Add Diagnostic Threshold Line (-2.5)
         ax.axhline(y=-2.5, color='red', linestyle='--', linewidth=1.5, alpha=0.7)
@@ -88,12 +80,30 @@ def generate_dxa_boxplot():
                     ax.plot([x1, x1, x2, x2], [y_max, y_max + 0.2, y_max + 0.2, y_max], lw=1, c='k')
                     ax.text((x1 + x2) * .5, y_max + 0.25, "*", ha='center', va='bottom', color='k')
 
-    plt.tight_layout()
-    save_path = os.path.join(output_dir, 'Figure2_DXA_Boxplots.png')
-    plt.savefig(save_path, dpi=300)
-    print(f"✅ Figure saved to: {save_path}")
-    plt.show()
+    fig.tight_layout()
+    return fig
+
+
+def generate_dxa_boxplot(cohort_file='cohort_total_n215.csv', stem='Figure2_DXA_Boxplots', formats=DEFAULT_FORMATS):
+    # Dynamic Path Anchoring
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(script_dir)
+    data_path = os.path.join(project_root, 'data', '03_final', cohort_file)
+    output_dir = os.path.join(project_root, 'results', 'figures')
+    os.makedirs(output_dir, exist_ok=True)
+
+    if not os.path.exists(data_path):
+        print(f"File not found: {data_path}")
+        return
+
+    df = pd.read_csv(data_path)
+    fig = draw_dxa_boxplot(df)
+
+    saved = save_figure(fig, output_dir, stem, formats, dpi=300)
+    plt.close(fig)
+    for save_path in saved:
+        print(f"✅ Figure saved to: {save_path}")
 
 
 if __name__ == "__main__":
-    generate_dxa_boxplot()
\ No newline at end of file
+    generate_dxa_boxplot()
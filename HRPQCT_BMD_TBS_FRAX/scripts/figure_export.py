@@ -0,0 +1,70 @@
+import os
+
+import numpy as np
+from PIL import Image
+
+# Journal submission set: PNG for the manuscript/HTML, LZW TIFF for the journal, PDF for vector proofs
+DEFAULT_FORMATS = ('png', 'tiff', 'pdf')
+RASTER_FORMATS = {'png': 'PNG', 'tiff': 'TIFF', 'tif': 'TIFF'}
+VECTOR_FORMATS = {'pdf', 'svg', 'eps'}
+
+
+def render_rgb(fig, dpi=300):
+    """Rasterizes the figure once with Agg and returns it as an RGB PIL image.
+
+    Draws on the figure's own canvas at `dpi` and reads the RGBA buffer back, so the
+    size always comes from the canvas (savefig.bbox='tight' in rcParams does not apply).
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    original_dpi = fig.dpi
+    canvas = fig.canvas if isinstance(fig.canvas, FigureCanvasAgg) else FigureCanvasAgg(fig)
+    try:
+        fig.set_dpi(dpi)
+        canvas.draw()
+        rgba = Image.fromarray(np.asarray(canvas.buffer_rgba()).copy(), 'RGBA')
+    finally:
+        fig.set_dpi(original_dpi)
+
+    background = Image.new('RGB', rgba.size, (255, 255, 255))
+    background.paste(rgba, mask=rgba.getchannel('A'))
+    return background
+
+
+def save_figure(fig, output_dir, stem, formats=DEFAULT_FORMATS, dpi=300):
+    """Saves one figure in every requested format from a single Agg draw.
+
+    Raster formats (PNG/TIFF) are encoded from the same in-memory RGB buffer, so
+    there is no separate TIFF -> PNG conversion pass. Vector formats (PDF/SVG) are
+    written by matplotlib; artists drawn with `rasterized=True` are embedded as
+    `dpi` bitmaps inside them, which keeps point-heavy layers small.
+
+    Returns the list of written paths.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    formats = [f.lower().lstrip('.') for f in formats]
+    unknown = [f for f in formats if f not in RASTER_FORMATS and f not in VECTOR_FORMATS]
+    if unknown:
+        raise ValueError(f"Unsupported figure format(s): {unknown}")
+
+    saved = []
+    # TIFF is written before PNG so the PNG is never older than its TIFF: tifftopng compares
+    # mtimes and would otherwise re-encode (and overwrite) every PNG exported here.
+    raster = sorted((f for f in formats if f in RASTER_FORMATS), key=lambda f: RASTER_FORMATS[f] != 'TIFF')
+    if raster:
+        img = render_rgb(fig, dpi)
+        for fmt in raster:
+            path = os.path.join(output_dir, f"{stem}.{fmt}")
+            if RASTER_FORMATS[fmt] == 'TIFF':
+                img.save(path, 'TIFF', compression='tiff_lzw', dpi=(dpi, dpi))
+            else:
+                img.save(path, 'PNG', dpi=(dpi, dpi))
+            saved.append(path)
+
+    for fmt in formats:
+        if fmt in VECTOR_FORMATS:
+            path = os.path.join(output_dir, f"{stem}.{fmt}")
+            fig.savefig(path, format=fmt, dpi=dpi)
+            saved.append(path)
+
+    return saved
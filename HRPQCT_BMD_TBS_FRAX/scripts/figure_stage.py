@@ -0,0 +1,183 @@
+import os
+import sys
+import time
+import argparse
+import importlib.util
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from figure_export import save_figure, DEFAULT_FORMATS
+
+# --- DYNAMIC PATH ANCHORING ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+DATA_DIR = os.path.join(PROJECT_ROOT, 'data', '03_final')
+FIGURES_DIR = os.path.join(PROJECT_ROOT, 'results', 'figures')
+
+# A figure spec names a draw function (script file + function name), the cohort CSV
+# it is drawn from, and the output file stem (one file per export format). Draw
+# functions take a DataFrame and return a matplotlib Figure (or None when the
+# cohort has insufficient data).
+FigureSpec = namedtuple('FigureSpec', ['script', 'func', 'cohort', 'stem', 'kwargs'])
+
+COHORTS = {
+    'total_n215': 'cohort_total_n215.csv',
+    'osteopenia_n91': 'cohort_osteopenia_n91.csv',
+    'osteopenia_diabetes': 'cohort_osteopenia_diabetes.csv',
+    'total_diabetes': 'cohort_total_diabetes.csv',
+}
+
+COHORT_TITLES = {
+    'total_n215': 'General Cohort (N=215)',
+    'osteopenia_n91': 'Osteopenia (n=91)',
+    'osteopenia_diabetes': 'Diabetic Osteopenia (n=66)',
+    'total_diabetes': 'Diabetic Cohort (n=140)',
+}
+
+# Per-worker state: loaded draw modules and cohort frames are reused across specs
+_MODULES = {}
+_COHORT_FRAMES = {}
+
+
+def build_figure_specs(cohorts=None):
+    """Queues every manuscript figure for every cohort.
+
+    The cohort each script originally targeted keeps the manuscript filename;
+    the other cohorts get a `_<cohort>` suffix.
+    """
+    cohorts = cohorts or list(COHORTS)
+    specs = []
+    for cohort in cohorts:
+        csv_name = COHORTS[cohort]
+
+        def name(stem, home):
+            return stem if cohort == home else f"{stem}_{cohort}"
+
+        specs.append(FigureSpec('dxa_boxplot.py', 'draw_dxa_boxplot', csv_name,
+                                name('Figure2_DXA_Boxplots', 'total_n215'), {}))
+        specs.append(FigureSpec('Forest Plot.py', 'draw_forest_plot', csv_name,
+                                name('forest_plot_fracture_risk', 'total_n215'), {}))
+        specs.append(FigureSpec('stats_engine.py', 'draw_roc_figure', csv_name,
+                                name('Fig2_ROC', 'osteopenia_n91'),
+                                {'title': f"Diagnostic Performance in {COHORT_TITLES[cohort]}"}))
+        prefix = 'DM ' if 'diabetes' in cohort else ''
+        specs.append(FigureSpec('stats_engine.py', 'draw_porosity_boxplot', csv_name,
+                                name('Fig3_Porosity_Diabetes', 'osteopenia_diabetes'),
+                                {'title': f"Cortical Porosity in {COHORT_TITLES[cohort]}",
+                                 'labels': (f"{prefix}Control", f"{prefix}Fracture")}))
+    return specs
+
+
+def _warm_worker():
+    """Pool initializer: pins the Agg backend and pays the import/font/style cost once per worker."""
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+    import matplotlib.pyplot as plt
+    import seaborn as sns  # noqa: F401  (imported by the draw scripts)
+    from matplotlib import font_manager
+
+    # Resolve the default font and build the text layout caches with a throwaway draw
+    font_manager.findfont(font_manager.FontProperties(family=matplotlib.rcParams['font.family']))
+    fig, ax = plt.subplots(figsize=(1, 1))
+    ax.set_title('warm-up')
+    fig.canvas.draw()
+    plt.close(fig)
+
+
+def _load_module(script):
+    """Imports a draw script by file path (handles names with spaces, e.g. 'Forest Plot.py')."""
+    if script not in _MODULES:
+        path = os.path.join(SCRIPT_DIR, script)
+        mod_name = '_figure_' + os.path.splitext(script)[0].replace(' ', '_').lower()
+        spec = importlib.util.spec_from_file_location(mod_name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _MODULES[script] = module
+    return _MODULES[script]
+
+
+def _load_cohort(csv_name):
+    if csv_name not in _COHORT_FRAMES:
+        import pandas as pd
+        df = pd.read_csv(os.path.join(DATA_DIR, csv_name))
+        df.columns = df.columns.str.strip()
+        _COHORT_FRAMES[csv_name] = df
+    return _COHORT_FRAMES[csv_name]
+
+
+def render_figure(spec, output_dir=FIGURES_DIR, dpi=300, formats=DEFAULT_FORMATS):
+    """Draws one figure spec and exports every format from that draw. Returns (stem, status, seconds)."""
+    import matplotlib
+    import matplotlib.pyplot as plt
+
+    start = time.perf_counter()
+    try:
+        draw = getattr(_load_module(spec.script), spec.func)
+        # Scripts call sns.set_style / plt.style.use; keep that from leaking into the next spec
+        with matplotlib.rc_context():
+            fig = draw(_load_cohort(spec.cohort), **spec.kwargs)
+            if fig is None:
+                return spec.stem, 'skipped', time.perf_counter() - start
+            save_figure(fig, output_dir, spec.stem, formats, dpi=dpi)
+        plt.close(fig)
+        return spec.stem, 'ok', time.perf_counter() - start
+    except Exception as e:
+        plt.close('all')
+        return spec.stem, f'failed: {e}', time.perf_counter() - start
+
+
+def run_figure_stage(specs, output_dir=FIGURES_DIR, workers=None, dpi=300, formats=DEFAULT_FORMATS):
+    """Renders all specs in a process pool of pre-warmed Agg workers."""
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+
+    print(f"🎨 Rendering {len(specs)} figures on {workers} worker(s)...")
+    start = time.perf_counter()
+    results = []
+
+    if workers == 1:
+        _warm_worker()
+        for spec in specs:
+            results.append(render_figure(spec, output_dir, dpi, formats))
+            _report(results[-1])
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker) as pool:
+            futures = [pool.submit(render_figure, spec, output_dir, dpi, formats) for spec in specs]
+            for future in as_completed(futures):
+                results.append(future.result())
+                _report(results[-1])
+
+    elapsed = time.perf_counter() - start
+    n_ok = sum(1 for _, status, _ in results if status == 'ok')
+    print(f"\n🎉 Figure stage finished: {n_ok}/{len(specs)} saved in {elapsed:.1f}s -> {output_dir}")
+    return results
+
+
+def _report(result):
+    stem, status, seconds = result
+    if status == 'ok':
+        print(f"✅ {stem} ({seconds:.1f}s)")
+    elif status == 'skipped':
+        print(f"⚠️ Skipped {stem}: Insufficient data.")
+    else:
+        print(f"❌ {stem} {status}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Regenerate manuscript figures for all cohorts in parallel.")
+    parser.add_argument('--cohort', action='append', choices=list(COHORTS),
+                        help="Cohort to render (repeatable). Default: all cohorts.")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: all cores).")
+    parser.add_argument('--dpi', type=int, default=300)
+    parser.add_argument('--formats', default=','.join(DEFAULT_FORMATS),
+                        help="Comma-separated export formats (png, tiff, pdf, svg).")
+    parser.add_argument('--output', default=FIGURES_DIR, help="Output directory for the figures.")
+    args = parser.parse_args(argv)
+
+    results = run_figure_stage(build_figure_specs(args.cohort), args.output, args.workers, args.dpi,
+                               args.formats.split(','))
+    return 1 if any(status.startswith('failed') for _, status, _ in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
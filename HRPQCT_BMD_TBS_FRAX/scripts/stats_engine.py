@@ -5,6 +5,76 @@ import matplotlib.pyplot as plt
 from sklearn.metrics import roc_curve, auc
 from sklearn.linear_model import LogisticRegression
 import os
+from figure_export import save_figure
+
+
+def draw_roc_figure(df_osteo, title='Diagnostic Performance in Osteopenia (n=91)'):
+    """Clinical vs Structural ROC curves. Returns the Figure, or None if data are insufficient."""
+    y_true = df_osteo['GROUP'].astype(str).str.upper().str.contains('A').astype(int)
+
+    # Clean Inputs
+    valid_mask = y_true.notna()
+    y_clean = y_true[valid_mask]
+
+    # Clinical Model: Age + BMI + Neck T-score
+    X_clin = df_osteo[['AGE', 'BMI', 'NECK_TSCORE']].copy()
+    X_clin = X_clin.apply(pd.to_numeric, errors='coerce').fillna(X_clin.mean())
+    X_clin = X_clin[valid_mask]
+
+    # Structural Model: Age + BMI + Radius Tb.N + Radius vBMD
+    # (Using Tb.N as the "Hero" parameter for osteopenia)
+    X_struc = df_osteo[['AGE', 'BMI', 'RADIUS_TB.N', 'RADIUS_ttvBMD']].copy()
+    X_struc = X_struc.apply(pd.to_numeric, errors='coerce').fillna(X_struc.mean())
+    X_struc = X_struc[valid_mask]
+
+    if len(y_clean) <= 10 or len(np.unique(y_clean)) < 2:
+        return None
+
+    clf_clin = LogisticRegression(max_iter=1000).fit(X_clin, y_clean)
+    clf_struc = LogisticRegression(max_iter=1000).fit(X_struc, y_clean)
+
+    fp1, tp1, _ = roc_curve(y_clean, clf_clin.predict_proba(X_clin)[:, 1])
+    fp2, tp2, _ = roc_curve(y_clean, clf_struc.predict_proba(X_struc)[:, 1])
+
+    auc1, auc2 = auc(fp1, tp1), auc(fp2, tp2)
+
+    fig, ax = plt.subplots(figsize=(6, 6))
+    ax.plot(fp1, tp1, label=f'Clinical Model (AUC={auc1:.2f})', linestyle='--', color='gray')
+    ax.plot(fp2, tp2, label=f'Structural Model (AUC={auc2:.2f})', linewidth=2.5, color='darkblue')
+    ax.plot([0, 1], [0, 1], 'k:', alpha=0.3)
+    ax.legend(loc='lower right')
+    ax.set_xlabel('False Positive Rate')
+    ax.set_ylabel('True Positive Rate')
+    ax.set_title(title)
+    ax.grid(True, alpha=0.2)
+    return fig
+
+
+def draw_porosity_boxplot(df_dm_osteo, title='Cortical Porosity in Diabetic Osteopenia',
+                          labels=('DM Control', 'DM Fracture')):
+    """Control vs Fracture radius Ct.Po for one cohort. Returns the Figure, or None if data are insufficient.
+
+    The defaults describe the manuscript's diabetic osteopenia cohort; figure_stage passes
+    the title and group labels for every other cohort.
+    """
+    # Prepare Data: Ct.Po for Non-DM Osteopenia vs DM Osteopenia
+    # We need to load Non-DM Osteopenia for comparison
+    # Non-DM is df_osteo minus df_dm_osteo
+    # Simplest way: just look at df_dm_osteo Fracture vs Control first
+
+    dm_fx = df_dm_osteo[df_dm_osteo['GROUP'].astype(str).str.upper().str.contains('A')]['RADIUS_CT.PO'].dropna()
+    dm_ctl = df_dm_osteo[df_dm_osteo['GROUP'].astype(str).str.upper().str.contains('B')]['RADIUS_CT.PO'].dropna()
+
+    if len(dm_fx) <= 2 or len(dm_ctl) <= 2:
+        return None
+
+    fig, ax = plt.subplots(figsize=(5, 6))
+    ax.boxplot([dm_ctl, dm_fx], tick_labels=list(labels), patch_artist=True,
+               boxprops=dict(facecolor='lightblue'))
+    ax.set_title(title)
+    ax.set_ylabel('Radius Ct.Po (1)')
+    ax.grid(True, axis='y', alpha=0.3)
+    return fig
 
 
 def run_stats_engine():
@@ -149,45 +219,11 @@ def run_stats_engine():
 
     # Figure 2: ROC Curve (Diagnostic Superiority)
     print("...Generating Figure 2 (ROC)")
-    y_true = df_osteo['GROUP'].astype(str).str.upper().str.contains('A').astype(int)
-
-    # Clean Inputs
-    valid_mask = y_true.notna()
-    y_clean = y_true[valid_mask]
-
-    # Clinical Model: Age + BMI + Neck T-score
-    X_clin = df_osteo[['AGE', 'BMI', 'NECK_TSCORE']].copy()
-    X_clin = X_clin.apply(pd.to_numeric, errors='coerce').fillna(X_clin.mean())
-    X_clin = X_clin[valid_mask]
-
-    # Structural Model: Age + BMI + Radius Tb.N + Radius vBMD
-    # (Using Tb.N as the "Hero" parameter for osteopenia)
-    X_struc = df_osteo[['AGE', 'BMI', 'RADIUS_TB.N', 'RADIUS_ttvBMD']].copy()
-    X_struc = X_struc.apply(pd.to_numeric, errors='coerce').fillna(X_struc.mean())
-    X_struc = X_struc[valid_mask]
-
-    if len(y_clean) > 10 and len(np.unique(y_clean)) > 1:
-        clf_clin = LogisticRegression(max_iter=1000).fit(X_clin, y_clean)
-        clf_struc = LogisticRegression(max_iter=1000).fit(X_struc, y_clean)
-
-        fp1, tp1, _ = roc_curve(y_clean, clf_clin.predict_proba(X_clin)[:, 1])
-        fp2, tp2, _ = roc_curve(y_clean, clf_struc.predict_proba(X_struc)[:, 1])
-
-        auc1, auc2 = auc(fp1, tp1), auc(fp2, tp2)
-
-        plt.figure(figsize=(6, 6))
-        plt.plot(fp1, tp1, label=f'Clinical Model (AUC={auc1:.2f})', linestyle='--', color='gray')
-        plt.plot(fp2, tp2, label=f'Structural Model (AUC={auc2:.2f})', linewidth=2.5, color='darkblue')
-        plt.plot([0, 1], [0, 1], 'k:', alpha=0.3)
-        plt.legend(loc='lower right')
-        plt.xlabel('False Positive Rate')
-        plt.ylabel('True Positive Rate')
-        plt.title('Diagnostic Performance in Osteopenia (n=91)')
-        plt.grid(True, alpha=0.2)
-
-        plt.savefig(os.path.join(figures_path, "Fig2_ROC.png"), dpi=300)
-        plt.close()
-        print("✅ Generated Figure: Fig2_ROC.png")
+    fig = draw_roc_figure(df_osteo)
+    if fig is not None:
+        save_figure(fig, figures_path, "Fig2_ROC", dpi=300)
+        plt.close(fig)
+        print("✅ Generated Figure: Fig2_ROC (png/tiff/pdf)")
     else:
         print("⚠️ Skipped ROC: Insufficient data points.")
 
@@ -222,25 +258,11 @@ def run_stats_engine():
     # Figure 3: Cortical Porosity Boxplot (Visualizing the Switch)
     print("...Generating Figure 3 (Porosity Boxplot)")
 
-    # Prepare Data: Ct.Po for Non-DM Osteopenia vs DM Osteopenia
-    # We need to load Non-DM Osteopenia for comparison
-    # Non-DM is df_osteo minus df_dm_osteo
-    # Simplest way: just look at df_dm_osteo Fracture vs Control first
-
-    dm_fx = df_dm_osteo[df_dm_osteo['GROUP'].astype(str).str.upper().str.contains('A')]['RADIUS_CT.PO'].dropna()
-    dm_ctl = df_dm_osteo[df_dm_osteo['GROUP'].astype(str).str.upper().str.contains('B')]['RADIUS_CT.PO'].dropna()
-
-    if len(dm_fx) > 2 and len(dm_ctl) > 2:
-        plt.figure(figsize=(5, 6))
-        plt.boxplot([dm_ctl, dm_fx], labels=['DM Control', 'DM Fracture'], patch_artist=True,
-                    boxprops=dict(facecolor='lightblue'))
-        plt.title('Cortical Porosity in Diabetic Osteopenia')
-        plt.ylabel('Radius Ct.Po (1)')
-        plt.grid(True, axis='y', alpha=0.3)
-
-        plt.savefig(os.path.join(figures_path, "Fig3_Porosity_Diabetes.png"), dpi=300)
-        plt.close()
-        print("✅ Generated Figure: Fig3_Porosity_Diabetes.png")
+    fig = draw_porosity_boxplot(df_dm_osteo)
+    if fig is not None:
+        save_figure(fig, figures_path, "Fig3_Porosity_Diabetes", dpi=300)
+        plt.close(fig)
+        print("✅ Generated Figure: Fig3_Porosity_Diabetes (png/tiff/pdf)")
     else:
         print("⚠️ Skipped Porosity Plot: Insufficient data.")
 
@@ -0,0 +1,42 @@
+import os
+import glob
+
+from auditor.nlp import get_nlp
+
+# --- Dynamic Path Anchoring ---
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Every manuscript section plus the standalone MAFLD / IndianFRAX manuscripts.
+# Files are audited on their own text; Quarto {{< include >}} lines are not expanded,
+# so a section is never counted twice through its parent document.
+MANUSCRIPT_PATTERNS = [
+    '**/manuscript/sections/*.qmd',
+    'MAFLD_HRPQCT/manuscript/*.qmd',
+    'indianfrax/*.qmd',
+]
+
+
+def discover_manuscripts(root=REPO_ROOT, patterns=MANUSCRIPT_PATTERNS):
+    """Sorted, de-duplicated .qmd paths matching `patterns` under `root`."""
+    found = set()
+    for pattern in patterns:
+        found.update(os.path.abspath(p) for p in glob.glob(os.path.join(root, pattern), recursive=True))
+    return sorted(found)
+
+
+def default_workers():
+    return max(1, os.cpu_count() or 1)
+
+
+def parse_many(texts, profile='sentences', n_process=1, batch_size=32):
+    """Streams `texts` through the `profile` pipeline with nlp.pipe; Docs come back in input order.
+
+    n_process > 1 forks spaCy workers (all cores by default from the CLI). batch_size is in
+    texts; the auditor sends paragraphs (only the uncached ones), so batches stay small in memory.
+    """
+    nlp = get_nlp(profile)
+    longest = max((len(t) for t in texts), default=0)
+    if longest > nlp.max_length:
+        nlp.max_length = longest + 1
+    n_process = max(1, min(n_process, len(texts)))
+    return list(nlp.pipe(texts, n_process=n_process, batch_size=batch_size))
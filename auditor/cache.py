@@ -0,0 +1,103 @@
+import os
+import re
+import json
+import time
+import hashlib
+
+from auditor.batch import REPO_ROOT
+from auditor.nlp import DEFAULT_MODEL
+
+DEFAULT_CACHE_DIR = os.path.join(REPO_ROOT, ".audit_cache")
+CACHE_FILE = "paragraphs.json"
+CACHE_VERSION = 1
+MAX_AGE_DAYS = 30
+
+PARAGRAPH_BREAK = re.compile(r'\n[ \t]*\n')
+
+
+def split_paragraphs(text):
+    """[(offset, paragraph)] for the non-blank blocks of text separated by blank lines."""
+    paragraphs, start = [], 0
+    for match in PARAGRAPH_BREAK.finditer(text):
+        if text[start:match.start()].strip():
+            paragraphs.append((start, text[start:match.start()]))
+        start = match.end()
+    if text[start:].strip():
+        paragraphs.append((start, text[start:]))
+    return paragraphs
+
+
+class ParagraphCache:
+    """Sentence-level NLP results per paragraph, keyed by a hash of the paragraph text.
+
+    For a layer (e.g. 'passive', 'grounding') each sentence is stored as
+    [start, end, value] relative to its paragraph, where value is the layer's annotation
+    of the spaCy sentence span. Re-auditing a manuscript only parses paragraphs whose text
+    (or the model / layer version) changed; a full hit never imports spaCy.
+    With cache_dir=None the cache lives in memory only.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, model=None):
+        self.path = os.path.join(cache_dir, CACHE_FILE) if cache_dir else None
+        self.signature = f"{CACHE_VERSION}:{model or DEFAULT_MODEL}"
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._dirty = False
+        if self.path and os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f)
+
+    def key(self, paragraph, layer):
+        return hashlib.sha1(f"{self.signature}\0{layer}\0{paragraph}".encode("utf-8")).hexdigest()
+
+    def sentences_many(self, texts, layer, parse, annotate):
+        """Per text, [(start, end, value)] for every sentence (offsets into that text).
+
+        parse(list_of_paragraphs) -> spaCy Docs (called once, for cache misses only);
+        annotate(sentence_span) -> JSON-serialisable value stored with the sentence.
+        """
+        split = [split_paragraphs(text) for text in texts]
+        keys = [[self.key(p, layer) for _, p in paragraphs] for paragraphs in split]
+
+        todo = {}
+        for paragraphs, para_keys in zip(split, keys):
+            for (_, paragraph), key in zip(paragraphs, para_keys):
+                if key not in self._entries and key not in todo:
+                    todo[key] = paragraph
+        self.misses += len(todo)
+        self.hits += sum(len(k) for k in keys) - len(todo)
+
+        if todo:
+            for key, doc in zip(todo, parse(list(todo.values()))):
+                self._entries[key] = {'s': [[s.start_char, s.end_char, annotate(s)] for s in doc.sents]}
+            self._dirty = True
+
+        now = int(time.time())
+        results = []
+        for paragraphs, para_keys in zip(split, keys):
+            records = []
+            for (offset, _), key in zip(paragraphs, para_keys):
+                entry = self._entries[key]
+                if now - entry.get('t', 0) > 86400:
+                    entry['t'] = now  # refresh last-use (at most daily, to avoid rewriting on every hit)
+                    self._dirty = True
+                records.extend((offset + s, offset + e, value) for s, e, value in entry['s'])
+            results.append(records)
+        return results
+
+    def sentences(self, text, layer, parse, annotate):
+        return self.sentences_many([text], layer, parse, annotate)[0]
+
+    def save(self):
+        """Writes the cache (dropping entries unused for MAX_AGE_DAYS) if anything was added."""
+        if not self.path or not self._dirty:
+            return
+        cutoff = time.time() - MAX_AGE_DAYS * 86400
+        entries = {k: v for k, v in self._entries.items() if v.get('t', 0) >= cutoff}
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+        self._dirty = False
@@ -0,0 +1,235 @@
+import os
+import re
+import glob
+import json
+import hashlib
+
+import numpy as np
+
+from auditor.batch import REPO_ROOT
+from auditor.cache import DEFAULT_CACHE_DIR
+
+# --- Reference corpus for overlap detection (works offline; nothing is fetched) ---
+# Abstracts saved by the LitReview_Engine plus any local reference texts (.txt, or .pdf when pypdf is installed).
+REFERENCE_CSV = os.path.join(REPO_ROOT, "LitReview_Engine", "output", "01_raw_search.csv")
+REFERENCE_DIR = os.environ.get('AUDITOR_REFERENCE_DIR', os.path.join(REPO_ROOT, "LitReview_Engine", "input", "references"))
+INDEX_DIR = os.path.join(DEFAULT_CACHE_DIR, "fingerprints")
+INDEX_VERSION = 1
+
+# Winnowing parameters: k-word shingles, one fingerprint per window of w shingles.
+# Any shared passage of at least K + W - 1 words is guaranteed to share a fingerprint.
+K = 5
+W = 4
+MIN_HITS = 2  # fingerprints needed before a shared passage is reported
+MIN_WORDS = 10  # shorter shared runs are mostly field terminology ("dual-energy X-ray absorptiometry (DXA)")
+
+TOKEN = re.compile(r"[^\W_]+")
+_MASK = np.uint64(0xFFFFFFFFFFFFFFFF)
+_BASE = np.uint64(1099511628211)
+_token_hashes = {}
+
+
+def tokenize(text):
+    """[(start, end)] character spans of the word tokens."""
+    return [m.span() for m in TOKEN.finditer(text)]
+
+
+def _token_hash(token):
+    h = _token_hashes.get(token)
+    if h is None:
+        h = _token_hashes[token] = int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'little')
+    return h
+
+
+def shingle_hashes(words, k=K):
+    """64-bit hash of every k-word shingle (polynomial over per-word hashes, stable across runs)."""
+    if len(words) < k:
+        return np.empty(0, dtype=np.uint64)
+    th = np.fromiter((_token_hash(w) for w in words), dtype=np.uint64, count=len(words))
+    h = np.zeros(len(words) - k + 1, dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        for j in range(k):
+            h = (h * _BASE + th[j:len(th) - k + 1 + j]) & _MASK
+    return h
+
+
+def winnow(hashes, w=W):
+    """(fingerprints, shingle positions): the minimum hash of every window of w shingles."""
+    if len(hashes) == 0:
+        return hashes, np.empty(0, dtype=np.int64)
+    if len(hashes) <= w:
+        pos = np.array([int(np.argmin(hashes))])
+    else:
+        windows = np.lib.stride_tricks.sliding_window_view(hashes, w)
+        pos = np.unique(np.argmin(windows, axis=1) + np.arange(len(windows)))
+    return hashes[pos], pos
+
+
+def fingerprint(text):
+    spans = tokenize(text)
+    words = [text[s:e].lower() for s, e in spans]
+    fp, pos = winnow(shingle_hashes(words))
+    return fp, pos, spans
+
+
+# --- Corpus sources ---
+def _pdf_text(path):
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        return None
+    return "\n".join(page.extract_text() or "" for page in PdfReader(path).pages)
+
+
+def reference_sources(csv_path=REFERENCE_CSV, ref_dir=REFERENCE_DIR):
+    files = [csv_path] if os.path.exists(csv_path) else []
+    if os.path.isdir(ref_dir):
+        files += sorted(glob.glob(os.path.join(ref_dir, "**", "*.txt"), recursive=True))
+        files += sorted(glob.glob(os.path.join(ref_dir, "**", "*.pdf"), recursive=True))
+    return files
+
+
+def iter_references(sources):
+    """(title, source, text) for every reference document."""
+    skipped_pdfs = 0
+    for path in sources:
+        if path.endswith(".csv"):
+            import pandas as pd
+
+            df = pd.read_csv(path)
+            for _, row in df.iterrows():
+                abstract = row.get('Abstract')
+                if not isinstance(abstract, str) or "Abstract N/A" in abstract:
+                    continue
+                yield str(row.get('Title', '')), str(row.get('URL', '') or path), f"{row.get('Title', '')}. {abstract}"
+        elif path.endswith(".pdf"):
+            text = _pdf_text(path)
+            if text is None:
+                skipped_pdfs += 1
+                continue
+            yield os.path.splitext(os.path.basename(path))[0], path, text
+        else:
+            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                yield os.path.splitext(os.path.basename(path))[0], path, f.read()
+    if skipped_pdfs:
+        print(f"   ℹ️  Skipped {skipped_pdfs} PDF(s): pip install pypdf (or save them as .txt)")
+
+
+def sources_signature(sources):
+    stamp = [(os.path.relpath(p, REPO_ROOT), os.path.getmtime(p), os.path.getsize(p)) for p in sources]
+    return hashlib.sha1(json.dumps([INDEX_VERSION, K, W, stamp]).encode('utf-8')).hexdigest()
+
+
+class FingerprintIndex:
+    """Winnowing fingerprints of a reference corpus in one sorted array.
+
+    Lookups are binary searches (np.searchsorted) over the fingerprint hashes, so query
+    cost depends on the query length and log(corpus size), not on the number of documents.
+    Each fingerprint keeps its document id and word position, so hits can be merged back
+    into shared passages.
+    """
+
+    def __init__(self, hashes, doc_ids, positions, docs, signature=None):
+        self.hashes = hashes
+        self.doc_ids = doc_ids
+        self.positions = positions
+        self.docs = docs
+        self.signature = signature
+
+    @classmethod
+    def build(cls, references, signature=None):
+        hashes, doc_ids, positions, docs = [], [], [], []
+        for title, source, text in references:
+            fp, pos, _ = fingerprint(text)
+            if len(fp) == 0:
+                continue
+            hashes.append(fp)
+            doc_ids.append(np.full(len(fp), len(docs), dtype=np.int32))
+            positions.append(pos.astype(np.int32))
+            docs.append({'title': title, 'source': source})
+        if not docs:
+            return cls(np.empty(0, np.uint64), np.empty(0, np.int32), np.empty(0, np.int32), [], signature)
+        hashes, doc_ids, positions = np.concatenate(hashes), np.concatenate(doc_ids), np.concatenate(positions)
+        order = np.argsort(hashes, kind='stable')
+        return cls(hashes[order], doc_ids[order], positions[order], docs, signature)
+
+    def save(self, index_dir=INDEX_DIR):
+        os.makedirs(index_dir, exist_ok=True)
+        tmp_path = os.path.join(index_dir, "index.tmp.npz")
+        np.savez(tmp_path, hashes=self.hashes, doc_ids=self.doc_ids, positions=self.positions)
+        os.replace(tmp_path, os.path.join(index_dir, "index.npz"))
+        with open(os.path.join(index_dir, "docs.json"), "w", encoding="utf-8") as f:
+            json.dump({'signature': self.signature, 'docs': self.docs}, f)
+
+    @classmethod
+    def load(cls, index_dir=INDEX_DIR):
+        """Index saved in index_dir, or None if there is none."""
+        try:
+            with open(os.path.join(index_dir, "docs.json"), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            arrays = np.load(os.path.join(index_dir, "index.npz"))
+        except (OSError, ValueError):
+            return None
+        return cls(arrays['hashes'], arrays['doc_ids'], arrays['positions'], meta['docs'], meta['signature'])
+
+    def __len__(self):
+        return len(self.docs)
+
+    def query(self, text, min_hits=MIN_HITS, min_words=MIN_WORDS):
+        """Passages of `text` that share fingerprints with a reference document.
+
+        Returns dicts sorted by length: start/end (offsets into text), doc (title/source),
+        hits (shared fingerprints) and words (approximate length of the shared passage).
+        """
+        fp, pos, spans = fingerprint(text)
+        if len(fp) == 0 or len(self.hashes) == 0:
+            return []
+        lo = np.searchsorted(self.hashes, fp, side='left')
+        hi = np.searchsorted(self.hashes, fp, side='right')
+        found = np.flatnonzero(hi > lo)
+        if len(found) == 0:
+            return []
+
+        hits = {}
+        for i in found:
+            for doc in set(self.doc_ids[lo[i]:hi[i]].tolist()):
+                hits.setdefault(doc, []).append(int(pos[i]))
+
+        passages = []
+        gap = K + W  # fingerprints further apart than one window start a new passage
+        for doc, qpos in hits.items():
+            qpos.sort()
+            run = [qpos[0]]
+            for p in qpos[1:] + [None]:
+                if p is not None and p - run[-1] <= gap:
+                    run.append(p)
+                    continue
+                first, last = run[0], run[-1] + K - 1
+                if len(run) >= min_hits and last - first + 1 >= min_words:
+                    passages.append({'start': spans[first][0], 'end': spans[last][1], 'doc': self.docs[doc],
+                                     'hits': len(run), 'words': last - first + 1})
+                if p is not None:
+                    run = [p]
+        return sorted(passages, key=lambda x: -x['words'])
+
+
+def load_index(sources=None, index_dir=INDEX_DIR, rebuild=False, verbose=True):
+    """Persisted index, rebuilt when a reference source changed; None if there is no corpus."""
+    sources = reference_sources() if sources is None else sources
+    if not sources:
+        return None
+    signature = sources_signature(sources)
+    index = None if rebuild else FingerprintIndex.load(index_dir)
+    if index is None or index.signature != signature:
+        if verbose:
+            print(f"⏳ Building reference fingerprint index ({len(sources)} source file(s))...")
+        index = FingerprintIndex.build(iter_references(sources), signature)
+        index.save(index_dir)
+        if verbose:
+            print(f"   Indexed {len(index)} reference documents ({len(index.hashes)} fingerprints)")
+    return index
+
+
+if __name__ == "__main__":
+    # Rebuild the index from scratch: python -m auditor.fingerprint
+    load_index(rebuild=True)
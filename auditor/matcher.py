@@ -0,0 +1,79 @@
+import os
+import re
+import threading
+from collections import Counter
+
+# --- Phrase lists (one marker per line; '|' separates variants counted as that marker; '#' comments) ---
+PHRASE_DIR = os.environ.get('AUDITOR_PHRASE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'phrases'))
+
+_matchers = {}
+_lock = threading.Lock()
+
+
+def normalize(phrase):
+    return ' '.join(phrase.lower().split())
+
+
+def load_phrases(path):
+    """{variant: marker} from a phrase file."""
+    variants = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            forms = [normalize(v) for v in line.split('|') if v.strip()]
+            for form in forms:
+                variants.setdefault(form, forms[0])
+    return variants
+
+
+def _trie_pattern(node):
+    """Regex for a character trie: shared prefixes are matched once, so the scan cost
+    grows with the text rather than with the number of phrases."""
+    end = '' in node
+    branches = []
+    for ch in sorted(k for k in node if k):
+        atom = r'\s+' if ch == ' ' else re.escape(ch)
+        branches.append(atom + _trie_pattern(node[ch]))
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+    return f"(?:{body})?" if end else body
+
+
+class PhraseMatcher:
+    """All phrases of a list compiled into one case-insensitive regex on word boundaries.
+
+    Whitespace inside a phrase matches any run of whitespace (line-wrapped .qmd text),
+    and the longest phrase wins where several start at the same place.
+    """
+
+    def __init__(self, variants):
+        self.variants = variants
+        trie = {}
+        for form in variants:
+            node = trie
+            for ch in form:
+                node = node.setdefault(ch, {})
+            node[''] = True
+        self.pattern = re.compile(rf"(?<!\w)(?:{_trie_pattern(trie)})(?!\w)", re.IGNORECASE) if variants else None
+
+    def find(self, text):
+        """[(start, end, marker)] for every occurrence, in text order (one pass over the text)."""
+        if self.pattern is None:
+            return []
+        return [(m.start(), m.end(), self.variants[normalize(m.group())]) for m in self.pattern.finditer(text)]
+
+    def count(self, text):
+        return Counter(marker for _, _, marker in self.find(text))
+
+
+def get_matcher(name, phrase_dir=None):
+    """Compiled matcher for `<phrase_dir>/<name>.txt`, rebuilt when the file changes."""
+    path = os.path.join(phrase_dir or PHRASE_DIR, f"{name}.txt")
+    key = (path, os.path.getmtime(path))
+    with _lock:
+        if key not in _matchers:
+            _matchers[key] = PhraseMatcher(load_phrases(path))
+        return _matchers[key]
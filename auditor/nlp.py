@@ -0,0 +1,55 @@
+import os
+import threading
+
+# --- spaCy pipelines, loaded on first use ---
+# Each auditor check asks for the lightest pipeline that answers it:
+#   'sentences' -> blank English tokenizer + rule-based sentencizer (no model on disk is read)
+#   'syntax'    -> the trained model with only tok2vec + parser (dependency labels for passive voice)
+# spaCy itself is imported inside the loaders, so checks that need no NLP never pay for it.
+
+DEFAULT_MODEL = os.environ.get('AUDITOR_SPACY_MODEL', 'en_core_web_md')
+
+# Components of the en_core_web_* pipelines that no auditor check reads
+SYNTAX_EXCLUDE = ['tagger', 'attribute_ruler', 'lemmatizer', 'ner', 'senter', 'textcat']
+MODEL_HINT = "python -m spacy download {model}"
+
+_pipelines = {}
+_lock = threading.Lock()
+
+
+def _load_sentences(model):
+    import spacy
+
+    nlp = spacy.blank('en')
+    nlp.add_pipe('sentencizer')
+    return nlp
+
+
+def _load_syntax(model):
+    """Parser-only pipeline. The md/lg tok2vec uses the static vectors as input features,
+    so they load with it; with en_core_web_sm (no vectors) nothing extra is read."""
+    import spacy
+
+    return spacy.load(model, exclude=SYNTAX_EXCLUDE)
+
+
+PROFILES = {
+    'sentences': _load_sentences,
+    'syntax': _load_syntax,
+}
+
+
+def get_nlp(profile='sentences', model=None):
+    """Pipeline for `profile`, loaded once per process. Raises OSError if the model is not installed."""
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown NLP profile: {profile} (expected one of {sorted(PROFILES)})")
+    model = model or DEFAULT_MODEL
+    key = (profile, model)
+    with _lock:
+        if key not in _pipelines:
+            _pipelines[key] = PROFILES[profile](model)
+        return _pipelines[key]
+
+
+def is_loaded(profile='sentences', model=None):
+    return (profile, model or DEFAULT_MODEL) in _pipelines
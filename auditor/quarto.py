@@ -0,0 +1,69 @@
+import re
+
+# --- Quarto / Markdown preprocessing: hide everything that is not prose before the NLP layers ---
+# Non-prose characters are replaced by spaces (newlines are kept), so the masked text has the
+# same length as the source: every offset a layer reports is also an offset into the .qmd file.
+# Blank-only paragraphs (a whole code chunk, the YAML header) are then skipped by the paragraph
+# splitter and never reach spaCy.
+
+FRONT_MATTER = re.compile(r"\A---[ \t]*\n.*?\n(?:---|\.\.\.)[ \t]*(?:\n|\Z)", re.S)
+CODE_FENCE = re.compile(r"^[ \t]*(`{3,}|~{3,})[^\n]*\n.*?^[ \t]*\1[ \t]*$", re.S | re.M)
+DISPLAY_MATH = re.compile(r"\$\$.*?\$\$", re.S)
+HTML_COMMENT = re.compile(r"<!--.*?-->", re.S)
+SHORTCODE = re.compile(r"\{\{<.*?>\}\}", re.S)
+INLINE_CODE = re.compile(r"`[^`\n]+`")
+ATTRIBUTES = re.compile(r"\{[#.][^{}\n]*\}")  # {#fig-x width=80%}, {.callout-warning}
+LINK_TARGET = re.compile(r"(?<=\])\([^()\s]*(?:\s+\"[^\"]*\")?\)")  # ![caption](/results/figures/x.png)
+DIV_FENCE = re.compile(r"^[ \t]*:{3,}.*$", re.M)
+TABLE_ROW = re.compile(r"^[ \t]*\|.*$", re.M)
+CITATION_KEY = re.compile(r"(?<![\w.])@([\w:.#$%&+?<>~/-]*\w)")  # key blanked, '[@' kept as evidence
+
+INLINE_MATH = re.compile(r"(?<![\\$])\$(?!\s)([^$\n]+?)(?<!\s)\$(?!\d)")
+LATEX_PERCENT = re.compile(r"\\%")
+LATEX_COMMAND = re.compile(r"\\[A-Za-z]+|\\.|[{}^_]")
+
+# Whole spans blanked out, in order (code first, so '$' or '@' inside a chunk is never read as math/citation)
+BLOCKS = (FRONT_MATTER, CODE_FENCE, HTML_COMMENT, SHORTCODE, INLINE_CODE, DISPLAY_MATH, DIV_FENCE, TABLE_ROW,
+          ATTRIBUTES, LINK_TARGET)
+
+
+def _blank(chars, start, end):
+    for i in range(start, end):
+        if chars[i] != "\n":
+            chars[i] = " "
+
+
+def mask(text):
+    """Prose-only copy of a .qmd text with identical length and line breaks.
+
+    Front matter, code chunks, inline `{python}` expressions, shortcodes, display math,
+    tables, fenced divs, attribute blocks, link targets and citation keys are blanked.
+    Inline math keeps its content (statistics like $p = 0.03$ are prose) minus the $
+    delimiters and LaTeX markup; '\\%' becomes '%'.
+    """
+    chars = list(text)
+    for pattern in BLOCKS:
+        for m in pattern.finditer("".join(chars)):
+            _blank(chars, m.start(), m.end())
+
+    masked = "".join(chars)
+    for m in INLINE_MATH.finditer(masked):
+        _blank(chars, m.start(), m.start() + 1)
+        _blank(chars, m.end() - 1, m.end())
+        body_start = m.start(1)
+        for c in LATEX_PERCENT.finditer(m.group(1)):
+            chars[body_start + c.start()] = "%"
+            chars[body_start + c.start() + 1] = " "
+        for c in LATEX_COMMAND.finditer(LATEX_PERCENT.sub("% ", m.group(1))):
+            _blank(chars, body_start + c.start(), body_start + c.end())
+
+    masked = "".join(chars)
+    for m in CITATION_KEY.finditer(masked):
+        _blank(chars, m.start(1), m.end(1))
+    return "".join(chars)
+
+
+def prose_share(text, masked):
+    """Fraction of non-whitespace characters that survive masking."""
+    total = sum(1 for c in text if not c.isspace())
+    return sum(1 for c in masked if not c.isspace()) / total if total else 1.0
@@ -0,0 +1,93 @@
+import re
+from functools import lru_cache
+
+from auditor.cache import split_paragraphs
+
+# --- Readability counted per paragraph, aggregated per section and for the whole document ---
+# One pass over the text: each paragraph contributes sentence / word / syllable counts, and the
+# scores are computed from the sums, so a section map costs no more than the global score.
+# Syllables use the usual vowel-group heuristic (no dictionary download needed), memoized per word.
+# Abbreviations such as 'e.g.' and 'et al.' lose their final period before sentences are split.
+
+WORD = re.compile(r"[A-Za-z]+(?:'[a-z]+)?")
+SENTENCE_END = re.compile(r"[.!?]+(?=\s|$)")
+ABBREVIATION = re.compile(r"(?<![\w.])(?:e\.g|i\.e|et al|etc|vs|cf|approx|ca|resp|fig|figs|eq|ref|refs|dr|prof)\.",
+                          re.IGNORECASE)
+HEADING = re.compile(r"^(#{1,6})\s+(.*)")
+VOWEL_GROUP = re.compile(r"[aeiouy]+")
+SILENT_ENDING = re.compile(r"(?:[^laeiouy]es|[^laeiouytd]ed|[^le]e)$")
+HIATUS = re.compile(r"(?<![cgst])i[aou]|eo")  # vowel pairs usually spoken as two syllables (di-a, os-te-o)
+
+FIELDS = ('sentences', 'words', 'syllables', 'polysyllables')
+
+
+@lru_cache(maxsize=None)
+def syllables(word):
+    """Heuristic syllable count (vowel groups, silent endings, common hiatus pairs).
+
+    Replaces textstat's dictionary-based counter: close on clinical prose but not
+    identical, so scores can differ from textstat's by a few points.
+    """
+    word = word.lower()
+    if len(word) <= 3:
+        return 1
+    word = SILENT_ENDING.sub('', word)
+    if word.startswith('y'):
+        word = word[1:]
+    return max(1, len(VOWEL_GROUP.findall(word)) + len(HIATUS.findall(word)))
+
+
+def count(text):
+    """{'sentences', 'words', 'syllables', 'polysyllables'} for a block of prose."""
+    words = WORD.findall(text)
+    syl = [syllables(w) for w in words]
+    if not words:
+        sentences = 0
+    else:
+        protected = ABBREVIATION.sub(lambda m: m.group()[:-1], text)
+        sentences = sum(1 for part in SENTENCE_END.split(protected) if WORD.search(part))
+    return {'sentences': sentences, 'words': len(words), 'syllables': sum(syl),
+            'polysyllables': sum(1 for s in syl if s >= 3)}
+
+
+def add(total, counts):
+    for field in FIELDS:
+        total[field] += counts[field]
+    return total
+
+
+def flesch_reading_ease(c):
+    if not c['words'] or not c['sentences']:
+        return 0.0
+    return 206.835 - 1.015 * c['words'] / c['sentences'] - 84.6 * c['syllables'] / c['words']
+
+
+def flesch_kincaid_grade(c):
+    if not c['words'] or not c['sentences']:
+        return 0.0
+    return 0.39 * c['words'] / c['sentences'] + 11.8 * c['syllables'] / c['words'] - 15.59
+
+
+def readability_map(text):
+    """(document counts, sections). Sections start at Markdown headings; each is
+    {'title', 'start', 'counts', 'fre', 'grade'}. Text before the first heading is '(preamble)'."""
+    total = dict.fromkeys(FIELDS, 0)
+    sections = []
+    current = {'title': '(preamble)', 'start': 0, 'counts': dict.fromkeys(FIELDS, 0)}
+    for offset, paragraph in split_paragraphs(text):
+        lines = paragraph.strip().split('\n')
+        heading = HEADING.match(lines[0])
+        if heading:
+            sections.append(current)
+            current = {'title': heading.group(2).strip(), 'start': offset, 'counts': dict.fromkeys(FIELDS, 0)}
+            paragraph = '\n'.join(lines[1:])
+        c = count(paragraph)
+        add(current['counts'], c)
+        add(total, c)
+    sections.append(current)
+
+    sections = [s for s in sections if s['counts']['words']]
+    for s in sections:
+        s['fre'] = flesch_reading_ease(s['counts'])
+        s['grade'] = flesch_kincaid_grade(s['counts'])
+    return total, sections
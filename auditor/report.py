@@ -0,0 +1,105 @@
+import os
+import json
+import time
+
+import numpy as np
+
+from auditor.nlp import DEFAULT_MODEL
+
+# --- Aggregate audit report (JSON for tracking, Markdown for reading) ---
+# Flagged items per layer; their total drives the CLI exit code (--max-issues).
+ISSUE_KINDS = {
+    'ai_markers': 'AI-filler words',
+    'unsupported': 'Unsupported numeric claims',
+    'risky_phrases': 'Twin-paper phrases',
+    'overlaps': 'Passages overlapping the reference corpus',
+    'mismatched_numbers': 'Numbers differing from results tables',
+}
+
+
+def issue_counts(row):
+    return {kind: len(row.get(kind, [])) for kind in ISSUE_KINDS}
+
+
+def total_issues(rows):
+    return sum(sum(issue_counts(r).values()) for r in rows)
+
+
+def build_report(rows, parse_stats=None):
+    """One dict for the whole run: per-file results with issue counts, plus totals and layer costs."""
+    layer_seconds, tokens = {}, 0
+    for r in rows:
+        tokens += r.get('tokens', 0)
+        for layer, seconds in r.get('timings', {}).items():
+            layer_seconds[layer] = layer_seconds.get(layer, 0.0) + seconds
+    totals = {kind: sum(issue_counts(r)[kind] for r in rows) for kind in ISSUE_KINDS}
+    return {
+        'generated': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'model': DEFAULT_MODEL,
+        'parse': parse_stats or {},
+        'totals': {'files': len(rows), 'tokens': tokens, 'issues': totals, 'total_issues': sum(totals.values()),
+                   'layer_seconds': layer_seconds},
+        'files': [{**r, 'issues': issue_counts(r)} for r in rows],
+    }
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Not JSON serialisable: {type(value).__name__}")
+
+
+def write_json(report, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, default=_json_default)
+    print(f"💾 JSON report saved to: {path}")
+
+
+def write_markdown(report, path):
+    totals = report['totals']
+    lines = [
+        "# Manuscript Audit Report",
+        "",
+        f"Generated {report['generated']} · spaCy model `{report['model']}` · "
+        f"{totals['files']} files · {totals['tokens']:,} tokens · **{totals['total_issues']} issues**",
+        "",
+        "## Summary",
+        "",
+        "| File | Tokens | " + " | ".join(ISSUE_KINDS.values()) + " |",
+        "|:---|---:|" + "---:|" * len(ISSUE_KINDS),
+    ]
+    for r in report['files']:
+        lines.append(f"| {r['file']} | {r.get('tokens', 0):,} | " + " | ".join(str(r['issues'][k]) for k in ISSUE_KINDS) + " |")
+    lines.append(f"| **Total** | {totals['tokens']:,} | " + " | ".join(f"**{totals['issues'][k]}**" for k in ISSUE_KINDS) + " |")
+
+    lines += ["", "## Cost per Layer", "", "| Layer | Seconds | ms / 1k tokens |", "|:---|---:|---:|"]
+    parse = report.get('parse') or {}
+    if parse:
+        lines.append(f"| nlp.pipe (shared parse; {parse.get('paragraphs_parsed', 0)} paragraphs parsed, "
+                     f"{parse.get('paragraphs_reused', 0)} cached) | {parse.get('seconds', 0):.2f} | "
+                     f"{1e6 * parse.get('seconds', 0) / max(totals['tokens'], 1):.2f} |")
+    for layer, seconds in totals['layer_seconds'].items():
+        lines.append(f"| {layer} | {seconds:.2f} | {1e6 * seconds / max(totals['tokens'], 1):.2f} |")
+
+    lines += ["", "## Findings", ""]
+    for r in report['files']:
+        if not sum(r['issues'].values()):
+            continue
+        lines += [f"### {r['file']}", ""]
+        if r.get('ai_markers'):
+            lines.append(f"- **AI-filler:** {', '.join(r['ai_markers'])}")
+        lines += [f"- **Unsupported:** {claim}" for claim in r.get('unsupported', [])]
+        lines += [f"- **Twin-paper phrase:** '{phrase}'" for phrase in r.get('risky_phrases', [])]
+        lines += [f"- **Overlap** (~{o['words']} words): {o['doc']['title']}" for o in r.get('overlaps', [])]
+        for c in r.get('mismatched_numbers', []):
+            value, table, row, column = c['expected']
+            lines.append(f"- **Number differs from results tables:** {c['text']} (table: {value:g} · {table} · {row} · {column})")
+        lines.append("")
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines) + "\n")
+    print(f"💾 Markdown report saved to: {path}")
@@ -0,0 +1,228 @@
+import os
+import re
+import csv
+import glob
+import json
+import hashlib
+from collections import Counter
+
+import numpy as np
+
+from auditor.batch import REPO_ROOT
+from auditor.cache import DEFAULT_CACHE_DIR
+
+# --- Numeric claims vs. the project's results tables ---
+# Every number in results/tables/*.csv and *.md is indexed once per results version with its
+# provenance (table, row label = variable/cohort, column = statistic). Checking a manuscript is
+# then a binary search per number instead of re-reading the tables. A table value only backs a
+# claim when its row label or column shares a word with the claim's sentence: small values like
+# 0.03 or 1.0 occur in dozens of cells, so a bare value hit says nothing.
+INDEX_DIR = os.path.join(DEFAULT_CACHE_DIR, "results")
+INDEX_VERSION = 1
+
+CELL_NUMBER = re.compile(r"\d+(?:\.\d+)?(?:[eE][-+]?\d+)?")
+# Claims worth checking: decimals and percentages. Integers (years, n, reference numbers) are too
+# ambiguous, and inequalities like 'p < 0.001' are thresholds, not reported values.
+CLAIM_NUMBER = re.compile(r"(?<![\w.<>≤≥])(?<![<>]=)(?<![<>≤≥]\s)(?<![<>]=\s)(\d+\.\d+%?|\d+%)(?![\w.]\d)")
+_BOLD = re.compile(r"[*`$]")
+_WORD = re.compile(r"[a-z]{2,}")
+STOPWORDS = frozenset("an and are as at be by for from in is of on or per the to vs was were with".split())
+DRIFT_TOLERANCE = 0.10  # a clearly named cell within 10% of the claim is reported as drift
+CONTEXT_CHARS = 120  # at most this much text on each side of a number, cut at sentence boundaries
+SENTENCE_BREAK = re.compile(r"[.!?](?=\s)|\n[ \t]*\n")
+
+
+def find_results_dir(path, root=REPO_ROOT):
+    """results/tables of the project a manuscript belongs to (nearest ancestor), or None."""
+    d = os.path.dirname(os.path.abspath(path))
+    while True:
+        candidate = os.path.join(d, "results", "tables")
+        if os.path.isdir(candidate):
+            return candidate
+        if os.path.normpath(d) == os.path.normpath(root) or os.path.dirname(d) == d:
+            return None
+        d = os.path.dirname(d)
+
+
+def _clean(cell):
+    return " ".join(_BOLD.sub("", cell).split())
+
+
+def _csv_rows(path):
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+    return (rows[0], rows[1:]) if rows else ([], [])
+
+
+def _md_rows(path):
+    """Header and body rows of the pipe tables in a Markdown file (separator rows dropped)."""
+    header, body = None, []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line.startswith("|"):
+                header = None if header is not None and not body else header
+                continue
+            cells = [c.strip() for c in line.strip("|").split("|")]
+            if all(re.fullmatch(r":?-+:?", c) for c in cells if c):
+                continue
+            if header is None:
+                header = cells
+            else:
+                body.append(cells)
+    return header or [], body
+
+
+def table_records(path):
+    """[value, table, row label, column] for every number in a results table (the label column is skipped)."""
+    header, body = _csv_rows(path) if path.endswith(".csv") else _md_rows(path)
+    table = os.path.basename(path)
+    records = []
+    for row in body:
+        if not row:
+            continue
+        label = _clean(row[0])
+        for col, cell in enumerate(row[1:], start=1):
+            column = _clean(header[col]) if col < len(header) else ""
+            for m in CELL_NUMBER.finditer(cell):
+                records.append([float(m.group()), table, label, column])
+    return records
+
+
+def _words(text):
+    """Content words, with a trailing plural 's' folded ('fractures' ~ 'fracture')."""
+    words = set(_WORD.findall(text.lower().replace("_", " "))) - STOPWORDS
+    return {w[:-1] if len(w) > 3 and w.endswith("s") and not w.endswith("ss") else w for w in words}
+
+
+def claim_context(text, start, end):
+    """Words of the sentence around text[start:end] (clipped to CONTEXT_CHARS on each side)."""
+    lo = max(0, start - CONTEXT_CHARS)
+    breaks = [m.end() for m in SENTENCE_BREAK.finditer(text, lo, start)]
+    lo = breaks[-1] if breaks else lo
+    m = SENTENCE_BREAK.search(text, end, end + CONTEXT_CHARS)
+    return _words(text[lo:m.start() if m else end + CONTEXT_CHARS])
+
+
+def table_files(results_dir):
+    return sorted(glob.glob(os.path.join(results_dir, "*.csv")) + glob.glob(os.path.join(results_dir, "*.md")))
+
+
+def results_signature(files):
+    stamp = [(os.path.basename(p), os.path.getmtime(p), os.path.getsize(p)) for p in files]
+    return hashlib.sha1(json.dumps([INDEX_VERSION, stamp]).encode("utf-8")).hexdigest()
+
+
+class ResultsIndex:
+    """Sorted absolute values of every table number, with provenance for each,
+    plus an inverted index from row-label / column words to records."""
+
+    def __init__(self, records, signature=None):
+        order = sorted(range(len(records)), key=lambda i: abs(records[i][0]))
+        self.records = [records[i] for i in order]
+        self.values = np.array([abs(r[0]) for r in self.records], dtype=float)
+        self.signature = signature
+        self.row_words = [_words(r[2]) for r in self.records]
+        self.column_words = [_words(r[3]) for r in self.records]
+        self.label_words = [row | col for row, col in zip(self.row_words, self.column_words)]
+        self.by_word = {}
+        for i, words in enumerate(self.label_words):
+            for w in words:
+                self.by_word.setdefault(w, []).append(i)
+
+    def __len__(self):
+        return len(self.records)
+
+    def _span(self, value, decimals):
+        tol = 0.5 * 10 ** -decimals + 1e-9
+        lo, hi = np.searchsorted(self.values, [value - tol, value + tol], side="left")
+        return range(lo, hi)
+
+    def lookup(self, value, decimals):
+        """Records whose value rounds to `value` at the claim's precision (sign ignored:
+        text says 'reduced by 14.3%' where the table has -14.3)."""
+        return [self.records[i] for i in self._span(value, decimals)]
+
+    def best_context(self, context, value, scales):
+        """Cell the sentence clearly refers to, if its value is close enough to be the same statistic.
+
+        Candidates share words with both their row label and their column: one word in
+        common ('fracture', 'osteopenic') names a cohort or statistic, not a cell. Most shared
+        words wins, closest value on ties; the winner is only returned when it lies within
+        DRIFT_TOLERANCE of the claim (a p-value next to a percentage is not drift).
+        """
+        overlap = Counter(i for w in context for i in self.by_word.get(w, ()))
+        strong = [i for i in overlap if context & self.row_words[i] and context & self.column_words[i]]
+        if not strong:
+            return None
+
+        def distance(i):
+            return min(abs(self.values[i] - value * s) / (value * s or 1) for s in scales)
+
+        top = max(overlap[i] for i in strong)
+        best = min((i for i in strong if overlap[i] == top), key=distance)
+        return self.records[best] if distance(best) <= DRIFT_TOLERANCE else None
+
+    def check(self, text):
+        """Numeric claims in `text` checked against the tables.
+
+        [{'start', 'end', 'text', 'value', 'status', 'matches': [records], 'expected': record | None}]
+        - 'match': table cells with this value whose row label / column shares words with the
+          claim's sentence (best overlap first); percentages also match proportions (27.1% vs 0.271).
+        - 'mismatch': the sentence clearly names a cell (see best_context) that holds a nearby
+          but different value ('expected').
+        - 'unmatched': the sentence names no cell clearly enough to compare (informational).
+        """
+        claims = []
+        for m in CLAIM_NUMBER.finditer(text):
+            raw = m.group(1)
+            number = raw.rstrip("%")
+            decimals = len(number.split(".")[1]) if "." in number else 0
+            value = float(number)
+            scales = (1, 0.01) if raw.endswith("%") else (1,)
+            context = claim_context(text, m.start(1), m.end(1))
+
+            hits = list(self._span(value, decimals))
+            if raw.endswith("%"):
+                hits += self._span(value / 100, decimals + 2)
+            scored = [(len(context & self.label_words[i]), i) for i in hits]
+            matches = [self.records[i] for n, i in sorted(scored, key=lambda x: -x[0]) if n]
+
+            expected = None
+            if matches:
+                status = 'match'
+            else:
+                expected = self.best_context(context, value, scales)
+                status = 'mismatch' if expected is not None else 'unmatched'
+            claims.append({'start': m.start(1), 'end': m.end(1), 'text': raw, 'value': value,
+                           'status': status, 'matches': matches, 'expected': expected})
+        return claims
+
+
+_loaded = {}
+
+
+def load_results_index(results_dir, index_dir=INDEX_DIR):
+    """Index for a results/tables folder: read from disk, rebuilt when any table changed."""
+    files = table_files(results_dir)
+    signature = results_signature(files)
+    if results_dir in _loaded and _loaded[results_dir].signature == signature:
+        return _loaded[results_dir]
+
+    path = os.path.join(index_dir, hashlib.sha1(os.path.abspath(results_dir).encode("utf-8")).hexdigest()[:12] + ".json")
+    records = None
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            saved = json.load(f)
+        if saved.get("signature") == signature:
+            records = saved["records"]
+    if records is None:
+        print(f"⏳ Indexing {len(files)} results tables in {os.path.relpath(results_dir, REPO_ROOT)}...")
+        records = [r for p in files for r in table_records(p)]
+        os.makedirs(index_dir, exist_ok=True)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"signature": signature, "records": records}, f)
+        os.replace(path + ".tmp", path)
+
+    _loaded[results_dir] = ResultsIndex(records, signature)
+    return _loaded[results_dir]
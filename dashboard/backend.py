@@ -0,0 +1,236 @@
+import os
+import glob
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from dashboard.metadata import file_hash
+
+# SQL types DuckDB reports for numeric columns
+DUCKDB_NUMERIC_PREFIXES = ('TINYINT', 'SMALLINT', 'INTEGER', 'BIGINT', 'HUGEINT', 'UTINYINT', 'USMALLINT',
+                           'UINTEGER', 'UBIGINT', 'FLOAT', 'REAL', 'DOUBLE', 'DECIMAL')
+DESCRIBE_INDEX = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+BATCH_ROWS = 65536  # rows per block when a whole-table pass is streamed (iter_batches)
+
+
+def add_derived_columns(df):
+    # Calculated BMI if missing
+    if 'BMI' not in df.columns and 'Weight_kg' in df.columns:
+        df['BMI'] = df['Weight_kg'] / ((df['Height_cm'] / 100) ** 2)
+    return df
+
+
+class PandasBackend:
+    """The original behaviour: the whole CSV in one in-memory DataFrame."""
+
+    kind = 'csv'
+    in_memory = True
+
+    def __init__(self, path):
+        self.path = path
+        self.fingerprint = file_hash(path)
+        self.df = add_derived_columns(pd.read_csv(path))
+
+    # --- Schema ---
+    @property
+    def columns(self):
+        return self.df.columns.tolist()
+
+    def numeric_columns(self):
+        return self.df.select_dtypes(include=[np.number]).columns.tolist()
+
+    def dtypes(self):
+        return {col: str(dtype) for col, dtype in self.df.dtypes.items()}
+
+    def n_rows(self):
+        return len(self.df)
+
+    # --- Queries ---
+    def fetch(self, columns, filters=None):
+        """Materializes only `columns`, optionally restricted to rows where filters {col: [values]} match."""
+        data = self.df
+        if filters:
+            mask = np.ones(len(data), dtype=bool)
+            for col, values in filters.items():
+                mask &= data[col].isin(values).to_numpy()
+            data = data[mask]
+        return data[list(dict.fromkeys(columns))]
+
+    def iter_batches(self, columns, batch_rows=BATCH_ROWS):
+        """Float blocks (rows, len(columns)) of `columns`, NaN for missing, `batch_rows` rows at a time."""
+        values = self.df[list(columns)].to_numpy(dtype=float)
+        for start in range(0, len(values), batch_rows):
+            yield values[start:start + batch_rows]
+
+    def head(self, n=10):
+        return self.df.head(n)
+
+    def distinct(self, col):
+        return self.df[col].dropna().unique().tolist()
+
+    def distinct_counts(self, columns):
+        return self.df[columns].nunique() if columns else pd.Series(dtype=int)
+
+    def numeric_summary(self, columns):
+        return self.df[columns].describe().T if columns else pd.DataFrame()
+
+    def categorical_summary(self, columns):
+        if not columns:
+            return pd.DataFrame()
+        return pd.DataFrame({
+            'n_unique': self.df[columns].nunique(),
+            'top': [self.df[c].mode().iloc[0] if self.df[c].notna().any() else None for c in columns],
+        }, index=columns)
+
+    def missing_counts(self):
+        return self.df.isna().sum()
+
+
+class DuckDBParquetBackend:
+    """Queries a local Parquet dataset (file, directory or glob) through DuckDB.
+
+    Column selection and group filters are pushed down into the Parquet scan, so each
+    module materializes only the columns it plots. Summaries and missingness are
+    computed by DuckDB aggregates without loading the table into pandas; whole-table
+    passes (profiles, correlations) read it in blocks through iter_batches.
+    """
+
+    kind = 'parquet'
+    in_memory = False
+
+    def __init__(self, path):
+        import duckdb
+
+        self.path = path
+        self.files = parquet_files(path)
+        if not self.files:
+            raise FileNotFoundError(f"No Parquet files found at: {path}")
+        self.fingerprint = dataset_fingerprint(path)
+
+        self._con = duckdb.connect(database=':memory:')
+        file_list = ', '.join(_literal(f) for f in self.files)
+        self._con.execute(f"CREATE VIEW raw AS SELECT * FROM read_parquet([{file_list}], union_by_name=true)")
+
+        raw_cols = [row[0] for row in self._cursor().execute("DESCRIBE raw").fetchall()]
+        derived = ''
+        if 'BMI' not in raw_cols and 'Weight_kg' in raw_cols and 'Height_cm' in raw_cols:
+            derived = ', "Weight_kg" / pow("Height_cm" / 100, 2) AS "BMI"'
+        self._con.execute(f"CREATE VIEW data AS SELECT *{derived} FROM raw")
+        self._schema = [(row[0], row[1]) for row in self._cursor().execute("DESCRIBE data").fetchall()]
+
+    def _cursor(self):
+        # One cursor per query: the connection is shared by every Streamlit session thread
+        return self._con.cursor()
+
+    # --- Schema ---
+    @property
+    def columns(self):
+        return [name for name, _ in self._schema]
+
+    def numeric_columns(self):
+        return [name for name, sql_type in self._schema if sql_type.upper().startswith(DUCKDB_NUMERIC_PREFIXES)]
+
+    def dtypes(self):
+        return dict(self._schema)
+
+    def n_rows(self):
+        return self._cursor().execute("SELECT count(*) FROM data").fetchone()[0]
+
+    # --- Queries ---
+    def fetch(self, columns, filters=None):
+        select = ', '.join(_ident(c) for c in dict.fromkeys(columns))
+        where, params = _where(filters)
+        return self._cursor().execute(f"SELECT {select} FROM data{where}", params).df()
+
+    def iter_batches(self, columns, batch_rows=BATCH_ROWS):
+        """Streams `columns` as float blocks; only one block is in memory at a time."""
+        select = ', '.join(f"CAST({_ident(c)} AS DOUBLE)" for c in columns)
+        result = self._cursor().execute(f"SELECT {select} FROM data")
+        # DuckDB hands out results in vectors of 2048 rows
+        vectors = max(1, batch_rows // 2048)
+        while True:
+            chunk = result.fetch_df_chunk(vectors)
+            if chunk.empty:
+                break
+            yield chunk.to_numpy(dtype=float)
+
+    def head(self, n=10):
+        return self._cursor().execute(f"SELECT * FROM data LIMIT {int(n)}").df()
+
+    def distinct(self, col):
+        rows = self._cursor().execute(
+            f"SELECT DISTINCT {_ident(col)} FROM data WHERE {_ident(col)} IS NOT NULL ORDER BY 1").fetchall()
+        return [row[0] for row in rows]
+
+    def distinct_counts(self, columns):
+        if not columns:
+            return pd.Series(dtype=int)
+        aggregates = ', '.join(f"count(DISTINCT {_ident(c)})" for c in columns)
+        row = self._cursor().execute(f"SELECT {aggregates} FROM data").fetchone()
+        return pd.Series(row, index=columns)
+
+    def numeric_summary(self, columns):
+        if not columns:
+            return pd.DataFrame()
+        aggregates = []
+        for c in columns:
+            q = _ident(c)
+            aggregates.extend([f"count({q})", f"avg({q})", f"stddev_samp({q})", f"min({q})",
+                               f"quantile_cont({q}, 0.25)", f"quantile_cont({q}, 0.5)",
+                               f"quantile_cont({q}, 0.75)", f"max({q})"])
+        row = self._cursor().execute(f"SELECT {', '.join(aggregates)} FROM data").fetchone()
+        values = np.array(row, dtype=float).reshape(len(columns), len(DESCRIBE_INDEX))
+        return pd.DataFrame(values, index=columns, columns=DESCRIBE_INDEX)
+
+    def categorical_summary(self, columns):
+        if not columns:
+            return pd.DataFrame()
+        aggregates = ', '.join(f"count(DISTINCT {_ident(c)}), mode({_ident(c)})" for c in columns)
+        row = self._cursor().execute(f"SELECT {aggregates} FROM data").fetchone()
+        return pd.DataFrame({'n_unique': row[0::2], 'top': row[1::2]}, index=columns)
+
+    def missing_counts(self):
+        cols = self.columns
+        aggregates = ', '.join(f"count(*) - count({_ident(c)})" for c in cols)
+        row = self._cursor().execute(f"SELECT {aggregates} FROM data").fetchone()
+        return pd.Series(row, index=cols)
+
+
+def _ident(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _literal(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _where(filters):
+    if not filters:
+        return '', []
+    clauses, params = [], []
+    for col, values in filters.items():
+        values = list(values)
+        clauses.append(f"{_ident(col)} IN ({', '.join('?' for _ in values)})")
+        params.extend(values)
+    return ' WHERE ' + ' AND '.join(clauses), params
+
+
+def parquet_files(path):
+    pattern = os.path.join(path, '**', '*.parquet') if os.path.isdir(path) else path
+    return sorted(glob.glob(pattern, recursive=True))
+
+
+def dataset_fingerprint(path):
+    """Cache key for a dataset: CSV content hash, or a hash of the Parquet file list with sizes/mtimes."""
+    if path.lower().endswith('.csv'):
+        return file_hash(path)
+    stamp = '|'.join(f"{f}:{os.path.getsize(f)}:{os.path.getmtime(f)}" for f in parquet_files(path))
+    return hashlib.sha1(stamp.encode()).hexdigest()
+
+
+def open_backend(path):
+    """Picks the backend from the path: .csv -> pandas, .parquet / directory / glob -> DuckDB."""
+    if path.lower().endswith('.csv'):
+        return PandasBackend(path)
+    return DuckDBParquetBackend(path)
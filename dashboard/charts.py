@@ -0,0 +1,163 @@
+import numpy as np
+import pandas as pd
+
+# Client-side (Vega-Lite) chart specs for the dashboard.
+# Each builder reduces the data on the server first (histogram bins, box-plot five-number
+# summaries, long-form correlation cells, capped point samples) so the browser receives a few
+# hundred rows at most and no PNG is encoded per interaction.
+
+MAX_POINTS = 2000
+
+
+def downsample(values, max_points=MAX_POINTS, seed=0):
+    """Deterministic random subset of at most max_points values (order preserved)."""
+    values = np.asarray(values)
+    if len(values) <= max_points:
+        return values
+    keep = np.sort(np.random.default_rng(seed).choice(len(values), max_points, replace=False))
+    return values[keep]
+
+
+def _finite(values):
+    values = np.asarray(values, dtype=float)
+    return values[np.isfinite(values)]
+
+
+def box_stats(values):
+    """Quartiles plus 1.5 IQR whiskers clipped to the data (seaborn/matplotlib convention)."""
+    values = _finite(values)
+    if len(values) == 0:
+        return None
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    low = values[values >= q1 - 1.5 * iqr].min()
+    high = values[values <= q3 + 1.5 * iqr].max()
+    return {'q1': q1, 'median': median, 'q3': q3, 'low': low, 'high': high}
+
+
+# --- 1. HISTOGRAM ---
+def binned_histogram_spec(edges, counts, title, kde=None, color='teal'):
+    """Histogram from precomputed bins; kde=(grid, counts-scaled density) adds a line layer."""
+    data = pd.DataFrame({'bin_start': edges[:-1], 'bin_end': edges[1:], 'count': counts})
+    bars = {
+        'data': {'values': data.to_dict(orient='records')},
+        'mark': {'type': 'bar', 'color': color, 'opacity': 0.8},
+        'encoding': {
+            'x': {'field': 'bin_start', 'type': 'quantitative', 'bin': {'binned': True}, 'title': None},
+            'x2': {'field': 'bin_end'},
+            'y': {'field': 'count', 'type': 'quantitative', 'title': 'Count'},
+            'tooltip': [{'field': 'bin_start', 'format': '.2f'}, {'field': 'bin_end', 'format': '.2f'},
+                        {'field': 'count'}],
+        },
+    }
+    if kde is None:
+        return {'title': title, **bars}
+    grid, density = kde
+    line = {
+        'data': {'values': [{'x': a, 'density': b}
+                            for a, b in zip(np.asarray(grid).tolist(), np.asarray(density).tolist())]},
+        'mark': {'type': 'line', 'color': color},
+        'encoding': {'x': {'field': 'x', 'type': 'quantitative'}, 'y': {'field': 'density', 'type': 'quantitative'}},
+    }
+    return {'title': title, 'layer': [bars, line]}
+
+
+# --- 2. BOX + STRIP (PRE-AGGREGATED) ---
+def box_strip_spec(groups, value_name, group_name='Group', title=None, max_points=MAX_POINTS):
+    """groups: {label: values}. Boxes come from server-side summaries, points are a capped sample."""
+    summary, points = [], []
+    for label, values in groups.items():
+        stats = box_stats(values)
+        if stats is None:
+            continue
+        summary.append({group_name: str(label), **stats})
+        points.extend({group_name: str(label), value_name: v}
+                      for v in downsample(_finite(values), max_points // max(len(groups), 1)).tolist())
+
+    x = {'field': group_name, 'type': 'nominal', 'title': group_name}
+    return {
+        'title': title or f"{value_name} by {group_name}",
+        'layer': _box_layers(summary, x, value_name) + [
+            {'data': {'values': points}, 'transform': [{'calculate': 'random() - 0.5', 'as': 'jitter'}],
+             'mark': {'type': 'circle', 'color': 'black', 'opacity': 0.5, 'size': 20},
+             'encoding': {'x': x, 'xOffset': {'field': 'jitter', 'type': 'quantitative', 'scale': {'domain': [-2, 2]}},
+                          'y': {'field': value_name, 'type': 'quantitative'}}},
+        ],
+    }
+
+
+def box_summary_spec(stats, value_name, title=None):
+    """Single box from precomputed stats (ProfileSnapshot.box); outliers drawn as points."""
+    summary = [{'Variable': value_name, 'q1': stats['q1'], 'median': stats['med'], 'q3': stats['q3'],
+                'low': stats['whislo'], 'high': stats['whishi']}]
+    x = {'field': 'Variable', 'type': 'nominal', 'title': None}
+    fliers = [{'Variable': value_name, value_name: v} for v in downsample(stats['fliers']).tolist()]
+    return {
+        'title': title or value_name,
+        'layer': _box_layers(summary, x, value_name) + [
+            {'data': {'values': fliers}, 'mark': {'type': 'point', 'color': 'black'},
+             'encoding': {'x': x, 'y': {'field': value_name, 'type': 'quantitative'}}},
+        ],
+    }
+
+
+def _box_layers(summary, x, value_name):
+    y_title = {'title': value_name}
+    group_name = x['field']
+    return [
+        {'data': {'values': summary}, 'mark': {'type': 'rule'},
+         'encoding': {'x': x, 'y': {'field': 'low', 'type': 'quantitative', **y_title}, 'y2': {'field': 'high'}}},
+        {'data': {'values': summary}, 'mark': {'type': 'bar', 'size': 60, 'opacity': 0.6},
+         'encoding': {'x': x, 'y': {'field': 'q1', 'type': 'quantitative'}, 'y2': {'field': 'q3'},
+                      'color': {'field': group_name, 'type': 'nominal', 'legend': None},
+                      'tooltip': [{'field': k, 'format': '.2f'} for k in ('low', 'q1', 'median', 'q3', 'high')]}},
+        {'data': {'values': summary}, 'mark': {'type': 'tick', 'color': 'black', 'size': 60},
+         'encoding': {'x': x, 'y': {'field': 'median', 'type': 'quantitative'}}},
+    ]
+
+
+# --- 3. CORRELATION HEATMAP ---
+def heatmap_spec(corr_df, p_df=None, hide_ns=False, title=None):
+    cells = corr_df.stack(future_stack=True).rename('r').reset_index()
+    cells.columns = ['Variable 1', 'Variable 2', 'r']
+    if p_df is not None:
+        cells['p'] = p_df.stack(future_stack=True).to_numpy()
+        if hide_ns:
+            cells.loc[cells['p'] >= 0.05, 'r'] = np.nan
+    order = list(corr_df.columns)
+    tooltip = [{'field': 'Variable 1'}, {'field': 'Variable 2'}, {'field': 'r', 'format': '.3f'}]
+    if p_df is not None:
+        tooltip.append({'field': 'p', 'format': '.2e'})
+    spec = {
+        'data': {'values': cells.astype(object).where(cells.notna(), None).to_dict(orient='records')},
+        'mark': 'rect',
+        'encoding': {
+            'x': {'field': 'Variable 2', 'type': 'nominal', 'sort': order, 'title': None},
+            'y': {'field': 'Variable 1', 'type': 'nominal', 'sort': order, 'title': None},
+            'color': {'field': 'r', 'type': 'quantitative',
+                      'scale': {'scheme': 'redblue', 'reverse': True, 'domain': [-1, 1]}},
+            'tooltip': tooltip,
+        },
+    }
+    if title:
+        spec['title'] = title
+    return spec
+
+
+# --- 4. SCATTER (E.G. RESIDUALS VS FITTED) ---
+def scatter_spec(x, y, x_title, y_title, title=None, hline=None, max_points=MAX_POINTS):
+    xy = np.column_stack([np.asarray(x, dtype=float), np.asarray(y, dtype=float)])
+    xy = downsample(xy[np.isfinite(xy).all(axis=1)], max_points)
+    layers = [{
+        'data': {'values': [{'x': a, 'y': b} for a, b in xy.tolist()]},
+        'mark': {'type': 'circle', 'opacity': 0.6},
+        'encoding': {'x': {'field': 'x', 'type': 'quantitative', 'title': x_title},
+                     'y': {'field': 'y', 'type': 'quantitative', 'title': y_title}},
+    }]
+    if hline is not None:
+        layers.append({'data': {'values': [{'y': hline}]}, 'mark': {'type': 'rule', 'color': 'red', 'strokeDash': [4, 4]},
+                       'encoding': {'y': {'field': 'y', 'type': 'quantitative'}}})
+    spec = {'layer': layers}
+    if title:
+        spec['title'] = title
+    return spec
@@ -0,0 +1,114 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from scipy.stats import ttest_ind
+
+from dashboard.sweep import sweep_table
+
+
+class LRUCache:
+    """Small thread-safe LRU shared by all Streamlit sessions in the process."""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, compute):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+        value = compute()
+        with self._lock:
+            self.misses += 1
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def peek(self, key):
+        """Cached value or None, without computing or touching the hit/miss counters."""
+        with self._lock:
+            return self._data.get(key)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class ComparisonService:
+    """Two-group hypothesis tests with memoised results for one dataset.
+
+    - Group index: for each grouping variable, the row positions of every level
+      (built once), so selecting a group is `np.take`, not a full-column comparison.
+    - Column cache: numeric columns are fetched from the backend once as arrays.
+    - Result LRU keyed on (dataset fingerprint, group_var, g1, g2, target_var).
+
+    Row positions rely on the backend returning rows in a stable order across
+    column fetches (true for pandas and for DuckDB's default insertion-order scans).
+    """
+
+    def __init__(self, backend, maxsize=256):
+        self.backend = backend
+        self.fingerprint = backend.fingerprint
+        self._group_index = LRUCache(maxsize=32)
+        self._columns = LRUCache(maxsize=128)
+        self.results = LRUCache(maxsize=maxsize)
+
+    def caches(self):
+        return {'group_index': self._group_index, 'columns': self._columns, 'results': self.results}
+
+    def group_index(self, group_var):
+        """{level: int64 row positions} for a categorical column."""
+        def build():
+            codes, levels = pd.factorize(self.backend.fetch([group_var])[group_var], sort=False)
+            order = np.argsort(codes, kind='stable')
+            bounds = np.searchsorted(codes[order], np.arange(len(levels) + 1))
+            return {level: order[bounds[i]:bounds[i + 1]] for i, level in enumerate(levels)}
+
+        return self._group_index.get(group_var, build)
+
+    def column(self, col):
+        return self._columns.get(
+            col, lambda: pd.to_numeric(self.backend.fetch([col])[col], errors='coerce').to_numpy(dtype=float))
+
+    def group_values(self, group_var, level, target_var):
+        positions = self.group_index(group_var).get(level, np.empty(0, dtype=np.int64))
+        values = np.take(self.column(target_var), positions)
+        return values[~np.isnan(values)]
+
+    def compare(self, group_var, g1, g2, target_var):
+        """Student's t-test (as before) plus group means; cached per selection."""
+        key = (self.fingerprint, group_var, g1, g2, target_var)
+
+        def compute():
+            d1 = self.group_values(group_var, g1, target_var)
+            d2 = self.group_values(group_var, g2, target_var)
+            result = {'d1': d1, 'd2': d2, 'n1': len(d1), 'n2': len(d2),
+                      'mean1': np.nan, 'mean2': np.nan, 't_stat': np.nan, 'p_val': np.nan}
+            if len(d1) > 1 and len(d2) > 1:
+                t_stat, p_val = ttest_ind(d1, d2)
+                result.update(mean1=d1.mean(), mean2=d2.mean(), t_stat=float(t_stat), p_val=float(p_val))
+            return result
+
+        return self.results.get(key, compute)
+
+    def sweep(self, group_var, g1, g2, columns, categories=None):
+        """Full battery (t-test, Mann-Whitney, Cohen's d, AUC) for g1 vs g2 across `columns` in one pass."""
+        key = ('sweep', self.fingerprint, group_var, g1, g2, tuple(columns))
+
+        def compute():
+            index = self.group_index(group_var)
+            empty = np.empty(0, dtype=np.int64)
+            matrix = np.column_stack([self.column(c) for c in columns])
+            x1 = matrix[index.get(g1, empty)]
+            x2 = matrix[index.get(g2, empty)]
+            return sweep_table(x1, x2, columns, categories)
+
+        return self.results.get(key, compute)
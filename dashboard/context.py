@@ -0,0 +1,100 @@
+import streamlit as st
+
+from dashboard import diagnostics
+from dashboard.backend import open_backend
+
+# Process-wide caches: one instance per dataset fingerprint, shared by every session.
+# Service modules (scipy / statsmodels users) are imported inside the getters so a page
+# only pays for the libraries it actually needs.
+
+
+@st.cache_resource
+def get_backend(path, fingerprint):
+    # fingerprint is part of the cache key so an edited dataset is reopened
+    return open_backend(path)
+
+
+# --- Variable Metadata (dtypes, categories, summaries, missingness) ---
+# Built once per dataset and shared across reruns/sessions instead of recomputed on every widget interaction
+@st.cache_resource
+def get_metadata(fingerprint, _backend):
+    from dashboard.metadata import build_metadata
+    return build_metadata(_backend)
+
+
+# --- Profiling Snapshot (histogram bins, KDE grids, box stats for every numeric column) ---
+# Streamed from the backend in row blocks; the describe() part is reused from the metadata
+@st.cache_resource
+def get_profile(fingerprint, _backend, _meta):
+    from dashboard.profiling import build_profile
+    return build_profile(_backend, _meta)
+
+
+# --- Comparison Service (group index + result LRU, shared across sessions) ---
+@st.cache_resource
+def get_comparison_service(fingerprint, _backend):
+    from dashboard.comparisons import ComparisonService
+    service = ComparisonService(_backend)
+    diagnostics.watch(f"comparisons@{fingerprint[:8]}", service.caches())
+    return service
+
+
+# --- Regression Workbench (design / cross-product / fit caches shared across sessions) ---
+@st.cache_resource
+def get_regression_workbench(fingerprint, _backend):
+    from dashboard.regression import RegressionWorkbench
+    workbench = RegressionWorkbench(_backend)
+    diagnostics.watch(f"regression@{fingerprint[:8]}", workbench.caches())
+    return workbench
+
+
+# --- Correlation Engine (Pearson matrices once per dataset; Spearman per selected column set) ---
+@st.cache_resource
+def get_correlation_engine(fingerprint, _backend, _meta):
+    from dashboard.correlation import CorrelationEngine
+    engine = CorrelationEngine(_backend, _meta.summary.loc[_meta.num_cols])
+    diagnostics.watch(f"correlation@{fingerprint[:8]}", engine.caches())
+    return engine
+
+
+class DashboardContext:
+    """What a page's render(ctx) gets: the shared dataset objects plus this session's state.
+
+    Services are resolved lazily from the process-wide caches above, so e.g. the
+    Data Overview page never imports scipy. `state(page)` is a dict in
+    st.session_state private to one page of one browser session. `timer(stage)`
+    times a block for the Diagnostics panel (no-op unless enabled).
+    """
+
+    def __init__(self, data_path, backend, meta, client_charts=False, diag=None):
+        self.data_path = data_path
+        self.backend = backend
+        self.meta = meta
+        self.client_charts = client_charts
+        self.diag = diag or diagnostics.Diagnostics(enabled=False)
+
+    def timer(self, stage):
+        return self.diag.stage(stage)
+
+    @property
+    def fingerprint(self):
+        return self.backend.fingerprint
+
+    @property
+    def profile(self):
+        return get_profile(self.fingerprint, self.backend, self.meta)
+
+    @property
+    def comparisons(self):
+        return get_comparison_service(self.fingerprint, self.backend)
+
+    @property
+    def workbench(self):
+        return get_regression_workbench(self.fingerprint, self.backend)
+
+    @property
+    def correlation(self):
+        return get_correlation_engine(self.fingerprint, self.backend, self.meta)
+
+    def state(self, page):
+        return st.session_state.setdefault('page_state', {}).setdefault(page, {})
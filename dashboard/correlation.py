@@ -0,0 +1,199 @@
+import threading
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from dashboard.comparisons import LRUCache
+
+
+def cross_products(blocks):
+    """Pairwise-complete sums for all columns, accumulated over row blocks of z (NaN = missing).
+
+    Four matrix products per block instead of a per-pair loop:
+        n_ij = M'M,  s_ij = Z0'M,  q_ij = (Z0^2)'M,  c_ij = Z0'Z0
+    where M is the observed mask and Z0 the data with NaN -> 0. Returns (n, s, q, c).
+    """
+    n = s = q = c = 0.0
+    for z in blocks:
+        mask = (~np.isnan(z)).astype(float)
+        z0 = np.where(mask > 0, z, 0.0)
+        n = n + mask.T @ mask
+        s = s + z0.T @ mask    # s[i, j] = sum of column i over rows where j is also observed
+        q = q + (z0 ** 2).T @ mask
+        c = c + z0.T @ z0
+    return n, s, q, c
+
+
+def pairwise_corr(z):
+    """Pairwise-complete Pearson r and pair counts for all columns of z (NaN = missing)."""
+    return corr_from_products(*cross_products([z]))
+
+
+def corr_from_products(n, s, q, c):
+    """(r, n) from the pairwise-complete sums of cross_products."""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = n * c - s * s.T
+        var_i = n * q - s ** 2
+        r = cov / np.sqrt(var_i * var_i.T)
+    r = np.clip(r, -1, 1)
+    np.fill_diagonal(r, np.where(np.diag(n) > 1, 1.0, np.nan))
+    return r, n
+
+
+def _tie_bounds(sorted_rows):
+    """First and last sorted position of every element's tie group, per row of a (p, n) array."""
+    n = sorted_rows.shape[1]
+    pos = np.arange(n)
+    new = np.ones(sorted_rows.shape, dtype=bool)
+    new[:, 1:] = sorted_rows[:, 1:] != sorted_rows[:, :-1]
+    ends = np.ones(sorted_rows.shape, dtype=bool)
+    ends[:, :-1] = new[:, 1:]
+    first = np.maximum.accumulate(np.where(new, pos, 0), axis=1)
+    last = np.minimum.accumulate(np.where(ends, pos, n - 1)[:, ::-1], axis=1)[:, ::-1]
+    return first, last
+
+
+def pairwise_spearman(x):
+    """Pairwise-complete Spearman r and pair counts: each pair ranked over the rows where both are observed.
+
+    Every column is sorted once. For column i, the rows observed in both i and j are
+    counted cumulatively along i's sort order and along each j's, which gives both
+    pairwise average ranks for all j > i at once; r is Pearson on those ranks. The work
+    is O(n p) numpy per column, with no per-pair Python loop.
+    """
+    n_rows, p = x.shape
+    xt = np.ascontiguousarray(x.T)
+    mask = (~np.isnan(xt)).astype(float)  # (p, n): rows are columns of x, contiguous
+    n = mask @ mask.T
+    order = np.argsort(xt, axis=1, kind='stable')  # NaN sorts last
+    first, last = _tie_bounds(np.take_along_axis(xt, order, axis=1))
+    offsets = np.arange(p)[:, None] * n_rows
+    flat_order, flat_before, flat_last = order + offsets, np.maximum(first - 1, 0) + offsets, last + offsets
+
+    r = np.full((p, p), np.nan)
+    for i in range(p):
+        both = mask[i] * mask[i:]  # (p - i, n): rows observed in i and in each j >= i
+        shift = i * n_rows
+
+        # Rank of x_i among the common rows, for every j: running counts along i's order
+        counts = np.cumsum(both[:, order[i]], axis=1)
+        before = np.where(first[i] > 0, counts[:, np.maximum(first[i] - 1, 0)], 0)
+        ranks_i = np.empty_like(both)
+        ranks_i[:, order[i]] = (before + 1 + counts[:, last[i]]) / 2
+
+        # Rank of each x_j among the same rows: running counts along j's own order
+        counts = np.cumsum(both.ravel()[flat_order[i:] - shift], axis=1).ravel()
+        before = np.where(first[i:] > 0, counts[flat_before[i:] - shift], 0)
+        ranks_j = np.empty_like(both)
+        ranks_j.ravel()[flat_order[i:] - shift] = (before + 1 + counts[flat_last[i:] - shift]) / 2
+
+        a, b = ranks_i * both, ranks_j * both
+        k = n[i, i:]
+        mean_sq = k * ((k + 1) / 2) ** 2  # both rank sets sum to k(k+1)/2
+        with np.errstate(invalid='ignore', divide='ignore'):
+            r[i, i:] = r[i:, i] = ((a * b).sum(axis=1) - mean_sq) / np.sqrt(
+                ((a * a).sum(axis=1) - mean_sq) * ((b * b).sum(axis=1) - mean_sq))
+    r = np.clip(r, -1, 1)
+    r[n < 2] = np.nan
+    np.fill_diagonal(r, np.where(np.diag(n) > 1, 1.0, np.nan))
+    return r, n
+
+
+def corr_pvalues(r, n):
+    """Two-sided p-values for r with n pairs (t-distribution, n - 2 df)."""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        dof = n - 2
+        t = r * np.sqrt(dof / np.maximum(1 - r ** 2, 1e-300))
+        p = 2 * stats.t.sf(np.abs(t), dof)
+    p[dof < 1] = np.nan
+    np.fill_diagonal(p, 0.0)
+    return p
+
+
+class CorrelationEngine:
+    """Correlation matrices for one dataset; NaNs are handled pairwise-complete.
+
+    Pearson r, p and pair-count matrices for every numeric column are computed once, from
+    cross-product sums streamed from the backend in row blocks (standardized with the
+    mean/std of the metadata summary), and any selection is an index slice.
+    Spearman needs whole columns to rank and is only offered for in-memory backends. It
+    is computed for the selected columns only (LRU keyed on the column set), each pair
+    ranked over its own pairwise-complete rows as DataFrame.corr(method='spearman') does.
+    """
+
+    METHODS = ('pearson', 'spearman')
+
+    def __init__(self, backend, summary):
+        self.backend = backend
+        self.columns = list(summary.index)
+        self._pos = {col: i for i, col in enumerate(self.columns)}
+        self._center = summary['mean'].to_numpy(dtype=float)
+        self._scale = summary['std'].to_numpy(dtype=float)
+        self.methods = self.METHODS if backend.in_memory else ('pearson',)
+        self._full = {}
+        self._lock = threading.Lock()
+        self.spearman = LRUCache(maxsize=16)
+
+    def caches(self):
+        return {'spearman': self.spearman}
+
+    def _standardized(self, blocks):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            for x in blocks:
+                yield (x - self._center) / self._scale
+
+    def _pearson(self):
+        with self._lock:
+            if 'pearson' not in self._full:
+                r, n = corr_from_products(*cross_products(self._standardized(self.backend.iter_batches(self.columns))))
+                self._full['pearson'] = (r, corr_pvalues(r, n), n)
+            return self._full['pearson']
+
+    def _spearman(self, cols):
+        key = tuple(sorted(set(cols), key=self._pos.get))
+
+        def compute():
+            r, n = pairwise_spearman(self.backend.fetch(list(key)).to_numpy(dtype=float))
+            return r, corr_pvalues(r, n), n
+
+        return key, self.spearman.get(key, compute)
+
+    def submatrix(self, cols, method='pearson'):
+        """(r, p, n) DataFrames for the selected columns."""
+        if method not in self.methods:
+            raise ValueError(f"Correlation method not available for this backend: {method}")
+        if method == 'spearman':
+            key, (r, p, n) = self._spearman(cols)
+            pos = {col: i for i, col in enumerate(key)}
+            idx = [pos[c] for c in cols]
+        else:
+            r, p, n = self._pearson()
+            idx = [self._pos[c] for c in cols]
+        sel = np.ix_(idx, idx)
+        return (pd.DataFrame(r[sel], index=cols, columns=cols),
+                pd.DataFrame(p[sel], index=cols, columns=cols),
+                pd.DataFrame(n[sel].astype(int), index=cols, columns=cols))
+
+    def cluster_order(self, cols, method='pearson'):
+        """Columns reordered by average-linkage clustering on 1 - |r|."""
+        if len(cols) < 3:
+            return list(cols)
+        from scipy.cluster.hierarchy import linkage, leaves_list
+        from scipy.spatial.distance import squareform
+
+        r, _, _ = self.submatrix(cols, method)
+        dist = 1 - np.abs(np.nan_to_num(r.to_numpy(), nan=0.0))
+        np.fill_diagonal(dist, 0.0)
+        order = leaves_list(linkage(squareform(dist, checks=False), method='average'))
+        return [cols[i] for i in order]
+
+    def top_pairs(self, cols, method='pearson', limit=20):
+        """Strongest off-diagonal pairs within the selection, as a tidy table."""
+        r, p, n = self.submatrix(cols, method)
+        iu = np.triu_indices(len(cols), k=1)
+        table = pd.DataFrame({
+            'Variable 1': np.asarray(cols)[iu[0]], 'Variable 2': np.asarray(cols)[iu[1]],
+            'r': r.to_numpy()[iu], 'P-value': p.to_numpy()[iu], 'n': n.to_numpy()[iu],
+        })
+        return table.reindex(table['r'].abs().sort_values(ascending=False).index).head(limit)
@@ -0,0 +1,96 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+# Per-rerun instrumentation for the dashboard (opt-in from the sidebar).
+# Stage timings are per session; cache counters come from the process-wide services.
+
+STAGES = ('load', 'filter', 'stats', 'plot')
+HISTORY_LENGTH = 50
+
+_watched = {}
+_watched_lock = threading.Lock()
+
+
+def watch(name, caches):
+    """Registers {label: LRUCache} of a shared service so the panel can report hits/misses."""
+    with _watched_lock:
+        _watched[name] = caches
+
+
+def cache_stats():
+    rows = []
+    with _watched_lock:
+        watched = list(_watched.items())
+    for name, caches in watched:
+        for label, cache in caches.items():
+            lookups = cache.hits + cache.misses
+            rows.append({'cache': f"{name}.{label}", 'entries': len(cache), 'hits': cache.hits,
+                         'misses': cache.misses, 'hit_rate': round(cache.hits / lookups, 3) if lookups else None})
+    return rows
+
+
+def memory_usage():
+    """Current and peak resident memory of the Streamlit process in MB (None where unavailable)."""
+    current = peak = None
+    try:
+        import psutil
+        current = psutil.Process().memory_info().rss / 2 ** 20
+    except ImportError:
+        try:
+            with open('/proc/self/statm') as f:
+                current = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+        except (OSError, ValueError, AttributeError):
+            pass
+    try:
+        import resource
+        # ru_maxrss is KB on Linux, bytes on macOS
+        scale = 2 ** 20 if os.uname().sysname == 'Darwin' else 2 ** 10
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+    except (ImportError, AttributeError):
+        pass
+    return {'rss_mb': round(current, 1) if current else None, 'peak_rss_mb': round(peak, 1) if peak else None}
+
+
+class Diagnostics:
+    """Collects stage timings for one rerun; a no-op when disabled."""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.timings = {}
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name):
+        if not self.enabled:
+            yield
+            return
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - t0
+
+    def record(self, page):
+        timings = {stage: round(self.timings.get(stage, 0.0) * 1000, 2) for stage in STAGES}
+        timings.update({k: round(v * 1000, 2) for k, v in self.timings.items() if k not in STAGES})
+        return {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'page': page,
+            'total_ms': round((time.perf_counter() - self._start) * 1000, 2),
+            'timings_ms': timings,
+            'caches': cache_stats(),
+            'memory': memory_usage(),
+        }
+
+
+def append_history(history, record):
+    history.append(record)
+    del history[:-HISTORY_LENGTH]
+    return history
+
+
+def export_json(history):
+    return json.dumps({'reruns': history}, indent=2, default=str)
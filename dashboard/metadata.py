@@ -0,0 +1,95 @@
+import os
+import hashlib
+from functools import lru_cache
+
+import pandas as pd
+
+# Substring rules used to organise 100+ variables into drop-down categories (first match wins)
+CATEGORY_RULES = [
+    ("📍 Radius (HR-pQCT)", ['radius']),
+    ("📍 Tibia (HR-pQCT)", ['tibia']),
+    ("🦴 DXA & FRAX", ['dxa', 'tbs', 'frax', 'bmd']),
+    ("🩸 Bone Markers", ['sclerostin', 'igf', 'ctx', 'p1np', 'rankl', 'opg', 'vit', 'pth', 'calcium']),
+    ("liver 🟢 Liver Profile", ['alt', 'ast', 'ggt', 'alp', 'albumin', 'bilirubin', 'inr', 'fibroscan', 'child',
+                               'meld']),
+    ("👤 Demographics", ['age', 'sex', 'weight', 'height', 'bmi', 'smoking', 'alcohol']),
+]
+DEFAULT_CATEGORY = "🔹 Other Clinical"
+
+
+@lru_cache(maxsize=None)
+def get_var_category(col_name):
+    col_lower = col_name.lower()
+    for category, markers in CATEGORY_RULES:
+        if any(x in col_lower for x in markers):
+            return category
+    return DEFAULT_CATEGORY
+
+
+def file_hash(path):
+    """Content hash of the data file; memoised on (path, size, mtime) so reruns don't re-read it."""
+    stat = os.stat(path)
+    return _file_hash(os.path.abspath(path), stat.st_size, stat.st_mtime)
+
+
+@lru_cache(maxsize=32)
+def _file_hash(path, size, mtime):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DatasetMetadata:
+    """Everything the dashboard needs to know about the columns, computed once per dataset.
+
+    Attributes:
+        all_cols / num_cols / cat_cols: column lists (file order)
+        dtypes: {column: dtype string}
+        categories: {numeric column: dashboard category}
+        var_groups: {category: [numeric columns]} (insertion-ordered as before)
+        summary: per-numeric-column describe() table (count, mean, std, min, quartiles, max)
+        cat_summary: per-categorical-column n_unique / top
+        binary_cols: columns with exactly two distinct non-missing values (logit outcomes)
+        missing: DataFrame with n_missing and pct_missing for every column
+    """
+
+    def __init__(self, backend):
+        self.n_rows = backend.n_rows()
+        self.all_cols = backend.columns
+        numeric = set(backend.numeric_columns())
+        self.num_cols = [col for col in self.all_cols if col in numeric]
+        self.cat_cols = [col for col in self.all_cols if col not in numeric]
+        self.dtypes = backend.dtypes()
+
+        self.categories = {col: get_var_category(col) for col in self.num_cols}
+        self.var_groups = {}
+        for col in self.num_cols:
+            self.var_groups.setdefault(self.categories[col], []).append(col)
+
+        self.summary = backend.numeric_summary(self.num_cols)
+        self.cat_summary = backend.categorical_summary(self.cat_cols)
+
+        # One count(DISTINCT) pass over the numeric columns; categoricals reuse cat_summary
+        n_unique = backend.distinct_counts(self.num_cols)
+        if len(self.cat_summary):
+            n_unique = pd.concat([n_unique, self.cat_summary['n_unique']])
+        self.binary_cols = [col for col in self.all_cols if n_unique.get(col) == 2]
+
+        n_missing = backend.missing_counts()
+        self.missing = pd.DataFrame({
+            'n_missing': n_missing,
+            'pct_missing': (n_missing / max(self.n_rows, 1) * 100).round(1),
+        })
+
+    def columns_in(self, categories):
+        cols = []
+        for cat in categories:
+            cols.extend(self.var_groups.get(cat, []))
+        return cols
+
+
+def build_metadata(backend):
+    """Metadata from a dashboard backend (PandasBackend or DuckDBParquetBackend)."""
+    return DatasetMetadata(backend)
@@ -0,0 +1,16 @@
+import importlib
+
+# Sidebar label -> page module. Each module exposes render(ctx) and is imported only
+# when its page is first opened, so heavy plotting/statistics imports stay off cold start.
+PAGES = {
+    "📊 Data Overview": 'overview',
+    "📈 Descriptive Stats": 'descriptive',
+    "🧪 Group Comparisons": 'group_comparisons',
+    "🧭 Sweep": 'sweep',
+    "📐 Regression Analysis": 'regression',
+    "🔥 Correlation Matrix": 'correlation',
+}
+
+
+def load_page(label):
+    return importlib.import_module(f"{__name__}.{PAGES[label]}")
@@ -0,0 +1,55 @@
+import streamlit as st
+
+from dashboard import charts
+
+
+# --- MODULE 5: CORRELATION ---
+def render(ctx):
+    var_groups = ctx.meta.var_groups
+    st.header("Correlation Matrix")
+
+    cats_to_corr = st.multiselect("Select Categories to Correlate:", list(var_groups.keys()),
+                                  default=[c for c in ["📍 Radius (HR-pQCT)", "🩸 Bone Markers"] if c in var_groups])
+
+    vars_to_corr = []
+    for cat in cats_to_corr:
+        vars_to_corr.extend(var_groups[cat])
+
+    # Building the engine reads no data; the matrices are computed on first use of a method
+    engine = ctx.correlation
+    c1, c2, c3 = st.columns(3)
+    method = c1.radio("Method:", [m.capitalize() for m in engine.methods], horizontal=True)
+    if 'spearman' not in engine.methods:
+        c1.caption("Spearman ranks whole columns, so it is only offered for in-memory (CSV) data.")
+    cluster = c2.checkbox("Cluster-order variables", value=False)
+    hide_ns = c3.checkbox("Hide cells with p ≥ 0.05", value=False)
+
+    if len(vars_to_corr) < 2:
+        st.info("Select categories to generate heatmap.")
+        return
+
+    with ctx.timer('stats'):
+        if cluster:
+            vars_to_corr = engine.cluster_order(vars_to_corr, method.lower())
+        corr_df, p_df, n_df = engine.submatrix(vars_to_corr, method.lower())
+
+    with ctx.timer('plot'):
+        _plot_heatmap(ctx, corr_df, p_df, hide_ns)
+
+    with st.expander("🔗 Strongest Pairs (r, p-value, pairwise n)", expanded=False):
+        st.dataframe(engine.top_pairs(vars_to_corr, method.lower()), hide_index=True)
+
+
+def _plot_heatmap(ctx, corr_df, p_df, hide_ns):
+    if ctx.client_charts:
+        st.vega_lite_chart(charts.heatmap_spec(corr_df, p_df, hide_ns=hide_ns), width="stretch", height=600)
+        return
+
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    fig, ax = plt.subplots(figsize=(12, 10))
+    sns.heatmap(corr_df, cmap='coolwarm', center=0, vmin=-1, vmax=1, linewidths=0.5, square=True, ax=ax,
+                mask=(p_df >= 0.05).to_numpy() if hide_ns else None)
+    st.pyplot(fig)
+    plt.close(fig)
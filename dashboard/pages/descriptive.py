@@ -0,0 +1,69 @@
+import streamlit as st
+
+from dashboard import charts
+
+
+# --- MODULE 2: DESCRIPTIVE STATS ---
+def render(ctx):
+    var_groups = ctx.meta.var_groups
+    st.header("Descriptive Statistics")
+
+    # Category Filter
+    st.markdown("##### 1. Select Variable Category")
+    selected_cat = st.selectbox("Filter Variables by Type:", list(var_groups.keys()))
+
+    # Specific Variable Select
+    cols_in_cat = var_groups[selected_cat]
+    selected_vars = st.multiselect(f"Select {selected_cat} Variables:", cols_in_cat, default=cols_in_cat[:3])
+
+    if not selected_vars:
+        return
+
+    # Everything below is looked up in the profiling snapshot; no data is re-read per selection
+    with ctx.timer('stats'):
+        profile = ctx.profile
+
+    st.subheader("Summary Table")
+    st.dataframe(profile.summary.loc[selected_vars].style.format("{:.2f}"))
+
+    st.subheader("Distribution Plots")
+    viz_var = st.selectbox("Select variable to plot:", selected_vars)
+    with ctx.timer('plot'):
+        _plot_distribution(ctx, profile, viz_var)
+
+
+def _plot_distribution(ctx, profile, viz_var):
+    edges, counts = profile.hist_edges[viz_var], profile.hist_counts[viz_var]
+    kde = profile.kde_counts(viz_var)
+
+    if ctx.client_charts:
+        c1, c2 = st.columns(2)
+        c1.vega_lite_chart(charts.binned_histogram_spec(edges, counts, f"Histogram: {viz_var}", kde=kde),
+                           width="stretch")
+        if viz_var in profile.box:
+            c2.vega_lite_chart(charts.box_summary_spec(profile.box[viz_var], viz_var, title=f"Boxplot: {viz_var}"),
+                               width="stretch")
+        return
+
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(1, 2, figsize=(12, 4))
+
+    # Histogram (+ KDE scaled to counts)
+    ax[0].stairs(counts, edges, fill=True, color="teal", alpha=0.5)
+    ax[0].stairs(counts, edges, color="teal")
+    ax[0].plot(*kde, color="teal")
+    ax[0].set_xlabel(viz_var)
+    ax[0].set_ylabel("Count")
+    ax[0].set_title(f"Histogram: {viz_var}")
+
+    # Boxplot
+    if viz_var in profile.box:
+        ax[1].bxp([profile.box[viz_var]], orientation='horizontal', patch_artist=True,
+                  boxprops={'facecolor': 'lightblue'}, medianprops={'color': 'black'})
+        ax[1].set_yticks([])
+        ax[1].set_xlabel(viz_var)
+    ax[1].set_title(f"Boxplot: {viz_var}")
+
+    st.pyplot(fig)
+    plt.close(fig)
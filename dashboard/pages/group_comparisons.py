@@ -0,0 +1,78 @@
+import io
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from dashboard import charts
+from dashboard.context import get_comparison_service
+
+
+@st.cache_data(max_entries=128)
+def comparison_plot_png(fingerprint, _backend, group_var, g1, g2, target_var):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    res = get_comparison_service(fingerprint, _backend).compare(group_var, g1, g2, target_var)
+    plot_data = pd.DataFrame({
+        group_var: [g1] * res['n1'] + [g2] * res['n2'],
+        target_var: np.concatenate([res['d1'], res['d2']]),
+    })
+    fig, ax = plt.subplots(figsize=(8, 5))
+    sns.boxplot(x=group_var, y=target_var, data=plot_data, palette="Set2", width=0.5, ax=ax, showfliers=False)
+    sns.stripplot(x=group_var, y=target_var, data=plot_data, color='black', alpha=0.5, jitter=True, ax=ax)
+    ax.set_title(f"{target_var} by {group_var}")
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', bbox_inches='tight')
+    plt.close(fig)
+    return buf.getvalue()
+
+
+def show_comparison_plot(ctx, group_var, g1, g2, target_var):
+    # Client mode ships box summaries + a capped point sample instead of a server-rendered PNG
+    if ctx.client_charts:
+        res = ctx.comparisons.compare(group_var, g1, g2, target_var)
+        st.vega_lite_chart(charts.box_strip_spec({g1: res['d1'], g2: res['d2']}, target_var, group_var,
+                                                 title=f"{target_var} by {group_var}"), width="stretch")
+    else:
+        st.image(comparison_plot_png(ctx.fingerprint, ctx.backend, group_var, g1, g2, target_var))
+
+
+# --- MODULE 3: COMPARATIVE ANALYSIS ---
+def render(ctx):
+    cat_cols, var_groups = ctx.meta.cat_cols, ctx.meta.var_groups
+    st.header("Hypothesis Testing")
+
+    # 1. Grouping
+    group_var = st.selectbox("Group Patients By:", cat_cols,
+                             index=cat_cols.index('Study_Group') if 'Study_Group' in cat_cols else 0)
+    with ctx.timer('filter'):
+        unique_groups = ctx.backend.distinct(group_var)
+
+    c1, c2 = st.columns(2)
+    g1 = c1.selectbox("Group 1 (Control):", unique_groups, index=0)
+    g2 = c2.selectbox("Group 2 (Test):", unique_groups, index=1 if len(unique_groups) > 1 else 0)
+
+    # 2. Target Variable (Categorized)
+    st.markdown("---")
+    st.markdown("##### Select Dependent Variable")
+    target_cat = st.selectbox("Category:", list(var_groups.keys()))
+    target_var = st.selectbox("Variable:", var_groups[target_cat])
+
+    # 3. Run Test (memoised per selection; groups are taken via the cached group index)
+    with ctx.timer('stats'):
+        res = ctx.comparisons.compare(group_var, g1, g2, target_var)
+
+    if res['n1'] > 1 and res['n2'] > 1:
+        p_val = res['p_val']
+
+        st.markdown("### Results")
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric(f"{g1} Mean", f"{res['mean1']:.2f}", f"n={res['n1']}")
+        col2.metric(f"{g2} Mean", f"{res['mean2']:.2f}", f"n={res['n2']}")
+        col3.metric("Difference", f"{res['mean2'] - res['mean1']:.2f}")
+        col4.metric("P-Value", f"{p_val:.4e}", delta_color="inverse" if p_val < 0.05 else "off")
+
+        # Plot
+        with ctx.timer('plot'):
+            show_comparison_plot(ctx, group_var, g1, g2, target_var)
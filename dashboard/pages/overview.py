@@ -0,0 +1,21 @@
+import pandas as pd
+import streamlit as st
+
+
+# --- MODULE 1: DATA OVERVIEW ---
+def render(ctx):
+    meta = ctx.meta
+    st.header("Dataset Overview")
+
+    st.info(f"Successfully loaded **{len(meta.all_cols)} variables** for **{meta.n_rows} patients**.")
+
+    with st.expander("🔍 View All Variable Names (Click to Expand)", expanded=False):
+        st.write(meta.all_cols)
+
+    with st.expander("📄 View Raw Data Table", expanded=True):
+        with ctx.timer('filter'):
+            head = ctx.backend.head(10)
+        st.dataframe(head)
+
+    with st.expander("🕳️ Missingness & Types", expanded=False):
+        st.dataframe(meta.missing.assign(dtype=pd.Series(meta.dtypes)))
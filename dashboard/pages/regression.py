@@ -0,0 +1,105 @@
+import numpy as np
+import streamlit as st
+
+from dashboard import charts
+from dashboard.regression import MODEL_KINDS, DROPNA_POLICIES, model_label, compare_models, nested_tests
+
+
+# --- MODULE 4: REGRESSION ---
+def render(ctx):
+    meta = ctx.meta
+    var_groups, num_cols = meta.var_groups, meta.num_cols
+    st.header("Multivariable Regression")
+
+    workbench = ctx.workbench
+    # Per-session registry of fitted models (the fits themselves are cached process-wide)
+    state = ctx.state('regression')
+    registry = state.setdefault('model_registry', {})
+
+    st.markdown("##### 1. Model")
+    c1, c2 = st.columns(2)
+    kind = c1.radio("Model Type:", list(MODEL_KINDS), format_func=MODEL_KINDS.get, horizontal=True)
+    policy = c2.radio("Missing Data:", list(DROPNA_POLICIES), format_func=DROPNA_POLICIES.get, horizontal=True)
+
+    st.markdown("##### 2. Outcome Variable (Y)")
+    if kind == 'logit':
+        binary_cols = meta.binary_cols
+        if not binary_cols:
+            st.warning("No two-level outcome variables available for logistic regression.")
+            return
+        y_var = st.selectbox("Binary Outcome:", binary_cols, key='y_bin')
+        st.caption(f"Modelled probability: `{y_var} = {workbench.levels(y_var)[1]}`")
+    else:
+        y_cat = st.selectbox("Y Category:", list(var_groups.keys()), key='y_cat')
+        y_var = st.selectbox("Y Variable:", var_groups[y_cat], key='y_var')
+
+    st.markdown("##### 3. Predictors (X)")
+    x_options = [c for c in num_cols if c != y_var]
+    x_vars = st.multiselect("Select Independent Variables (X):", x_options,
+                            default=[c for c in ['Age_years', 'BMI'] if c in x_options])
+
+    if st.button("Fit Model"):
+        if x_vars:
+            try:
+                with ctx.timer('stats'):
+                    fit = workbench.fit(kind, y_var, x_vars, policy)
+            except (ValueError, np.linalg.LinAlgError) as e:
+                st.error(f"❌ Model could not be fitted: {e}")
+            else:
+                registry[model_label(fit)] = fit
+                state['active_model'] = model_label(fit)
+        else:
+            st.warning("Select at least one predictor.")
+
+    active = registry.get(state.get('active_model'))
+    if active:
+        st.markdown(f"### {model_label(active)}")
+        cols = st.columns(4)
+        for col, (name, value) in zip(cols, [(k, v) for k, v in active['stats'].items() if k != 'df_resid']):
+            col.metric(name, f"{value:.4g}")
+        if active['reused_gram']:
+            st.caption("⚡ Cross-products reused from the nested model (bordered update).")
+        st.dataframe(active['coef'].style.format("{:.4g}"))
+
+        with st.expander("📄 Full statsmodels summary", expanded=False):
+            st.text(workbench.statsmodels_summary(active))
+
+        # Diagnostic Plot
+        if active['kind'] != 'logit':
+            with ctx.timer('plot'):
+                _plot_residuals(ctx, active)
+
+    # --- Model Comparison (session registry) ---
+    if registry:
+        st.markdown("---")
+        st.markdown("##### 4. Compare Models")
+        chosen = st.multiselect("Fitted models this session:", list(registry), default=list(registry)[-2:])
+        if chosen:
+            st.dataframe(compare_models({label: registry[label] for label in chosen}))
+            st.caption("Coef (SE); * p<0.05, ** p<0.01, *** p<0.001")
+            tests = nested_tests({label: registry[label] for label in chosen})
+            if not tests.empty:
+                st.markdown("**Nested model tests**")
+                st.dataframe(tests, hide_index=True)
+        if st.button("Clear Model Registry"):
+            registry.clear()
+            state.pop('active_model', None)
+            st.rerun()
+
+
+def _plot_residuals(ctx, fit):
+    if ctx.client_charts:
+        st.vega_lite_chart(charts.scatter_spec(fit['fitted'], fit['resid'], "Fitted Values", "Residuals",
+                                               title="Residuals vs Fitted", hline=0), width="stretch")
+        return
+
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(8, 4))
+    ax.scatter(fit['fitted'], fit['resid'], alpha=0.5)
+    ax.axhline(0, color='red', linestyle='--')
+    ax.set_xlabel("Fitted Values")
+    ax.set_ylabel("Residuals")
+    ax.set_title("Residuals vs Fitted")
+    st.pyplot(fig)
+    plt.close(fig)
@@ -0,0 +1,53 @@
+import pandas as pd
+import streamlit as st
+
+from dashboard.pages.group_comparisons import show_comparison_plot
+
+
+# --- MODULE 3B: ALL-VARIABLE SWEEP ---
+def render(ctx):
+    meta, comparisons = ctx.meta, ctx.comparisons
+    cat_cols = meta.cat_cols
+    st.header("All-Variable Sweep")
+    st.caption("t-test, Mann-Whitney U, Cohen's d and AUC for every numeric variable in one vectorized pass.")
+
+    group_var = st.selectbox("Group Patients By:", cat_cols,
+                             index=cat_cols.index('Study_Group') if 'Study_Group' in cat_cols else 0,
+                             key='sweep_group')
+    with ctx.timer('filter'):
+        unique_groups = ctx.backend.distinct(group_var)
+    all_pairs = st.checkbox("Sweep every pair of groups", value=False)
+
+    if all_pairs:
+        pairs = [(a, b) for i, a in enumerate(unique_groups) for b in unique_groups[i + 1:]]
+    else:
+        c1, c2 = st.columns(2)
+        g1 = c1.selectbox("Group 1 (Control):", unique_groups, index=0, key='sweep_g1')
+        g2 = c2.selectbox("Group 2 (Test):", unique_groups, index=1 if len(unique_groups) > 1 else 0,
+                          key='sweep_g2')
+        pairs = [(g1, g2)]
+
+    tables = []
+    with ctx.timer('stats'):
+        for g1, g2 in pairs:
+            table = comparisons.sweep(group_var, g1, g2, meta.num_cols, meta.categories)
+            tables.append(table.assign(**{'Group 1': g1, 'Group 2': g2}) if all_pairs else table)
+
+    if not tables:
+        return
+
+    results = pd.concat(tables, ignore_index=True) if len(tables) > 1 else tables[0]
+    only_sig = st.checkbox("Only P (t-test) < 0.05", value=False)
+    if only_sig:
+        results = results[results['P (t-test)'] < 0.05]
+    st.dataframe(results, hide_index=True)
+
+    # Drill-down into one variable (uses the same cached comparison + plot as the Group Comparisons module)
+    drill_var = st.selectbox("Drill into variable:", results['Variable'].unique().tolist())
+    if drill_var:
+        g1, g2 = pairs[0] if not all_pairs else tuple(
+            results.loc[results['Variable'] == drill_var, ['Group 1', 'Group 2']].iloc[0])
+        res = comparisons.compare(group_var, g1, g2, drill_var)
+        if res['n1'] > 1 and res['n2'] > 1:
+            with ctx.timer('plot'):
+                show_comparison_plot(ctx, group_var, g1, g2, drill_var)
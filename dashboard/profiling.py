@@ -0,0 +1,114 @@
+import numpy as np
+
+
+def _bin_counts(x, lo, hi, bins):
+    """Per-column histogram counts of x (n, p) on [lo, hi] with `bins` equal bins, NaNs ignored."""
+    n, p = x.shape
+    width = np.where(hi > lo, hi - lo, 1.0)
+    idx = np.clip(np.floor((x - lo) / width * bins), 0, bins - 1)
+    valid = ~np.isnan(idx)
+    flat = (np.where(valid, idx, 0).astype(np.int64) + np.arange(p) * bins).ravel()
+    return np.bincount(flat, weights=valid.ravel().astype(float), minlength=p * bins).reshape(p, bins)
+
+
+def kde_bounds(n_obs, std, lo, hi, cut=3):
+    """Scott bandwidth (like seaborn's default) and the KDE grid span [min - cut*h, max + cut*h] per column."""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        h = std * n_obs ** (-1 / 5)
+    h = np.where(np.isfinite(h) & (h > 0), h, 1.0)
+    return h, lo - cut * h, hi + cut * h
+
+
+def binned_kde(counts, n_obs, h, lo, hi):
+    """Gaussian KDE for every column at once from counts binned on [lo, hi] (p, grid_size).
+
+    The binned counts are smoothed with a Gaussian whose Fourier transform is applied
+    analytically, so all columns go through a single rfft/irfft pair. Returns (grids, densities).
+    """
+    grid_size = counts.shape[1]
+    dx = (hi - lo) / grid_size
+
+    # Zero-pad to 2G so the circular convolution does not wrap the tails
+    freqs = np.fft.rfftfreq(2 * grid_size)
+    sigma = (h / dx)[:, None]
+    transfer = np.exp(-0.5 * (2 * np.pi * freqs[None, :] * sigma) ** 2)
+    smoothed = np.fft.irfft(np.fft.rfft(counts, n=2 * grid_size, axis=1) * transfer, n=2 * grid_size, axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        density = np.clip(smoothed[:, :grid_size], 0, None) / (n_obs[:, None] * dx[:, None])
+    grids = lo[:, None] + dx[:, None] * (np.arange(grid_size) + 0.5)
+    return grids, density
+
+
+class ProfileSnapshot:
+    """Descriptive statistics for every numeric column, computed once per dataset.
+
+    Count, mean, std, min/max and quartiles come from the backend's numeric summary
+    (DatasetMetadata.summary); everything else is accumulated in one streamed pass over
+    row blocks, so the table is never held in memory as a whole.
+
+    Attributes:
+        summary: the numeric summary plus skew and n_missing per column
+        hist_edges / hist_counts: {column: array} histogram bins
+        kde_grid / kde_density: {column: array} Gaussian KDE on a per-column grid
+        box: {column: matplotlib bxp() stats dict (quartiles, 1.5 IQR whiskers, fliers)}
+    """
+
+    def __init__(self, summary, n_missing, batches, bins=30, kde_grid=256):
+        self.columns = list(summary.index)
+        p = len(self.columns)
+        n = summary['count'].to_numpy(dtype=float)
+        mean, std = summary['mean'].to_numpy(dtype=float), summary['std'].to_numpy(dtype=float)
+        lo, hi = summary['min'].to_numpy(dtype=float), summary['max'].to_numpy(dtype=float)
+        q1, median, q3 = (summary[q].to_numpy(dtype=float) for q in ('25%', '50%', '75%'))
+        h, kde_lo, kde_hi = kde_bounds(n, std, lo, hi)
+        iqr = q3 - q1
+        fence_lo, fence_hi = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+
+        counts, kde_counts = np.zeros((p, bins)), np.zeros((p, kde_grid))
+        m2, m3 = np.zeros(p), np.zeros(p)
+        whislo, whishi = np.full(p, np.inf), np.full(p, -np.inf)
+        fliers = [[] for _ in range(p)]
+        for x in batches:
+            # Histogram and KDE bins: one bincount over all columns per block
+            counts += _bin_counts(x, lo, hi, bins)
+            kde_counts += _bin_counts(x, kde_lo, kde_hi, kde_grid)
+            centred = x - mean
+            m2 += np.nansum(centred ** 2, axis=0)
+            m3 += np.nansum(centred ** 3, axis=0)
+            # Box-plot whiskers at the most extreme points within 1.5 IQR
+            inside = (x >= fence_lo) & (x <= fence_hi)
+            whislo = np.minimum(whislo, np.where(inside, x, np.inf).min(axis=0))
+            whishi = np.maximum(whishi, np.where(inside, x, -np.inf).max(axis=0))
+            outside = ~inside & ~np.isnan(x)
+            for i in np.flatnonzero(outside.any(axis=0)):
+                fliers[i].append(x[outside[:, i], i])
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            skew = (m3 / n) / (m2 / n) ** 1.5
+        self.summary = summary.assign(skew=skew, n_missing=np.asarray(n_missing))
+
+        edges = lo[:, None] + (hi - lo)[:, None] * np.linspace(0, 1, bins + 1)[None, :]
+        self.hist_edges = dict(zip(self.columns, edges))
+        self.hist_counts = dict(zip(self.columns, counts))
+
+        grids, density = binned_kde(kde_counts, n, h, kde_lo, kde_hi)
+        self.kde_grid = dict(zip(self.columns, grids))
+        self.kde_density = dict(zip(self.columns, density))
+
+        self.box = {
+            col: {'label': col, 'med': median[i], 'q1': q1[i], 'q3': q3[i], 'whislo': whislo[i],
+                  'whishi': whishi[i], 'fliers': np.concatenate(fliers[i]) if fliers[i] else np.empty(0)}
+            for i, col in enumerate(self.columns) if n[i] > 0
+        }
+
+    def kde_counts(self, col):
+        """KDE scaled to the histogram's count axis (as seaborn's histplot(kde=True) draws it)."""
+        edges = self.hist_edges[col]
+        return self.kde_grid[col], self.kde_density[col] * self.summary.at[col, 'count'] * (edges[1] - edges[0])
+
+
+def build_profile(backend, meta):
+    """One streamed profiling pass over the numeric columns of a dashboard backend."""
+    columns = meta.num_cols
+    return ProfileSnapshot(meta.summary.loc[columns], meta.missing['n_missing'].reindex(columns),
+                           backend.iter_batches(columns))
@@ -0,0 +1,238 @@
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from dashboard.comparisons import LRUCache
+
+MODEL_KINDS = {'ols': 'OLS', 'rlm': 'Robust (Huber)', 'logit': 'Logistic'}
+DROPNA_POLICIES = {'listwise': 'Listwise deletion', 'impute_mean': 'Mean-impute predictors'}
+
+
+class RegressionWorkbench:
+    """Regression fits for one dataset with process-wide caches.
+
+    - Design LRU keyed on (y, X, dropna policy, binary outcome): outcome vector, design
+      matrix (constant first) and the row positions used.
+    - Gram LRU: X'X, its inverse, X'y and y'y per design. When X extends a cached design
+      by one covariate on the same rows, the new inverse is a bordered (Schur complement)
+      update of the parent's instead of a fresh O(n k^2) cross-product.
+    - Fit LRU keyed on (kind, y, X, policy), shared by every session; the per-session
+      model registry lives in st.session_state and only holds references to these fits.
+    """
+
+    def __init__(self, backend, maxsize=64):
+        self.backend = backend
+        self.fingerprint = backend.fingerprint
+        self._columns = LRUCache(maxsize=128)
+        self._levels = LRUCache(maxsize=128)
+        self.designs = LRUCache(maxsize=maxsize)
+        self.grams = LRUCache(maxsize=maxsize)
+        self.fits = LRUCache(maxsize=maxsize)
+        self.bordered_updates = 0
+
+    def caches(self):
+        return {'columns': self._columns, 'designs': self.designs, 'grams': self.grams, 'fits': self.fits}
+
+    # --- Data ---
+    def column(self, col):
+        return self._columns.get(
+            col, lambda: pd.to_numeric(self.backend.fetch([col])[col], errors='coerce').to_numpy(dtype=float))
+
+    def levels(self, col):
+        return self._levels.get(col, lambda: sorted(self.backend.distinct(col), key=str))
+
+    def outcome(self, y, binary=False):
+        """Outcome vector; binary outcomes are coded 0/1 with the second sorted level as 1."""
+        if not binary:
+            return self.column(y)
+
+        def encode():
+            levels = self.levels(y)
+            if len(levels) != 2:
+                raise ValueError(f"Logistic regression needs a two-level outcome; '{y}' has {len(levels)} levels.")
+            raw = self.backend.fetch([y])[y]
+            return np.where(raw.isna(), np.nan, (raw == levels[1]).astype(float))
+
+        return self._columns.get(('binary', y), encode)
+
+    # --- Design matrices ---
+    def design(self, y, xs, policy='listwise', binary=False):
+        key = (self.fingerprint, y, tuple(xs), policy, binary)
+
+        def compute():
+            yv = self.outcome(y, binary)
+            X = np.column_stack([np.ones(len(yv))] + [self.column(c) for c in xs])
+            rows = ~np.isnan(yv)
+            if policy == 'listwise':
+                rows &= ~np.isnan(X).any(axis=1)
+            X, yv = X[rows], yv[rows]
+            if policy == 'impute_mean':
+                means = np.nanmean(X, axis=0)
+                X = np.where(np.isnan(X), means, X)
+            return {'y': yv, 'X': X, 'names': ['const'] + list(xs), 'rows': np.flatnonzero(rows), 'n': len(yv)}
+
+        return self.designs.get(key, compute)
+
+    def gram(self, y, xs, policy='listwise'):
+        """Cross-products for OLS; bordered update from the (y, xs[:-1]) entry when it is cached."""
+        key = (self.fingerprint, y, tuple(xs), policy)
+
+        def compute():
+            d = self.design(y, xs, policy)
+            X, yv = d['X'], d['y']
+            parent = self.grams.peek((self.fingerprint, y, tuple(xs[:-1]), policy)) if xs else None
+            if parent is not None and np.array_equal(parent['rows'], d['rows']):
+                inv = _bordered_inverse(parent['inv'], X[:, :-1].T @ X[:, -1], X[:, -1] @ X[:, -1])
+                if inv is not None:
+                    self.bordered_updates += 1
+                    xty = np.append(parent['xty'], X[:, -1] @ yv)
+                    return {'inv': inv, 'xty': xty, 'yty': parent['yty'], 'rows': d['rows'], 'bordered': True}
+            xtx = X.T @ X
+            return {'inv': np.linalg.pinv(xtx), 'xty': X.T @ yv, 'yty': yv @ yv, 'rows': d['rows'], 'bordered': False}
+
+        return self.grams.get(key, compute)
+
+    # --- Fitting ---
+    def fit(self, kind, y, xs, policy='listwise'):
+        """Fitted model as a dict: coefficient table, fit statistics, fitted values and residuals."""
+        if kind not in MODEL_KINDS:
+            raise ValueError(f"Unknown model type: {kind}")
+        xs = [x for x in dict.fromkeys(xs) if x != y]
+        key = (self.fingerprint, kind, y, tuple(xs), policy)
+
+        def compute():
+            if kind == 'ols':
+                return self._fit_ols(y, xs, policy)
+            return self._fit_statsmodels(kind, y, xs, policy)
+
+        return self.fits.get(key, compute)
+
+    def _fit_ols(self, y, xs, policy):
+        d = self.design(y, xs, policy)
+        g = self.gram(y, xs, policy)
+        n, k = d['X'].shape
+        beta = g['inv'] @ g['xty']
+        sse = max(g['yty'] - beta @ g['xty'], 0.0)
+        dof = n - k
+        with np.errstate(invalid='ignore', divide='ignore'):
+            sigma2 = sse / dof
+            se = np.sqrt(np.clip(np.diag(g['inv']), 0, None) * sigma2)
+            t = beta / se
+            p = 2 * stats.t.sf(np.abs(t), dof)
+            sst = g['yty'] - n * d['y'].mean() ** 2
+            r2 = 1 - sse / sst
+            llf = -n / 2 * (np.log(2 * np.pi) + np.log(sse / n) + 1)
+        crit = stats.t.ppf(0.975, dof) if dof > 0 else np.nan
+        fitted = d['X'] @ beta
+        return _result('ols', y, xs, policy, d['names'], beta, se, t, p, crit, fitted, d['y'] - fitted, {
+            'n': n, 'R²': r2, 'Adj. R²': 1 - (1 - r2) * (n - 1) / dof if dof > 0 else np.nan,
+            'Log-lik': llf, 'AIC': -2 * llf + 2 * k, 'BIC': -2 * llf + k * np.log(n), 'df_resid': dof,
+        }, reused_gram=g['bordered'])
+
+    def _fit_statsmodels(self, kind, y, xs, policy):
+        import statsmodels.api as sm
+
+        d = self.design(y, xs, policy, binary=(kind == 'logit'))
+        n, k = d['X'].shape
+        if kind == 'logit':
+            model = sm.Logit(d['y'], d['X']).fit(disp=0)
+            fit_stats = {'n': n, 'Pseudo R²': model.prsquared, 'Log-lik': model.llf, 'AIC': model.aic,
+                         'BIC': model.bic, 'df_resid': model.df_resid}
+            resid = model.resid_response
+            crit = stats.norm.ppf(0.975)
+        else:
+            model = sm.RLM(d['y'], d['X'], M=sm.robust.norms.HuberT()).fit()
+            fit_stats = {'n': n, 'Scale': model.scale, 'df_resid': model.df_resid}
+            resid = model.resid
+            crit = stats.norm.ppf(0.975)
+        result = _result(kind, y, xs, policy, d['names'], model.params, model.bse, model.tvalues, model.pvalues,
+                         crit, model.fittedvalues, resid, fit_stats)
+        result['summary'] = str(model.summary())
+        if kind == 'logit':
+            result['positive_level'] = self.levels(y)[1]
+        return result
+
+    def statsmodels_summary(self, fit):
+        """Full statsmodels OLS summary for a Gram-path fit (refits on the cached design)."""
+        if 'summary' not in fit:
+            import statsmodels.api as sm
+
+            d = self.design(fit['y'], fit['xs'], fit['policy'])
+            fit['summary'] = str(sm.OLS(d['y'], d['X']).fit().summary(xname=d['names'], yname=fit['y']))
+        return fit['summary']
+
+
+def _bordered_inverse(inv, b, c, tol=1e-10):
+    """Inverse of [[A, b], [b', c]] from A^-1; None if the new column is (nearly) collinear."""
+    ab = inv @ b
+    schur = c - b @ ab
+    if schur <= tol * max(c, 1.0):
+        return None
+    k = len(b)
+    out = np.empty((k + 1, k + 1))
+    out[:k, :k] = inv + np.outer(ab, ab) / schur
+    out[:k, k] = out[k, :k] = -ab / schur
+    out[k, k] = 1 / schur
+    return out
+
+
+def _result(kind, y, xs, policy, names, beta, se, t, p, crit, fitted, resid, fit_stats, reused_gram=False):
+    beta, se = np.asarray(beta, dtype=float), np.asarray(se, dtype=float)
+    coef = pd.DataFrame({
+        'Coef': beta, 'Std Err': se, 't / z': np.asarray(t, dtype=float), 'P-value': np.asarray(p, dtype=float),
+        'CI 2.5%': beta - crit * se, 'CI 97.5%': beta + crit * se,
+    }, index=names)
+    return {'kind': kind, 'y': y, 'xs': list(xs), 'policy': policy, 'coef': coef, 'stats': fit_stats,
+            'fitted': np.asarray(fitted, dtype=float), 'resid': np.asarray(resid, dtype=float),
+            'reused_gram': reused_gram}
+
+
+def model_label(fit):
+    return f"{MODEL_KINDS[fit['kind']]}: {fit['y']} ~ {' + '.join(fit['xs']) or '1'} [{DROPNA_POLICIES[fit['policy']]}]"
+
+
+def _stars(p):
+    return '***' if p < 0.001 else '**' if p < 0.01 else '*' if p < 0.05 else ''
+
+
+def compare_models(fits):
+    """Side-by-side table: 'coef (SE)' with significance stars per term, then fit statistics."""
+    terms = list(dict.fromkeys(name for fit in fits.values() for name in fit['coef'].index))
+    stat_names = list(dict.fromkeys(name for fit in fits.values() for name in fit['stats'] if name != 'df_resid'))
+    table = {}
+    for label, fit in fits.items():
+        coef = fit['coef']
+        cells = [f"{coef.at[t, 'Coef']:.4g}{_stars(coef.at[t, 'P-value'])} ({coef.at[t, 'Std Err']:.3g})"
+                 if t in coef.index else '' for t in terms]
+        cells += [f"{fit['stats'][s]:.4g}" if s in fit['stats'] else '' for s in stat_names]
+        table[label] = cells
+    return pd.DataFrame(table, index=terms + stat_names)
+
+
+def nested_tests(fits):
+    """Likelihood-ratio (and, for OLS, F) tests for every pair where one model nests the other.
+
+    Nested means same outcome, model type and dropna policy, predictors a strict subset,
+    and the same estimation sample size.
+    """
+    rows = []
+    items = list(fits.items())
+    for i, (label_a, a) in enumerate(items):
+        for label_b, b in items[i + 1:]:
+            small, big = (a, b) if len(a['xs']) <= len(b['xs']) else (b, a)
+            small_label, big_label = (label_a, label_b) if small is a else (label_b, label_a)
+            if (small['kind'] != big['kind'] or small['y'] != big['y'] or small['policy'] != big['policy']
+                    or not set(small['xs']) < set(big['xs']) or small['stats']['n'] != big['stats']['n']
+                    or 'Log-lik' not in small['stats']):
+                continue
+            df_diff = len(big['xs']) - len(small['xs'])
+            lr = 2 * (big['stats']['Log-lik'] - small['stats']['Log-lik'])
+            row = {'Reduced': small_label, 'Full': big_label, 'df': df_diff,
+                   'LR χ²': lr, 'P (LR)': stats.chi2.sf(lr, df_diff)}
+            if small['kind'] == 'ols':
+                sse_r, sse_f = (small['resid'] ** 2).sum(), (big['resid'] ** 2).sum()
+                dof_f = big['stats']['df_resid']
+                f_stat = (sse_r - sse_f) / df_diff / (sse_f / dof_f)
+                row.update({'F': f_stat, 'P (F)': stats.f.sf(f_stat, df_diff, dof_f)})
+            rows.append(row)
+    return pd.DataFrame(rows)
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+
+def _tie_term(combined):
+    """Per-column sum of (t^3 - t) over tied runs, NaNs ignored. combined: (N, p)."""
+    n, p = combined.shape
+    s = np.sort(combined, axis=0)  # NaNs sort to the end and never compare equal
+    new_run = np.ones_like(s, dtype=bool)
+    new_run[1:] = s[1:] != s[:-1]
+    run_id = np.cumsum(new_run, axis=0) - 1
+    flat = (run_id + np.arange(p) * n).ravel(order='F')
+    weights = (~np.isnan(s)).ravel(order='F').astype(float)
+    counts = np.bincount(flat, weights=weights, minlength=n * p).reshape(p, n)
+    return (counts ** 3 - counts).sum(axis=1)
+
+
+def _nan_moments(x, n):
+    """Column means and sample variances (ddof=1) from masked sums; NaN where a column has
+    no values (mean) or fewer than 2 (variance). Unlike np.nanvar, never warns."""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.nansum(x, axis=0) / n
+        var = np.nansum((x - mean) ** 2, axis=0) / (n - 1)
+    mean[n < 1] = np.nan
+    var[n < 2] = np.nan
+    return mean, var
+
+
+def sweep_arrays(x1, x2):
+    """Runs the two-group battery on every column at once.
+
+    x1: (n1_rows, p) values of group 1, x2: (n2_rows, p) of group 2; NaN = missing.
+    Returns a dict of length-p arrays: n, means, Student t-test, Mann-Whitney U
+    (normal approximation with tie and continuity correction), Cohen's d and
+    AUC = P(group 2 > group 1). Variables with fewer than 2 values in either group
+    get NaN for every statistic.
+    """
+    n1 = (~np.isnan(x1)).sum(axis=0).astype(float)
+    n2 = (~np.isnan(x2)).sum(axis=0).astype(float)
+
+    m1, v1 = _nan_moments(x1, n1)
+    m2, v2 = _nan_moments(x2, n2)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # Student's t-test (pooled variance, same as scipy.stats.ttest_ind default)
+        dof = n1 + n2 - 2
+        pooled_var = ((n1 - 1) * v1 + (n2 - 1) * v2) / dof
+        t_stat = (m1 - m2) / np.sqrt(pooled_var * (1 / n1 + 1 / n2))
+        p_t = 2 * stats.t.sf(np.abs(t_stat), dof)
+
+        # Cohen's d (Test - Control, pooled SD)
+        cohens_d = (m2 - m1) / np.sqrt(pooled_var)
+
+        # Mann-Whitney U from column-wise average ranks of the pooled sample
+        combined = np.vstack([x1, x2])
+        ranks = pd.DataFrame(combined).rank(axis=0, method='average').to_numpy()
+        r1 = np.nansum(ranks[:len(x1)], axis=0)
+        u1 = r1 - n1 * (n1 + 1) / 2
+        u2 = n1 * n2 - u1
+        n = n1 + n2
+        sigma = np.sqrt(n1 * n2 / 12 * ((n + 1) - _tie_term(combined) / (n * (n - 1))))
+        z = (np.maximum(u1, u2) - n1 * n2 / 2 - 0.5) / sigma
+        p_mw = np.clip(2 * stats.norm.sf(z), 0, 1)
+
+        auc = u2 / (n1 * n2)
+
+    too_small = (n1 < 2) | (n2 < 2)
+    for arr in (t_stat, p_t, u2, cohens_d, p_mw, auc):
+        arr[too_small] = np.nan
+
+    return {'n1': n1.astype(int), 'n2': n2.astype(int), 'mean1': m1, 'mean2': m2, 't_stat': t_stat,
+            'p_t': p_t, 'u_stat': u2, 'p_mw': p_mw, 'cohens_d': cohens_d, 'auc': auc}
+
+
+def sweep_table(x1, x2, columns, categories=None):
+    """sweep_arrays as a results grid (one row per variable), sorted by t-test p-value."""
+    res = sweep_arrays(x1, x2)
+    table = pd.DataFrame({
+        'Variable': columns,
+        'Category': [categories.get(c, '') for c in columns] if categories else '',
+        'n1': res['n1'], 'n2': res['n2'],
+        'Mean 1': res['mean1'], 'Mean 2': res['mean2'],
+        'Diff': res['mean2'] - res['mean1'],
+        '% Diff': np.where(res['mean1'] != 0, (res['mean2'] - res['mean1']) / np.abs(res['mean1']) * 100, np.nan),
+        't': res['t_stat'], 'P (t-test)': res['p_t'],
+        'U': res['u_stat'], 'P (Mann-Whitney)': res['p_mw'],
+        "Cohen's d": res['cohens_d'], 'AUC': res['auc'],
+    })
+    return table.sort_values('P (t-test)', na_position='last').reset_index(drop=True)
@@ -0,0 +1,233 @@
+import os
+import mmap
+import struct
+import numpy as np
+
+# TIFF tag ids used to locate raw pixel data
+TAG_WIDTH, TAG_LENGTH, TAG_BITS, TAG_COMPRESSION = 256, 257, 258, 259
+TAG_STRIP_OFFSETS, TAG_SAMPLES, TAG_STRIP_COUNTS = 273, 277, 279
+TAG_PLANAR, TAG_TILE_WIDTH, TAG_SAMPLE_FORMAT = 284, 322, 339
+
+# field type -> (struct code, byte size)
+FIELD_TYPES = {1: ('B', 1), 3: ('H', 2), 4: ('I', 4), 16: ('Q', 8)}
+SAMPLE_KINDS = {1: 'u', 2: 'i', 3: 'f'}
+
+
+# --- 1. TIFF LAYOUT PARSING ---
+def read_tiff_pages(path):
+    """Returns the byte order and a list of per-page layouts (shape, dtype, data offset, compression, contiguous).
+
+    Only the IFDs are read; pixel data is never touched.
+    """
+    pages = []
+    with open(path, 'rb') as f:
+        order = {b'II': '<', b'MM': '>'}.get(f.read(2))
+        if order is None:
+            raise ValueError(f"Not a TIFF file: {path}")
+        magic = struct.unpack(order + 'H', f.read(2))[0]
+        if magic == 42:
+            entry_fmt, count_fmt, off_fmt, inline = 'HHI4s', 'H', 'I', 4
+        elif magic == 43:
+            f.read(4)  # offset size + padding
+            entry_fmt, count_fmt, off_fmt, inline = 'HHQ8s', 'Q', 'Q', 8
+        else:
+            raise ValueError(f"Unsupported TIFF magic {magic}: {path}")
+
+        ifd_offset = struct.unpack(order + off_fmt, f.read(struct.calcsize(off_fmt)))[0]
+        entry_size = struct.calcsize('<' + entry_fmt)
+
+        while ifd_offset:
+            f.seek(ifd_offset)
+            n_entries = struct.unpack(order + count_fmt, f.read(struct.calcsize(count_fmt)))[0]
+            raw_entries = f.read(n_entries * entry_size)
+            tags = {}
+            for i in range(n_entries):
+                tag, ftype, count, value = struct.unpack_from(order + entry_fmt, raw_entries, i * entry_size)
+                if ftype not in FIELD_TYPES:
+                    continue
+                code, size = FIELD_TYPES[ftype]
+                if count * size <= inline:
+                    data = value[:count * size]
+                else:
+                    pos = f.tell()
+                    f.seek(struct.unpack(order + off_fmt, value[:struct.calcsize(off_fmt)])[0])
+                    data = f.read(count * size)
+                    f.seek(pos)
+                tags[tag] = struct.unpack(order + code * count, data)
+            ifd_offset = struct.unpack(order + off_fmt, f.read(struct.calcsize(off_fmt)))[0]
+            pages.append(_page_layout(tags, order))
+
+    return order, pages
+
+
+def _page_layout(tags, order):
+    width, height = tags[TAG_WIDTH][0], tags[TAG_LENGTH][0]
+    samples = tags.get(TAG_SAMPLES, (1,))[0]
+    bits = tags.get(TAG_BITS, (1,))[0]
+    kind = SAMPLE_KINDS.get(tags.get(TAG_SAMPLE_FORMAT, (1,))[0], 'u')
+    compression = tags.get(TAG_COMPRESSION, (1,))[0]
+    offsets = tags.get(TAG_STRIP_OFFSETS, ())
+    counts = tags.get(TAG_STRIP_COUNTS, ())
+
+    dtype = np.dtype(f"{order}{kind}{bits // 8}") if bits in (8, 16, 32, 64) else None
+    shape = (height, width) if samples == 1 else (height, width, samples)
+
+    # Raw memory mapping needs uncompressed, chunky, stripped pages with back-to-back strips
+    contiguous = (
+            dtype is not None and compression == 1 and TAG_TILE_WIDTH not in tags
+            and tags.get(TAG_PLANAR, (1,))[0] == 1 and len(offsets) > 0
+            and all(offsets[i] + counts[i] == offsets[i + 1] for i in range(len(offsets) - 1))
+            and sum(counts) >= int(np.prod(shape)) * dtype.itemsize
+    )
+    return {'shape': shape, 'dtype': dtype, 'offset': offsets[0] if offsets else None,
+            'compression': compression, 'contiguous': contiguous}
+
+
+# --- 2. ONE-TIME .NPY CONVERSION (compressed / irregular stacks) ---
+def convert_to_npy(tiff_path, npy_path):
+    """Decodes a TIFF stack page by page into an on-disk .npy memmap (peak memory = one slice)."""
+    from PIL import Image
+
+    with Image.open(tiff_path) as img:
+        n_frames = getattr(img, 'n_frames', 1)
+        first = np.asarray(img)
+        out = np.lib.format.open_memmap(npy_path, mode='w+', dtype=first.dtype, shape=(n_frames,) + first.shape)
+        out[0] = first
+        for index in range(1, n_frames):
+            img.seek(index)
+            out[index] = np.asarray(img)
+        out.flush()
+    del out
+    return npy_path
+
+
+# --- 3. LAZY STACK ---
+class HRpQCTStack:
+    """Lazy (z, y, x) view over an HR-pQCT TIFF stack or .npy volume.
+
+    Uncompressed TIFFs are memory-mapped in place. Compressed or irregular TIFFs are
+    converted once to a `.npy` file (next to the TIFF, or in `cache_dir`) and that is
+    memory-mapped on later opens. Slices and ROIs are NumPy views: pixels are only
+    read from disk when they are actually used.
+    """
+
+    def __init__(self, path, cache_dir=None):
+        self.path = path
+        self._mmap = None
+        self._file = None
+        self._pages = None  # per-page views when pages are not evenly spaced
+
+        if path.lower().endswith('.npy'):
+            self.volume = np.load(path, mmap_mode='r')
+            self.source = 'npy'
+            return
+
+        _, pages = read_tiff_pages(path)
+        first = pages[0]
+        uniform = all(p['contiguous'] and p['shape'] == first['shape'] and p['dtype'] == first['dtype']
+                      for p in pages)
+
+        if uniform:
+            self._file = open(path, 'rb')
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            views = [np.ndarray(first['shape'], first['dtype'], buffer=self._mmap, offset=p['offset'])
+                     for p in pages]
+            stride = pages[1]['offset'] - pages[0]['offset'] if len(pages) > 1 else 0
+            evenly_spaced = all(p['offset'] == first['offset'] + i * stride for i, p in enumerate(pages))
+            if evenly_spaced and stride >= 0:
+                self.volume = np.ndarray((len(pages),) + first['shape'], first['dtype'], buffer=self._mmap,
+                                         offset=first['offset'], strides=(stride,) + views[0].strides)
+            else:
+                self.volume = None
+                self._pages = views
+            self.source = 'tiff-mmap'
+        else:
+            npy_path = self._npy_cache_path(cache_dir)
+            if not (os.path.exists(npy_path) and os.path.getmtime(npy_path) >= os.path.getmtime(path)):
+                convert_to_npy(path, npy_path)
+            self.volume = np.load(npy_path, mmap_mode='r')
+            self.source = 'npy-cache'
+
+    def _npy_cache_path(self, cache_dir):
+        stem = os.path.splitext(os.path.basename(self.path))[0]
+        directory = cache_dir or os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, f"{stem}.npy")
+
+    # --- Shape ---
+    @property
+    def shape(self):
+        if self.volume is not None:
+            return self.volume.shape
+        return (len(self._pages),) + self._pages[0].shape
+
+    @property
+    def dtype(self):
+        return self.volume.dtype if self.volume is not None else self._pages[0].dtype
+
+    def __len__(self):
+        return self.shape[0]
+
+    # --- Lazy access ---
+    def get_slice(self, z):
+        """One (y, x) slice as a read-only view."""
+        return self.volume[z] if self.volume is not None else self._pages[z]
+
+    def roi(self, z=slice(None), y=slice(None), x=slice(None)):
+        """A (z, y, x) region of interest. A view for mmap-able stacks; irregular stacks copy only the ROI."""
+        if self.volume is not None:
+            return self.volume[z, y, x]
+        indices = range(len(self._pages))[z] if isinstance(z, slice) else [z]
+        region = np.stack([self._pages[i][y, x] for i in indices])
+        return region if isinstance(z, slice) else region[0]
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        return self.roi(*key)
+
+    def iter_slices(self, start=0, stop=None, step=1):
+        """Yields (index, slice view) pairs, touching one slice at a time."""
+        for z in range(len(self))[start:stop:step]:
+            yield z, self.get_slice(z)
+
+    # --- Lifetime ---
+    def close(self):
+        self.volume = None
+        self._pages = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass  # caller still holds slice views; the map is released with them
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self):
+        return f"HRpQCTStack({os.path.basename(self.path)!r}, shape={self.shape}, dtype={self.dtype}, source={self.source})"
+
+
+def open_stack(path, cache_dir=None):
+    """Opens a TIFF stack or .npy volume for lazy slice/ROI access."""
+    return HRpQCTStack(path, cache_dir=cache_dir)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python hrpqct_stack.py <stack.tif|stack.npy> [cache_dir]")
+        sys.exit(1)
+
+    with open_stack(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None) as stack:
+        print(f"📦 {stack}")
+        mid = stack.get_slice(len(stack) // 2)
+        print(f"   Mid slice {len(stack) // 2}: min={mid.min()}, max={mid.max()}, mean={mid.mean():.1f}")
@@ -1,75 +1,139 @@
-import spacy
-import re
 import os
 import sys
-from textstat import flesch_reading_ease, text_standard
+import time
+import argparse
 
-# --- 1. SETUP & MODEL LOADING ---
-print("⏳ Loading NLP Model (this may take a moment)...")
-try:
-    nlp = spacy.load("en_core_web_md")
-except OSError:
-    print("⚠️  Model 'en_core_web_md' not found.")
-    print("   Please run this command in terminal: python -m spacy download en_core_web_md")
-    sys.exit(1)
+from auditor.batch import REPO_ROOT, default_workers, discover_manuscripts, parse_many
+from auditor.cache import ParagraphCache
+from auditor.fingerprint import load_index, tokenize
+from auditor.grounding import classify
+from auditor.matcher import get_matcher
+from auditor.quarto import mask, prose_share
+from auditor.readability import flesch_kincaid_grade, flesch_reading_ease, readability_map
+from auditor.results import find_results_dir, load_results_index
+from auditor.nlp import DEFAULT_MODEL, MODEL_HINT, get_nlp, is_loaded
+from auditor.report import build_report, total_issues, write_json, write_markdown
+
+
+# --- 1. SETUP & LAZY MODEL LOADING ---
+# spaCy is only imported when a check needs it, and each check gets the lightest pipeline:
+# sentencizer for fact grounding, tok2vec + parser for passive voice (see auditor/nlp.py).
+def load_nlp(profile):
+    if profile == 'syntax' and not is_loaded(profile):
+        print(f"⏳ Loading NLP Model '{DEFAULT_MODEL}' (parser only)...")
+    try:
+        return get_nlp(profile)
+    except OSError:
+        print(f"⚠️  Model '{DEFAULT_MODEL}' not found.")
+        print(f"   Please run this command in terminal: {MODEL_HINT.format(model=DEFAULT_MODEL)}")
+        sys.exit(1)
+
+
+# --- 2. SENTENCE LAYERS (cached per paragraph; bump the tag when a layer's rules change) ---
+def is_passive(sent):
+    return any(tok.dep_ == "auxpass" for tok in sent)
+
+
+def grounding_claim(sent):
+    # Logic: If it contains a number/percent, it MUST have a citation, p-value, or 'Table/Figure' ref
+    return classify(sent.text)
+
+
+SENTENCE_LAYERS = {
+    # layer: (cache tag, pipeline profile, annotator run on each spaCy sentence)
+    'passive': ('passive-v1', 'syntax', is_passive),
+    'grounding': ('grounding-v2', 'sentences', grounding_claim),
+}
+
+
+def layer_records(texts, layer, cache, n_process=1, batch_size=32):
+    """[(start, end, value)] sentence records per text; only uncached paragraphs are parsed."""
+    tag, profile, annotate = SENTENCE_LAYERS[layer]
+
+    def parse(paragraphs):
+        load_nlp(profile)
+        return parse_many(paragraphs, profile, n_process=n_process, batch_size=batch_size)
+
+    return cache.sentences_many(texts, tag, parse, annotate)
 
 
 class ManuscriptQualityAuditor:
-    def __init__(self, file_path=None, direct_text=None):
+    def __init__(self, file_path=None, direct_text=None, cache=None, records=None, index=None):
         """
         Initialize with either a file path (for your .qmd files)
-        or direct text (for testing).
+        or direct text (for testing). `cache` is a ParagraphCache (in-memory
+        if omitted); `records` takes precomputed sentence records per layer
+        (batch mode computes them for all files in one nlp.pipe pass).
+        `index` is the reference FingerprintIndex (loaded on first use if omitted).
         """
         if file_path and os.path.exists(file_path):
             with open(file_path, 'r', encoding='utf-8') as f:
                 self.text = f.read()
             self.source = file_path
+            self.results_dir = find_results_dir(file_path)
         elif direct_text:
             self.text = direct_text
             self.source = "Direct Text Input"
+            self.results_dir = None
         else:
             raise FileNotFoundError(f"File not found: {file_path}")
 
-        # Clean text for analysis (remove markdown headers if needed)
-        self.doc = nlp(self.text)
+        # Layers read the prose-only mask (same offsets as self.text, which is used for display)
+        self.prose = mask(self.text)
+
+        # Sentence records per layer, computed lazily through the paragraph cache
+        self.cache = cache or ParagraphCache(cache_dir=None)
+        self._records = dict(records or {})
+        self._index = index
+
+    def sentence_records(self, layer):
+        if layer not in self._records:
+            self._records[layer] = layer_records([self.prose], layer, self.cache)[0]
+        return self._records[layer]
+
+    def reference_index(self):
+        if self._index is None:
+            self._index = load_index() or False  # False: no reference corpus on disk
+        return self._index
 
     # --- LAYER 1: AI & FILLER DETECTION ---
     def check_ai_writing(self):
         print(f"\n--- 🤖 LAYER 1: AI WRITING CHECK ({self.source}) ---")
-        ai_markers = [
-            'delve', 'testament', 'leverage', 'underscores', 'pivotal',
-            'comprehensive', 'landscape', 'realm', 'tapestry', 'notably',
-            'crucial', 'fostering', 'harnessing'
-        ]
-
-        found = list(set([word for word in ai_markers if word in self.text.lower()]))
+        # Marker list: auditor/phrases/ai_markers.txt (whole words only, so 'realm' no longer hits 'realms' of other words)
+        counts = get_matcher('ai_markers').count(self.prose)
+        found = [word for word, _ in counts.most_common()]
 
         if found:
-            print(f"⚠️  FLAGGED: Found {len(found)} common AI-filler words.")
-            print(f"   Avoid: {found}")
+            print(f"⚠️  FLAGGED: Found {len(found)} common AI-filler words ({sum(counts.values())} uses).")
+            print(f"   Avoid: {', '.join(f'{word} ×{n}' for word, n in counts.most_common())}")
             print("   -> Tip: Replace these with specific verbs (e.g., instead of 'underscores', use 'demonstrates').")
         else:
             print("✅ PASSED: No common AI filler words found.")
+        return {'ai_markers': found, 'ai_marker_counts': dict(counts)}
 
     # --- LAYER 2: SCIENTIFIC STYLE ---
     def check_scientific_style(self):
         print("\n--- 📝 LAYER 2: SCIENTIFIC STYLE & READABILITY ---")
 
-        # 1. Readability
-        score = flesch_reading_ease(self.text)
-        grade = text_standard(self.text)
+        # 1. Readability (counted per paragraph, scored per section and for the whole text)
+        counts, sections = readability_map(self.prose)
+        score = flesch_reading_ease(counts)
+        grade = flesch_kincaid_grade(counts)
         print(f"   Readability Score: {score:.1f} (Target: 30-50 for high-impact journals)")
-        print(f"   Approx. Grade Level: {grade}")
+        print(f"   Approx. Grade Level: {grade:.1f} (Flesch-Kincaid)")
 
         if score > 60: print("   ⚠️  Warning: Text may be too simple/conversational for JBMR.")
         if score < 20: print("   ⚠️  Warning: Text is very dense. Consider breaking up long sentences.")
 
+        if len(sections) > 1:
+            print("   Section map (Flesch / grade / words):")
+            for s in sections:
+                flag = " ⚠️  too simple" if s['fre'] > 60 else " ⚠️  very dense" if s['fre'] < 20 else ""
+                print(f"      {s['fre']:>6.1f} {s['grade']:>5.1f} {s['counts']['words']:>6}  {s['title'][:60]}{flag}")
+
         # 2. Passive Voice
-        passive_sentences = []
-        sentences = list(self.doc.sents)
-        for sent in sentences:
-            if any(tok.dep_ == "auxpass" for tok in sent):
-                passive_sentences.append(sent.text[:60] + "...")
+        sentences = self.sentence_records('passive')
+        passive_sentences = [self.text[start:end][:60] + "..." for start, end, passive in sentences if passive]
 
         passive_pct = (len(passive_sentences) / len(sentences)) * 100 if sentences else 0
         print(f"   Passive Voice: {passive_pct:.1f}% ({len(passive_sentences)}/{len(sentences)} sentences)")
@@ -77,32 +141,18 @@ class ManuscriptQualityAuditor:
         if passive_pct > 30:
             print("   ⚠️  Warning: Excessive Passive Voice (>30%). Use Active Voice.")
             print("      e.g., Change 'It was shown by HR-pQCT...' to 'HR-pQCT demonstrated...'")
+        return {'readability': score, 'grade': grade, 'readability_sections': sections, 'readability_counts': counts,
+                'passive_pct': passive_pct, 'n_sentences': len(sentences)}
 
     # --- LAYER 3: FACT GROUNDING (The "Hallucination" Check) ---
     def check_fact_grounding(self):
         print("\n--- 🔍 LAYER 3: FACT & DATA GROUNDING ---")
-        unsupported_claims = []
-        data_driven_claims = 0
-
-        for sent in self.doc.sents:
-            text = sent.text.strip()
-            if len(text) < 30: continue  # Skip titles/short phrases
-
-            # Logic: If it contains a number/percent, it MUST have a citation, p-value, or 'Table/Figure' ref
-            has_number = re.search(r'\d+%|\d+\.\d+', text)
-            has_proof = (
-                    re.search(r'\(p\s*[<=]\s*\d', text, re.IGNORECASE) or
-                    re.search(r'\[@', text) or
-                    "Table" in text or "Figure" in text or
-                    re.search(r'n\s*=\s*\d+', text, re.IGNORECASE)
-            )
-
-            if has_proof:
-                data_driven_claims += 1
-            elif has_number and not has_proof:
-                # Exclude simple years like (2017)
-                if not re.search(r'\(\d{4}\)', text):
-                    unsupported_claims.append(text[:80] + "...")
+        claims = [{'start': start, 'end': end, 'verdict': claim['verdict'], 'evidence': claim['evidence'],
+                   'numbers': [(start + s, start + e) for s, e in claim['numbers']]}
+                  for start, end, claim in self.sentence_records('grounding') if claim]
+        data_driven_claims = sum(c['verdict'] == 'data' for c in claims)
+        unsupported_claims = [self.text[c['start']:c['end']].strip()[:80] + "..."
+                              for c in claims if c['verdict'] == 'unsupported']
 
         print(f"   ✅ Data-Driven Sentences: {data_driven_claims}")
 
@@ -113,30 +163,165 @@ class ManuscriptQualityAuditor:
             print("      -> Action: Add (p<0.05) or [@citation] to these sentences.")
         else:
             print("   ✅ PASSED: All numerical claims appear grounded in data.")
+        return {'data_driven': data_driven_claims, 'unsupported': unsupported_claims, 'claims': claims}
 
     # --- LAYER 4: PLAGIARISM RISK ---
     def check_plagiarism_risk(self):
         print("\n--- 👮 LAYER 4: PLAGIARISM & TWIN PAPER CHECK ---")
-        # Phrases from Sornay-Rendu (2017) and Patsch (2013) to avoid copying directly
-        risky_phrases = [
-            "bone microarchitecture assessed by hr-pqct as predictor",
-            "majority of fragility fractures occur in the osteopenic range",
-            "independent of areal bone mineral density",
-            "cortical porosity in type 2 diabetic postmenopausal women"
-        ]
-
-        found_risk = [phrase for phrase in risky_phrases if phrase in self.text.lower()]
+        # Phrases from Sornay-Rendu (2017) and Patsch (2013): auditor/phrases/twin_papers.txt
+        hits = get_matcher('twin_papers').find(self.prose)
+        found_risk = list(dict.fromkeys(phrase for _, _, phrase in hits))
 
         if found_risk:
             print(f"   ⚠️  HIGH SIMILARITY DETECTED (Paraphrase these immediately):")
-            for phrase in found_risk:
-                print(f"      - '{phrase}'")
+            for start, _, phrase in hits:
+                print(f"      - line {self.text.count(chr(10), 0, start) + 1}: '{phrase}'")
         else:
             print("   ✅ PASSED: No direct copy-paste from Twin Papers detected.")
 
+        # Passages shared with the reference corpus (LitReview abstracts + local reference texts)
+        index = self.reference_index()
+        overlaps = index.query(self.prose) if index else []
+        if not index:
+            print("   ℹ️  No reference corpus found; overlap check skipped.")
+        elif overlaps:
+            print(f"   ⚠️  {len(overlaps)} passage(s) overlap the reference corpus ({len(index)} documents):")
+            for o in overlaps[:5]:
+                print(f"      - line {self.text.count(chr(10), 0, o['start']) + 1}, ~{o['words']} words: "
+                      f"'{o['doc']['title'][:60]}'")
+                print(f"        \"{' '.join(self.text[o['start']:o['end']].split())[:100]}...\"")
+        else:
+            print(f"   ✅ PASSED: No passages shared with the {len(index)} reference documents.")
+        return {'risky_phrases': found_risk, 'risky_positions': [(start, end) for start, end, _ in hits],
+                'overlaps': overlaps}
+
+    # --- LAYER 5: NUMBERS vs. RESULTS TABLES ---
+    def check_numeric_claims(self):
+        print("\n--- 🔢 LAYER 5: NUMERIC CLAIMS vs. RESULTS TABLES ---")
+        if not self.results_dir:
+            print("   ℹ️  No results/tables folder for this manuscript; cross-check skipped.")
+            return {'numeric_claims': [], 'mismatched_numbers': [], 'unmatched_numbers': []}
+
+        claims = self.results_index().check(self.prose)
+        matched = sum(1 for c in claims if c['status'] == 'match')
+        mismatched = [c for c in claims if c['status'] == 'mismatch']
+        unmatched = [c for c in claims if c['status'] == 'unmatched']
+        print(f"   ✅ Numbers found in {os.path.relpath(self.results_dir, REPO_ROOT)}: {matched}/{len(claims)}")
+        if unmatched:
+            # Not issues: the sentence does not name a table row clearly enough to compare
+            print(f"   ℹ️  {len(unmatched)} number(s) could not be tied to a table cell (thresholds, background figures).")
+
+        if mismatched:
+            print("   ⚠️  NUMBERS DIFFERING FROM THE RESULTS TABLES (possible drift after a re-run):")
+            for c in mismatched:
+                line = self.text.count(chr(10), 0, c['start']) + 1
+                value, table, row, column = c['expected']
+                print(f"      ❌ line {line}: {c['text']} -> table says {value:g} ({table} · {row} · {column})")
+        else:
+            print("   ✅ PASSED: No reported number contradicts a results table.")
+        return {'numeric_claims': claims, 'mismatched_numbers': mismatched, 'unmatched_numbers': unmatched}
+
+    def results_index(self):
+        return load_results_index(self.results_dir)
+
+    def run_all(self):
+        """Results of every layer in one dict, plus per-layer seconds ('timings') and the token count."""
+        results, timings = {}, {}
+        for layer, check in (('ai_writing', self.check_ai_writing), ('scientific_style', self.check_scientific_style),
+                             ('fact_grounding', self.check_fact_grounding), ('plagiarism', self.check_plagiarism_risk),
+                             ('numeric_claims', self.check_numeric_claims)):
+            t0 = time.perf_counter()
+            results.update(check())
+            timings[layer] = time.perf_counter() - t0
+        return {**results, 'timings': timings, 'tokens': len(tokenize(self.prose)),
+                'prose_share': prose_share(self.text, self.prose)}
+
+
+# --- BATCH MODE ---
+def audit_batch(paths, n_process=1, batch_size=32, cache=None):
+    """Audits many files: changed paragraphs of all files go through one nlp.pipe pass per layer.
+
+    Returns (rows, parse_stats): one result dict per file and the cost of the shared parse.
+    """
+    cache = cache or ParagraphCache(cache_dir=None)
+    texts = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            texts.append(mask(f.read()))
+
+    print(f"📚 Parsing {len(paths)} manuscript files (workers={n_process}, batch_size={batch_size})...")
+    t0 = time.perf_counter()
+    records = {layer: layer_records(texts, layer, cache, n_process=n_process, batch_size=batch_size)
+               for layer in SENTENCE_LAYERS}
+    cache.save()
+    parse_stats = {'seconds': time.perf_counter() - t0, 'paragraphs_reused': cache.hits,
+                   'paragraphs_parsed': cache.misses, 'workers': n_process}
+    print(f"   Parsed in {parse_stats['seconds']:.1f}s "
+          f"(paragraph cache: {cache.hits} reused, {cache.misses} parsed)")
+
+    index = load_index() or False
+    rows = []
+    for i, path in enumerate(paths):
+        auditor = ManuscriptQualityAuditor(file_path=path, cache=cache, index=index,
+                                           records={layer: records[layer][i] for layer in records})
+        rows.append({'file': os.path.relpath(path, REPO_ROOT), **auditor.run_all()})
+
+    print_batch_summary(rows)
+    return rows, parse_stats
+
+
+def print_batch_summary(rows):
+    print("\n=== 📋 CONSOLIDATED AUDIT REPORT ===")
+    header = f"{'File':<60} {'Sent':>5} {'Passive%':>8} {'FRE':>6} {'Unsupp.':>7} {'AI':>3} {'Twin':>4} {'Overlap':>7} {'Num?':>4}"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        print(f"{r['file'][-60:]:<60} {r['n_sentences']:>5} {r['passive_pct']:>8.1f} {r['readability']:>6.1f} "
+              f"{len(r['unsupported']):>7} {len(r['ai_markers']):>3} {len(r['risky_phrases']):>4} {len(r['overlaps']):>7} {len(r['mismatched_numbers']):>4}")
+    print("-" * len(header))
+    print(f"{len(rows)} files · {sum(len(r['unsupported']) for r in rows)} unsupported claims · "
+          f"{sum(len(r['ai_markers']) for r in rows)} AI-filler hits · "
+          f"{sum(len(r['risky_phrases']) for r in rows)} twin-paper phrases · "
+          f"{sum(len(r['overlaps']) for r in rows)} overlapping passages · "
+          f"{sum(len(r['mismatched_numbers']) for r in rows)} numbers differing from results tables")
+
 
 # --- MAIN EXECUTION ---
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manuscript quality auditor (AI filler, style, grounding, twin papers).")
+    parser.add_argument('files', nargs='*', help="Files to audit together in batch mode")
+    parser.add_argument('--all', action='store_true',
+                        help="Batch-audit every manuscript section plus the MAFLD / IndianFRAX manuscripts")
+    parser.add_argument('-j', '--workers', type=int, default=default_workers(),
+                        help="spaCy worker processes for batch mode (default: all cores)")
+    parser.add_argument('--batch-size', type=int, default=32, help="Paragraphs per nlp.pipe batch")
+    parser.add_argument('--no-cache', action='store_true', help="Ignore the on-disk paragraph cache")
+    parser.add_argument('--json', metavar='PATH', help="Write the full structured report as JSON")
+    parser.add_argument('--markdown', metavar='PATH', help="Write a Markdown summary report")
+    parser.add_argument('--max-issues', type=int, default=None,
+                        help="Exit with status 1 when more issues than this are flagged in total")
+    args = parser.parse_args()
+    cache = ParagraphCache(cache_dir=None) if args.no_cache else ParagraphCache()
+
+    def finish(rows, parse_stats=None):
+        report = build_report(rows, parse_stats)
+        if args.json:
+            write_json(report, args.json)
+        if args.markdown:
+            write_markdown(report, args.markdown)
+        issues = total_issues(rows)
+        if args.max_issues is not None and issues > args.max_issues:
+            print(f"❌ {issues} issues flagged (limit {args.max_issues}).")
+            sys.exit(1)
+        sys.exit(0)
+
+    if args.all or args.files:
+        batch = discover_manuscripts() if args.all else [os.path.abspath(p) for p in args.files]
+        if not batch:
+            print("❌ No manuscript files found.")
+            sys.exit(1)
+        finish(*audit_batch(batch, n_process=args.workers, batch_size=args.batch_size, cache=cache))
+
     # 1. Define the target file (Adjust this path to your specific section)
     # Example: "../manuscript/sections/01_abstract.qmd"
     target_file = "../manuscript/sections/01_abstract.qmd"
@@ -150,13 +335,13 @@ if __name__ == "__main__":
     """
 
     if os.path.exists(target_file):
-        auditor = ManuscriptQualityAuditor(file_path=target_file)
+        auditor = ManuscriptQualityAuditor(file_path=target_file, cache=cache)
     else:
         print(f"ℹ️  File '{target_file}' not found. Running on SAMPLE text for demonstration.")
-        auditor = ManuscriptQualityAuditor(direct_text=sample_text)
+        auditor = ManuscriptQualityAuditor(direct_text=sample_text, cache=cache)
 
     # 3. Run All Checks
-    auditor.check_ai_writing()
-    auditor.check_scientific_style()
-    auditor.check_fact_grounding()
-    auditor.check_plagiarism_risk()
\ No newline at end of file
+    results = auditor.run_all()
+    cache.save()
+    finish([{'file': os.path.relpath(auditor.source, REPO_ROOT) if os.path.exists(auditor.source) else auditor.source,
+             **results}])
\ No newline at end of file
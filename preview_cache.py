@@ -0,0 +1,228 @@
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+from PIL import Image
+
+# Longest-edge sizes (px) of the preview pyramid; the 300-dpi originals stay untouched
+LEVELS = (320, 800, 1600)
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(ROOT_DIR, ".preview_cache")
+HTML_PREVIEW_DIR = "previews"  # rewritten HTML pages reference previews in <html_dir>/previews/, published with the page
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".tif", ".tiff")
+MANIFEST = "manifest.json"
+
+
+class PreviewCache:
+    """Multi-resolution previews of figures and scan images, named by content hash.
+
+    Each source is hashed and downsampled once; later calls reuse the files on disk.
+    A manifest keyed on (path, size, mtime) avoids re-hashing unchanged sources.
+    TIFF stacks are previewed from their middle slice; 16/32-bit scans are windowed to 8-bit.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, levels=LEVELS):
+        self.cache_dir = cache_dir
+        self.levels = tuple(sorted(levels))
+        os.makedirs(cache_dir, exist_ok=True)
+        self._manifest_path = os.path.join(cache_dir, MANIFEST)
+        self._manifest = {}
+        self._dirty = False
+        if os.path.exists(self._manifest_path):
+            with open(self._manifest_path, "r", encoding="utf-8") as f:
+                self._manifest = json.load(f)
+
+    # --- Hashing ---
+    def content_hash(self, source):
+        source = os.path.abspath(source)
+        stat = os.stat(source)
+        entry = self._manifest.get(source)
+        if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+            return entry["hash"]
+
+        digest = hashlib.sha1()
+        with open(source, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        content = digest.hexdigest()[:16]
+        self._manifest[source] = {"size": stat.st_size, "mtime": stat.st_mtime, "hash": content}
+        self._dirty = True
+        return content
+
+    def save_manifest(self):
+        if not self._dirty:
+            return
+        self._dirty = False
+        with open(self._manifest_path, "w", encoding="utf-8") as f:
+            json.dump(self._manifest, f, indent=1)
+
+    # --- Pyramid ---
+    def _level_path(self, source, content, level):
+        stem = os.path.splitext(os.path.basename(source))[0]
+        ext = ".jpg" if source.lower().endswith((".jpg", ".jpeg")) else ".png"
+        return os.path.join(self.cache_dir, f"{stem}-{content}-{level}{ext}")
+
+    def _open_source(self, source):
+        img = Image.open(source)
+        if getattr(img, "n_frames", 1) > 1:
+            img.seek(img.n_frames // 2)  # stacks: decode only the middle slice
+        img.load()
+        if img.mode.startswith(("I", "F")):
+            import tifftopng
+            return tifftopng.to_8bit(img)  # 16/32-bit scans: window to 8-bit instead of clipping
+        return img
+
+    def build(self, source):
+        """Generates every missing pyramid level for one source. Returns {level: path}."""
+        content = self.content_hash(source)
+        paths = {level: self._level_path(source, content, level) for level in self.levels}
+        missing = [level for level, path in paths.items() if not os.path.exists(path)]
+        if not missing:
+            return paths
+
+        img = self._open_source(source)
+        if img.mode not in ("RGB", "RGBA", "L", "LA"):
+            img = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+
+        # Largest level first; each smaller level is resampled from the previous one
+        for level in sorted(self.levels, reverse=True):
+            if max(img.size) > level:
+                img = _downsample(img, level)
+            if level in missing:
+                path = paths[level]
+                if path.endswith(".jpg"):
+                    img.convert("RGB").save(path, "JPEG", quality=85, optimize=True)
+                else:
+                    img.save(path, "PNG", optimize=True)
+        return paths
+
+    def preview(self, source, max_width):
+        """Path of the smallest preview level that is at least `max_width` px (or the largest level)."""
+        paths = self.build(source)
+        for level in self.levels:
+            if level >= max_width:
+                return paths[level]
+        return paths[self.levels[-1]]
+
+    def build_directory(self, directory, recursive=True):
+        built = 0
+        for root, _, files in os.walk(directory):
+            for name in sorted(files):
+                if name.lower().endswith(IMAGE_EXTENSIONS):
+                    try:
+                        self.build(os.path.join(root, name))
+                        built += 1
+                    except Exception as e:
+                        print(f"⚠️ Could not preview {name}: {e}")
+            if not recursive:
+                break
+        self.save_manifest()
+        return built
+
+
+def _downsample(img, level):
+    scale = level / max(img.size)
+    size = (max(1, round(img.size[0] * scale)), max(1, round(img.size[1] * scale)))
+    # reducing_gap lets Pillow shrink by an integer factor first, which is far cheaper on 300-dpi sources
+    return img.resize(size, Image.LANCZOS, reducing_gap=3.0)
+
+
+# --- OUTPUT ADAPTERS ---
+_default_cache = None
+
+
+def get_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = PreviewCache()
+    return _default_cache
+
+
+def preview_path(source, max_width=800):
+    """Quarto/Python helper: e.g. `Image(preview_path('results/figures/Fig2_ROC.png', 800))`."""
+    cache = get_cache()
+    path = cache.preview(source, max_width)
+    cache.save_manifest()
+    return path
+
+
+IMG_SRC = re.compile(r'(<img\b[^>]*?\bsrc=")([^"]+)(")', re.IGNORECASE)
+
+
+def rewrite_html(html_path, max_width=800, cache=None):
+    """Points local <img> tags of a rendered HTML page at cached previews (with a srcset of all levels).
+
+    Previews are written to `<html_dir>/previews/` unless another cache is given, so the page
+    never references the gitignored .preview_cache. Returns the number of images rewritten.
+    Embedded (data:) and remote images are left alone.
+    """
+    html_dir = os.path.dirname(os.path.abspath(html_path))
+    cache = cache or PreviewCache(os.path.join(html_dir, HTML_PREVIEW_DIR))
+    with open(html_path, "r", encoding="utf-8") as f:
+        html = f.read()
+
+    count = 0
+
+    def replace(match):
+        nonlocal count
+        src = match.group(2)
+        if src.startswith(("data:", "http://", "https://")) or not src.lower().endswith(IMAGE_EXTENSIONS):
+            return match.group(0)
+        source = os.path.abspath(os.path.join(html_dir, src))
+        # Missing files and tags already pointing into the cache (re-runs) are left alone
+        if not os.path.exists(source) or os.path.dirname(source) == os.path.abspath(cache.cache_dir):
+            return match.group(0)
+
+        paths = cache.build(source)
+        candidates, widths = [], set()
+        for level in cache.levels:
+            with Image.open(paths[level]) as level_img:
+                width = level_img.size[0]
+            # Sources smaller than a level give that level the same width; one descriptor per width
+            if width in widths:
+                continue
+            widths.add(width)
+            candidates.append(f"{os.path.relpath(paths[level], html_dir).replace(os.sep, '/')} {width}w")
+        chosen = os.path.relpath(cache.preview(source, max_width), html_dir).replace(os.sep, "/")
+        count += 1
+        return f'{match.group(1)}{chosen}" srcset="{", ".join(candidates)}" data-full-src="{src}{match.group(3)}'
+
+    html = IMG_SRC.sub(replace, html)
+    with open(html_path, "w", encoding="utf-8") as f:
+        f.write(html)
+    cache.save_manifest()
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build/serve multi-resolution previews of figures and scan images.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_build = sub.add_parser("build", help="Pre-generate previews for every image under the given directories")
+    p_build.add_argument("dirs", nargs="+")
+
+    p_html = sub.add_parser("html", help="Rewrite <img> tags in rendered HTML files to use previews")
+    p_html.add_argument("files", nargs="+")
+    p_html.add_argument("--max-width", type=int, default=800)
+
+    parser.add_argument("--cache-dir", default=None,
+                        help=f"Preview folder (default: {DEFAULT_CACHE_DIR} for build, <html_dir>/{HTML_PREVIEW_DIR} for html)")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        cache = PreviewCache(args.cache_dir or DEFAULT_CACHE_DIR)
+        for directory in args.dirs:
+            n = cache.build_directory(directory)
+            print(f"✅ {n} image(s) previewed under {directory}")
+    else:
+        cache = PreviewCache(args.cache_dir) if args.cache_dir else None
+        for html_file in args.files:
+            n = rewrite_html(html_file, args.max_width, cache)
+            print(f"✅ {html_file}: {n} image(s) now served from previews")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
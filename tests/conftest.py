@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Tests import the project modules (auditor, dashboard, ...) from the repository root
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
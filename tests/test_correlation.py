@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from dashboard.backend import open_backend
+from dashboard.correlation import CorrelationEngine, pairwise_corr, pairwise_spearman
+from dashboard.metadata import build_metadata
+
+
+@pytest.fixture
+def frame():
+    """Correlated columns with different (overlapping) missingness and some ties."""
+    rng = np.random.default_rng(3)
+    x = rng.normal(size=(200, 5))
+    x[:, 1] += 0.8 * x[:, 0]
+    x[:, 2] = np.round(x[:, 2] - 0.5 * x[:, 1], 1)
+    x[rng.random(x.shape) < 0.25] = np.nan
+    x[:, 4] = np.where(np.isnan(x[:, 3]), np.nan, x[:, 4])  # same rows observed as column 3
+    return pd.DataFrame(x, columns=[f"v{i}" for i in range(5)])
+
+
+def _engine(path):
+    backend = open_backend(str(path))
+    meta = build_metadata(backend)
+    return CorrelationEngine(backend, meta.summary.loc[meta.num_cols])
+
+
+def test_pairwise_pearson_matches_pandas(frame):
+    r, n = pairwise_corr(frame.to_numpy())
+    np.testing.assert_allclose(r, frame.corr(method='pearson').to_numpy(), atol=1e-12)
+    observed = frame.notna().to_numpy().astype(int)
+    np.testing.assert_array_equal(n, observed.T @ observed)
+
+
+def test_pairwise_spearman_matches_pandas_and_scipy(frame):
+    x = frame.to_numpy()
+    r, _ = pairwise_spearman(x)
+    np.testing.assert_allclose(r, frame.corr(method='spearman').to_numpy(), atol=1e-12)
+    both = ~np.isnan(x[:, 0]) & ~np.isnan(x[:, 2])
+    assert r[0, 2] == pytest.approx(stats.spearmanr(x[both, 0], x[both, 2]).statistic, abs=1e-12)
+
+
+def test_engine_pvalues_match_scipy(frame, tmp_path):
+    frame.to_csv(tmp_path / 'data.csv', index=False)
+    r, p, n = _engine(tmp_path / 'data.csv').submatrix(list(frame.columns), 'pearson')
+    x = frame.to_numpy()
+    both = ~np.isnan(x[:, 0]) & ~np.isnan(x[:, 1])
+    ref = stats.pearsonr(x[both, 0], x[both, 1])
+    assert r.iat[0, 1] == pytest.approx(ref.statistic, abs=1e-12)
+    assert p.iat[0, 1] == pytest.approx(ref.pvalue, rel=1e-8)
+    assert n.iat[0, 1] == both.sum()
+
+
+def test_streamed_blocks_match_a_single_pass(frame, tmp_path):
+    frame.to_csv(tmp_path / 'data.csv', index=False)
+    engine = _engine(tmp_path / 'data.csv')
+    engine.backend.iter_batches = lambda columns, _full=engine.backend.iter_batches: _full(columns, batch_rows=17)
+    r, _, _ = engine.submatrix(list(frame.columns), 'pearson')
+    np.testing.assert_allclose(r.to_numpy(), frame.corr().to_numpy(), atol=1e-12)
+
+
+def test_parquet_backend_is_pearson_only(frame, tmp_path):
+    pytest.importorskip('duckdb')
+    frame.to_parquet(tmp_path / 'data.parquet')
+    engine = _engine(tmp_path / 'data.parquet')
+    assert engine.methods == ('pearson',)
+    r, _, _ = engine.submatrix(list(frame.columns), 'pearson')
+    np.testing.assert_allclose(r.to_numpy(), frame.corr().to_numpy(), atol=1e-12)
+    with pytest.raises(ValueError):
+        engine.submatrix(list(frame.columns), 'spearman')
+
+
+def test_spearman_is_computed_per_selection(frame, tmp_path):
+    frame.to_csv(tmp_path / 'data.csv', index=False)
+    engine = _engine(tmp_path / 'data.csv')
+    cols = ['v3', 'v0', 'v2']
+    r, _, n = engine.submatrix(cols, 'spearman')
+    np.testing.assert_allclose(r.to_numpy(), frame[cols].corr(method='spearman').to_numpy(), atol=1e-12)
+    assert list(r.index) == cols and n.at['v3', 'v0'] == (frame['v3'].notna() & frame['v0'].notna()).sum()
+
+    engine.submatrix(list(reversed(cols)), 'spearman')  # same column set, other order: cached
+    assert len(engine.spearman) == 1 and engine.spearman.hits == 1
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from auditor import fingerprint as fpmod
+from auditor.fingerprint import K, W, FingerprintIndex, load_index, shingle_hashes, tokenize, winnow
+
+
+def _words(n, seed):
+    rng = np.random.default_rng(seed)
+    vocab = [f"w{i}" for i in range(500)]
+    return [vocab[i] for i in rng.integers(0, len(vocab), n)]
+
+
+@pytest.fixture
+def corpus():
+    docs = [("Doc A", "a.txt", " ".join(_words(300, 1))), ("Doc B", "b.txt", " ".join(_words(300, 2)))]
+    return docs, FingerprintIndex.build(docs)
+
+
+def test_winnow_picks_the_minimum_of_every_window():
+    hashes = shingle_hashes(_words(200, 5))
+    fp, pos = winnow(hashes)
+    # Brute force: the set of positions holding each window's minimum (leftmost on ties)
+    expected = {i + int(np.argmin(hashes[i:i + W])) for i in range(len(hashes) - W + 1)}
+    assert set(pos.tolist()) == expected
+    np.testing.assert_array_equal(fp, hashes[pos])
+
+
+def test_shingle_hashes_are_stable_and_case_folded_by_fingerprint():
+    words = _words(20, 9)
+    np.testing.assert_array_equal(shingle_hashes(words), shingle_hashes(list(words)))
+    a, _, _ = fpmod.fingerprint(" ".join(words))
+    b, _, _ = fpmod.fingerprint(" ".join(w.upper() for w in words).replace(" ", ", "))
+    np.testing.assert_array_equal(a, b)
+
+
+def test_copied_passage_is_found_with_its_span(corpus):
+    docs, index = corpus
+    copied = docs[1][2].split()[100:100 + 2 * (K + W)]
+    text = " ".join(_words(50, 3)) + " " + " ".join(copied) + " " + " ".join(_words(50, 4))
+    passages = index.query(text)
+
+    assert passages and passages[0]['doc']['title'] == "Doc B"
+    start = text.index(" ".join(copied))
+    end = start + len(" ".join(copied))
+    assert start <= passages[0]['start'] < passages[0]['end'] <= end
+    assert passages[0]['words'] >= K + W - 1
+
+
+def test_unrelated_and_short_overlaps_are_not_reported(corpus):
+    docs, index = corpus
+    assert index.query(" ".join(_words(300, 42))) == []
+    short = docs[0][2].split()[10:10 + fpmod.MIN_WORDS - 2]
+    assert index.query(" ".join(_words(40, 43) + short + _words(40, 44))) == []
+
+
+def test_query_offsets_index_the_original_text(corpus):
+    docs, index = corpus
+    text = "Intro.\n\n" + docs[0][2][:400]
+    for p in index.query(text):
+        spans = tokenize(text[p['start']:p['end']])
+        assert spans[0][0] == 0 and spans[-1][1] == p['end'] - p['start']
+
+
+def test_save_load_roundtrip(corpus, tmp_path):
+    docs, index = corpus
+    index.signature = "sig"
+    index.save(str(tmp_path))
+    loaded = FingerprintIndex.load(str(tmp_path))
+    np.testing.assert_array_equal(loaded.hashes, index.hashes)
+    np.testing.assert_array_equal(loaded.doc_ids, index.doc_ids)
+    np.testing.assert_array_equal(loaded.positions, index.positions)
+    assert loaded.docs == index.docs and loaded.signature == "sig"
+    assert FingerprintIndex.load(str(tmp_path / "missing")) is None
+
+
+def test_load_index_rebuilds_when_a_source_changes(tmp_path):
+    ref = tmp_path / "ref.txt"
+    ref.write_text(" ".join(_words(100, 6)), encoding="utf-8")
+    index_dir = str(tmp_path / "index")
+    first = load_index([str(ref)], index_dir=index_dir, verbose=False)
+    assert load_index([str(ref)], index_dir=index_dir, verbose=False).signature == first.signature
+
+    ref.write_text(" ".join(_words(120, 7)), encoding="utf-8")
+    rebuilt = load_index([str(ref)], index_dir=index_dir, verbose=False)
+    assert rebuilt.signature != first.signature
+    assert load_index([], index_dir=index_dir, verbose=False) is None
@@ -0,0 +1,72 @@
+from auditor.quarto import mask, prose_share
+
+QMD = """---
+title: "Bone microarchitecture"
+format: html
+---
+
+# Results
+
+Porosity was higher in fractures ($p = 0.03$) and tissue loss reached $12\\%$ [@smith2020; @lee2019].
+
+```{python}
+#| label: fig-roc
+df = load("results/tables/Table1.csv")  # $x$ and @ref inside code
+```
+
+![ROC curves](/results/figures/Fig2_ROC.png){#fig-roc width=80%}
+
+The AUC was `{python} auc` overall.
+
+$$
+\\beta = 0.42
+$$
+
+| Model | AUC |
+|:---|---:|
+| Structural | 0.76 |
+
+::: {.callout-note}
+Structural model outperformed the clinical model.
+:::
+
+<!-- reviewer note: check this -->
+{{< pagebreak >}}
+"""
+
+
+def test_length_and_line_breaks_are_preserved():
+    masked = mask(QMD)
+    assert len(masked) == len(QMD)
+    assert [i for i, c in enumerate(masked) if c == "\n"] == [i for i, c in enumerate(QMD) if c == "\n"]
+
+
+def test_non_prose_is_blanked():
+    masked = mask(QMD)
+    for hidden in ('title:', 'format: html', 'load(', '#| label', 'Fig2_ROC', 'width=80%', '{python}', 'beta',
+                   'Structural | 0.76', 'callout-note', 'reviewer note', 'pagebreak', 'smith2020', 'lee2019'):
+        assert hidden not in masked, hidden
+
+
+def test_prose_and_inline_statistics_are_kept_in_place():
+    masked = mask(QMD)
+    for kept in ('# Results', 'p = 0.03', '12%', '[@', 'ROC curves', 'The AUC was',
+                 'Structural model outperformed the clinical model.'):
+        assert kept in masked, kept
+    # Offsets into the mask are offsets into the source
+    start = QMD.index('Porosity was higher')
+    assert masked[start:start + 19] == 'Porosity was higher'
+    assert masked[QMD.index('$p = 0.03$'):][:10] == ' p = 0.03 '
+
+
+def test_currency_and_code_dollars_are_not_math():
+    text = "Costs were $5 and $10 per scan. Use `x$y` here."
+    masked = mask(text)
+    assert '$5 and $10' in masked
+    assert 'x$y' not in masked
+
+
+def test_prose_share():
+    assert prose_share("", "") == 1.0
+    assert prose_share("abc def", "abc    ") == 0.5
+    assert 0 < prose_share(QMD, mask(QMD)) < 1
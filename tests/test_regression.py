@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.backend import open_backend
+from dashboard.metadata import build_metadata
+from dashboard.regression import RegressionWorkbench, _bordered_inverse
+
+sm = pytest.importorskip('statsmodels.api')
+
+
+@pytest.fixture
+def workbench(tmp_path):
+    rng = np.random.default_rng(11)
+    n = 150
+    df = pd.DataFrame({'a': rng.normal(size=n), 'b': rng.normal(size=n), 'c': rng.normal(size=n)})
+    df['y'] = 1.5 + 2.0 * df['a'] - 0.7 * df['b'] + 0.3 * df['c'] + rng.normal(scale=0.5, size=n)
+    df.loc[rng.random(n) < 0.1, 'c'] = np.nan
+    df.to_csv(tmp_path / 'data.csv', index=False)
+    return RegressionWorkbench(open_backend(str(tmp_path / 'data.csv')))
+
+
+def test_bordered_inverse_matches_numpy():
+    rng = np.random.default_rng(0)
+    X = np.column_stack([np.ones(60), rng.normal(size=(60, 4))])
+    inv = _bordered_inverse(np.linalg.inv(X[:, :-1].T @ X[:, :-1]), X[:, :-1].T @ X[:, -1], X[:, -1] @ X[:, -1])
+    np.testing.assert_allclose(inv, np.linalg.inv(X.T @ X), rtol=1e-10, atol=1e-12)
+
+
+def test_bordered_inverse_rejects_collinear_column():
+    rng = np.random.default_rng(0)
+    X = np.column_stack([np.ones(60), rng.normal(size=60)])
+    x_new = 2 * X[:, 1] - 1
+    assert _bordered_inverse(np.linalg.inv(X.T @ X), X.T @ x_new, x_new @ x_new) is None
+
+
+@pytest.mark.parametrize('policy', ['listwise', 'impute_mean'])
+def test_ols_matches_statsmodels(workbench, policy):
+    xs = ['a', 'b', 'c']
+    fit = workbench.fit('ols', 'y', xs, policy)
+    d = workbench.design('y', xs, policy)
+    ref = sm.OLS(d['y'], d['X']).fit()
+
+    np.testing.assert_allclose(fit['coef']['Coef'], ref.params, rtol=1e-9)
+    np.testing.assert_allclose(fit['coef']['Std Err'], ref.bse, rtol=1e-9)
+    np.testing.assert_allclose(fit['coef']['P-value'], ref.pvalues, rtol=1e-7)
+    np.testing.assert_allclose(fit['coef'][['CI 2.5%', 'CI 97.5%']], ref.conf_int(), rtol=1e-9)
+    for name, value in (('R²', ref.rsquared), ('Adj. R²', ref.rsquared_adj), ('Log-lik', ref.llf),
+                        ('AIC', ref.aic), ('BIC', ref.bic)):
+        assert fit['stats'][name] == pytest.approx(value, rel=1e-9), name
+
+
+def test_bordered_update_gives_the_same_fit(workbench):
+    workbench.fit('ols', 'y', ['a'])
+    extended = workbench.fit('ols', 'y', ['a', 'b'])
+    assert extended['reused_gram'] and workbench.bordered_updates == 1
+
+    d = workbench.design('y', ['a', 'b'])
+    ref = sm.OLS(d['y'], d['X']).fit()
+    np.testing.assert_allclose(extended['coef']['Coef'], ref.params, rtol=1e-9)
+    np.testing.assert_allclose(extended['coef']['Std Err'], ref.bse, rtol=1e-9)
+    np.testing.assert_allclose(workbench.gram('y', ['a', 'b'])['inv'], np.linalg.inv(d['X'].T @ d['X']), rtol=1e-9)
+
+
+def test_bordered_update_skipped_when_rows_change(workbench):
+    workbench.fit('ols', 'y', ['a'])
+    fit = workbench.fit('ols', 'y', ['a', 'c'])  # 'c' has missing values: fewer rows than the parent
+    assert not fit['reused_gram']
+
+
+@pytest.mark.parametrize('ext', ['csv', 'parquet'])
+def test_binary_columns_come_from_metadata(tmp_path, ext):
+    if ext == 'parquet':
+        pytest.importorskip('duckdb')
+    df = pd.DataFrame({'flag': [0, 1, 1, np.nan, 0], 'x': [0.1, 0.2, 0.3, 0.4, 0.5],
+                       'sex': ['F', 'M', 'F', 'M', None], 'grade': ['a', 'b', 'c', 'a', 'b']})
+    path = tmp_path / f'data.{ext}'
+    if ext == 'csv':
+        df.to_csv(path, index=False)
+    else:
+        df.to_parquet(path)
+    assert build_metadata(open_backend(str(path))).binary_cols == ['flag', 'sex']
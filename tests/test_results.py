@@ -0,0 +1,97 @@
+import os
+
+import pytest
+
+from auditor.results import ResultsIndex, find_results_dir, load_results_index, table_records
+
+CSV_TABLE = """Variable,Control,Fracture,P-value
+Age (years),61.2,63.5,0.03
+Cortical Porosity (%),2.10,2.95,0.001
+Failure Load (N),3100,2660,0.04
+"""
+
+MD_TABLE = """# Table 2
+
+| Model | AUC | Sensitivity |
+|:---|---:|---:|
+| **Clinical** | 0.60 | 0.271 |
+| **Structural** | 0.76 | 0.55 |
+"""
+
+
+@pytest.fixture
+def project(tmp_path):
+    tables = tmp_path / "study" / "results" / "tables"
+    tables.mkdir(parents=True)
+    (tables / "Table1.csv").write_text(CSV_TABLE, encoding="utf-8")
+    (tables / "Table2.md").write_text(MD_TABLE, encoding="utf-8")
+    (tmp_path / "study" / "manuscript" / "sections").mkdir(parents=True)
+    return tmp_path / "study"
+
+
+@pytest.fixture
+def index(project):
+    tables = project / "results" / "tables"
+    return ResultsIndex(table_records(str(tables / "Table1.csv")) + table_records(str(tables / "Table2.md")))
+
+
+def _claim(index, text, number):
+    return next(c for c in index.check(text) if c['text'] == number)
+
+
+def test_table_records(project):
+    records = table_records(str(project / "results" / "tables" / "Table2.md"))
+    assert [0.6, "Table2.md", "Clinical", "AUC"] in records
+    assert len(records) == 4  # separator row and label column skipped
+    assert [0.03, "Table1.csv", "Age (years)", "P-value"] in table_records(str(project / "results" / "tables" / "Table1.csv"))
+
+
+def test_match_needs_a_label_or_column_in_the_sentence(index):
+    claim = _claim(index, "Fracture patients were older (p = 0.03 for age).", "0.03")
+    assert claim['status'] == 'match'
+    assert claim['matches'][0][2] == "Age (years)"
+
+    # 0.04 is in the tables, but nothing around it names its row or column
+    assert _claim(index, "Something unrelated happened 0.04 times.", "0.04")['status'] == 'unmatched'
+
+
+def test_nearby_value_in_a_named_cell_is_a_mismatch(index):
+    # The sentence names the row (age) and the column (fracture); the table has 63.5
+    claim = _claim(index, "Fracture patients had a mean age of 65.1 years.", "65.1")
+    assert claim['status'] == 'mismatch' and not claim['matches']
+    assert claim['expected'] == [63.5, "Table1.csv", "Age (years)", "Fracture"]
+
+
+def test_weak_or_implausible_context_is_unmatched(index):
+    # 0.03 is the age p-value, but the sentence is about failure load: no match, and the
+    # failure-load cells (2660, 3100) are too far from 0.03 to be the same statistic
+    claim = _claim(index, "Failure load differed between fracture and control groups (p = 0.03).", "0.03")
+    assert claim['status'] == 'unmatched' and claim['expected'] is None
+    # A single shared word ('fracture') names a column, not a cell
+    assert _claim(index, "Fracture risk rose by 2.3 in this cohort.", "2.3")['status'] == 'unmatched'
+
+
+def test_precision_percent_and_sign(index):
+    assert _claim(index, "The structural model reached an AUC of 0.8.", "0.8")['status'] == 'match'
+    assert _claim(index, "Clinical model sensitivity was 27.1%.", "27.1%")['status'] == 'match'
+    assert _claim(index, "Cortical porosity rose to 2.1%.", "2.1%")['status'] == 'match'
+    thresholds = [c['text'] for c in index.check("Age differed (p < 0.001) and p ≤ 0.05.")]
+    assert thresholds == []
+
+
+def test_find_results_dir(project):
+    manuscript = project / "manuscript" / "sections" / "04_results.qmd"
+    assert find_results_dir(str(manuscript), root=str(project.parent)) == str(project / "results" / "tables")
+    assert find_results_dir(str(project.parent / "other.qmd"), root=str(project.parent)) is None
+
+
+def test_index_is_rebuilt_when_a_table_changes(project, tmp_path):
+    tables = str(project / "results" / "tables")
+    index_dir = str(tmp_path / "cache")
+    first = load_results_index(tables, index_dir=index_dir)
+    assert len(os.listdir(index_dir)) == 1 and len(first) == 13
+
+    with open(os.path.join(tables, "Table1.csv"), "a", encoding="utf-8") as f:
+        f.write("BMI (kg/m2),27.4,26.1,0.20\n")
+    rebuilt = load_results_index(tables, index_dir=index_dir)
+    assert rebuilt.signature != first.signature and len(rebuilt) == 16
@@ -0,0 +1,63 @@
+import warnings
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from dashboard.sweep import sweep_arrays, sweep_table
+
+
+@pytest.fixture
+def groups():
+    """Two groups, five variables: continuous, heavily tied, with missing values, one shifted."""
+    rng = np.random.default_rng(7)
+    x1 = rng.normal(size=(45, 5))
+    x2 = rng.normal(0.4, 1.2, size=(38, 5))
+    x1[:, 1], x2[:, 1] = np.round(x1[:, 1]), np.round(x2[:, 1])
+    x1[rng.random(x1.shape) < 0.15] = np.nan
+    x2[rng.random(x2.shape) < 0.15] = np.nan
+    return x1, x2
+
+
+def _observed(x, j):
+    return x[~np.isnan(x[:, j]), j]
+
+
+def test_matches_scipy(groups):
+    x1, x2 = groups
+    res = sweep_arrays(x1, x2)
+    for j in range(x1.shape[1]):
+        a, b = _observed(x1, j), _observed(x2, j)
+        t = stats.ttest_ind(a, b)
+        mw = stats.mannwhitneyu(b, a, alternative='two-sided', use_continuity=True, method='asymptotic')
+        pooled_sd = np.sqrt(((len(a) - 1) * a.var(ddof=1) + (len(b) - 1) * b.var(ddof=1)) / (len(a) + len(b) - 2))
+
+        assert res['n1'][j] == len(a) and res['n2'][j] == len(b)
+        assert res['mean1'][j] == pytest.approx(a.mean()) and res['mean2'][j] == pytest.approx(b.mean())
+        assert res['t_stat'][j] == pytest.approx(t.statistic, rel=1e-10)
+        assert res['p_t'][j] == pytest.approx(t.pvalue, rel=1e-10)
+        assert res['u_stat'][j] == pytest.approx(mw.statistic)
+        assert res['p_mw'][j] == pytest.approx(mw.pvalue, rel=1e-10)
+        assert res['cohens_d'][j] == pytest.approx((b.mean() - a.mean()) / pooled_sd, rel=1e-10)
+        assert res['auc'][j] == pytest.approx(mw.statistic / (len(a) * len(b)))
+
+
+def test_small_groups_are_nan_without_warnings(groups):
+    x1, x2 = groups
+    x1[:, 2] = np.nan          # empty group
+    x2[1:, 3] = np.nan         # a single observation
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        res = sweep_arrays(x1, x2)
+
+    assert np.isnan(res['mean1'][2])
+    for key in ('t_stat', 'p_t', 'u_stat', 'p_mw', 'cohens_d', 'auc'):
+        assert np.isnan(res[key][2]) and np.isnan(res[key][3]), key
+        assert np.isfinite(res[key][0]), key
+
+
+def test_table_sorted_by_p_value(groups):
+    x1, x2 = groups
+    table = sweep_table(x1, x2, [f"v{i}" for i in range(x1.shape[1])])
+    p = table['P (t-test)'].to_numpy()
+    assert np.all(np.diff(p[~np.isnan(p)]) >= 0)
@@ -1,34 +1,193 @@
 import os
+import sys
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from PIL import Image
 
-# We use the absolute path to guarantee the folder is found
-base_path = "/Users/dr.ajayshukla/PycharmProjects/pythonProjectwriter/HRPQCT_BMD_TBS_FRAX/results/figures"
+TIFF_EXTENSIONS = (".tiff", ".tif")
 
-# Check if path exists first
-if not os.path.exists(base_path):
-    print(f"CRITICAL ERROR: Could not find folder at: {base_path}")
-else:
-    print(f"Processing images in: {base_path}")
 
-    # Loop through files
-    for filename in os.listdir(base_path):
-        # Check for both .tiff and .tif (case insensitive)
-        if filename.lower().endswith((".tiff", ".tif")):
-            try:
-                # Full path to image
-                file_path = os.path.join(base_path, filename)
+# --- 1. HELPERS ---
+def parse_pages(spec):
+    """Parses a page selection: 'all', 'first', a single index '12', or a slice '10:50' / '0:200:5'."""
+    if spec in (None, "all"):
+        return slice(None)
+    if spec == "first":
+        return slice(0, 1)
+    if ":" in spec:
+        parts = [int(p) if p else None for p in spec.split(":")]
+        return slice(*parts)
+    index = int(spec)
+    return slice(index, index + 1)
 
-                # Open and Convert
-                img = Image.open(file_path)
-                new_filename = os.path.splitext(filename)[0] + ".png"
-                save_path = os.path.join(base_path, new_filename)
 
-                img.save(save_path, "PNG")
-                print(f"✅ Converted: {filename} -> {new_filename}")
+def find_tiffs(input_dir, recursive=False):
+    """Lists TIFF files (case-insensitive .tif/.tiff) in a directory."""
+    if recursive:
+        for root, _, files in os.walk(input_dir):
+            for name in sorted(files):
+                if name.lower().endswith(TIFF_EXTENSIONS):
+                    yield os.path.join(root, name)
+    else:
+        for name in sorted(os.listdir(input_dir)):
+            if name.lower().endswith(TIFF_EXTENSIONS):
+                yield os.path.join(input_dir, name)
 
-            except Exception as e:
-                print(f"❌ Failed to convert {filename}: {e}")
 
-    print("All done!")
+def is_up_to_date(source, target):
+    # A target written in the same run as its source (figure_export writes TIFF then PNG) counts as current
+    return os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(source)
 
 
+def to_8bit(frame):
+    """Min-max windows a 16/32-bit grayscale slice into 8-bit 'L'."""
+    frame = frame.convert("F") if frame.mode != "F" else frame
+    lo, hi = frame.getextrema()
+    scale = 255.0 / (hi - lo) if hi > lo else 0
+    return frame.point(lambda v: (v - lo) * scale).convert("L")
+
+
+def to_png_mode(frame):
+    """Keeps PNG-native modes (incl. 16-bit grayscale scans); rescales 32-bit int/float slices to 8-bit."""
+    if frame.mode in ("1", "L", "LA", "P", "RGB", "RGBA", "I;16"):
+        return frame
+    if frame.mode in ("I", "F"):
+        return to_8bit(frame)
+    return frame.convert("RGB")
+
+
+def iter_pages(img, pages):
+    """Yields (index, frame) for the selected pages, decoding one page at a time."""
+    n_frames = getattr(img, "n_frames", 1)
+    for index in range(n_frames)[pages]:
+        img.seek(index)
+        yield index, img
+
+
+# --- 2. PER-FILE CONVERSION (runs inside a worker process) ---
+def convert_file(tiff_path, output_dir, pages=slice(None), montage=False, montage_cols=8,
+                 thumb_size=256, force=False):
+    """Converts one TIFF. Returns (path, status, n_pages_written, n_bytes_read)."""
+    stem = os.path.splitext(os.path.basename(tiff_path))[0]
+    os.makedirs(output_dir, exist_ok=True)
+    n_bytes = os.path.getsize(tiff_path)
+
+    try:
+        with Image.open(tiff_path) as img:
+            n_frames = getattr(img, "n_frames", 1)
+            selected = range(n_frames)[pages]
+            if not selected:
+                return tiff_path, "skipped (no pages in range)", 0, 0
+
+            if montage:
+                target = os.path.join(output_dir, f"{stem}_montage.png")
+            elif n_frames == 1:
+                target = os.path.join(output_dir, f"{stem}.png")
+            else:
+                # Pages are written in order, so the last one is the completion marker
+                target = os.path.join(output_dir, f"{stem}_p{selected[-1]:04d}.png")
+
+            if not force and is_up_to_date(tiff_path, target):
+                return tiff_path, "up-to-date", 0, 0
+
+            if montage:
+                written = _write_montage(img, pages, selected, target, montage_cols, thumb_size)
+            else:
+                written = 0
+                for index, frame in iter_pages(img, pages):
+                    out = target if n_frames == 1 else os.path.join(output_dir, f"{stem}_p{index:04d}.png")
+                    to_png_mode(frame).save(out, "PNG")
+                    written += 1
+        return tiff_path, "converted", written, n_bytes
+    except Exception as e:
+        return tiff_path, f"failed: {e}", 0, 0
+
+
+def _write_montage(img, pages, selected, target, cols, thumb_size):
+    """Tiles thumbnails of the selected slices into one PNG, one decoded slice at a time."""
+    cols = max(1, min(cols, len(selected)))
+    rows = -(-len(selected) // cols)
+    sheet = None
+
+    for position, (index, frame) in enumerate(iter_pages(img, pages)):
+        thumb = to_8bit(frame) if frame.mode.startswith(("I", "F")) else frame.convert("L")
+        thumb.thumbnail((thumb_size, thumb_size))
+        if sheet is None:
+            sheet = Image.new("L", (cols * thumb_size, rows * thumb_size))
+        row, col = divmod(position, cols)
+        sheet.paste(thumb, (col * thumb_size, row * thumb_size))
+
+    sheet.save(target, "PNG")
+    return len(selected)
+
+
+# --- 3. DIRECTORY DRIVER ---
+def convert_directory(input_dir, output_dir=None, pages="all", montage=False, montage_cols=8,
+                      thumb_size=256, workers=None, recursive=False, force=False):
+    """Converts every TIFF under input_dir in a process pool and prints a throughput summary."""
+    if not os.path.isdir(input_dir):
+        print(f"❌ Path not found: {input_dir}")
+        return []
+
+    page_slice = parse_pages(pages)
+    files = list(find_tiffs(input_dir, recursive))
+    print(f"🔍 Scanning: {input_dir} ({len(files)} TIFF file(s))")
+    if not files:
+        return []
+
+    def target_dir(path):
+        if output_dir is None:
+            return os.path.dirname(path)
+        return os.path.join(output_dir, os.path.relpath(os.path.dirname(path), input_dir))
+
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(convert_file, path, target_dir(path), page_slice, montage,
+                               montage_cols, thumb_size, force) for path in files]
+        for future in as_completed(futures):
+            path, status, n_pages, n_bytes = future.result()
+            results.append((path, status, n_pages, n_bytes))
+            name = os.path.relpath(path, input_dir)
+            if status == "converted":
+                print(f"✅ Converted: {name} ({n_pages} page(s))")
+            elif status.startswith("failed"):
+                print(f"❌ Failed to convert {name}: {status[len('failed: '):]}")
+
+    elapsed = time.perf_counter() - start
+    converted = [r for r in results if r[1] == "converted"]
+    skipped = sum(1 for r in results if r[1] == "up-to-date")
+    failed = sum(1 for r in results if r[1].startswith("failed"))
+    n_pages = sum(r[2] for r in converted)
+    n_mb = sum(r[3] for r in converted) / 1e6
+
+    print(f"\n📊 {len(converted)} converted, {skipped} up-to-date, {failed} failed in {elapsed:.1f}s")
+    if elapsed > 0 and converted:
+        print(f"   Throughput: {len(converted) / elapsed:.1f} files/s, {n_pages / elapsed:.1f} pages/s, "
+              f"{n_mb / elapsed:.1f} MB/s ({workers} worker(s))")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert TIFF files / HR-pQCT TIFF stacks to PNG in parallel.")
+    parser.add_argument("input_dir", help="Directory containing .tif/.tiff files")
+    parser.add_argument("-o", "--output", default=None, help="Output directory (default: next to each TIFF)")
+    parser.add_argument("--pages", default="all",
+                        help="Pages to export: 'all', 'first', an index, or a slice like '10:50' or '0:200:5'")
+    parser.add_argument("--montage", action="store_true", help="Write one contact-sheet PNG per stack instead of one PNG per page")
+    parser.add_argument("--montage-cols", type=int, default=8)
+    parser.add_argument("--thumb-size", type=int, default=256, help="Montage tile size in pixels")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Descend into sub-directories")
+    parser.add_argument("--force", action="store_true", help="Re-convert even if the PNG is newer than the TIFF")
+    args = parser.parse_args(argv)
+
+    results = convert_directory(args.input_dir, args.output, args.pages, args.montage, args.montage_cols,
+                                args.thumb_size, args.workers, args.recursive, args.force)
+    return 1 if any(r[1].startswith("failed") for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())